@@ -56,6 +56,7 @@ from ui.components import (
     call_controller,
     schedule_temp_export,
     collect_selected_tree_items,
+    get_scoped_form_field_style,
 )
 from core.controllers.validators import to_numeric_flag
 # UI constants
@@ -5669,11 +5670,15 @@ def main():
     app.setPalette(pal)
 
     # Load stylesheet if available (stylesheet can reference palette colors)
+    qss = ""
     try:
         with open(os.path.join(os.path.dirname(__file__), "style.qss"), "r", encoding="utf-8") as f:
-            app.setStyleSheet(f.read())
+            qss = f.read()
     except Exception:
         pass
+    # 表單控件樣式在啟動時套用一次（依上方 palette 判斷明暗主題）；規則以屬性
+    # 選擇器限定在 use_form_field_style() 標記的對話框/表單內，各實例不再各自 setStyleSheet
+    app.setStyleSheet(qss + "\n" + get_scoped_form_field_style())
 
     # 應用程式圖示（支持跨平台圖標）
     try:
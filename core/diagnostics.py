@@ -2,7 +2,7 @@ import threading
 import time
 import uuid
 from dataclasses import dataclass
-from typing import Optional, Any, Callable, List
+from typing import Optional, Any, Callable, List, Tuple
 
 
 @dataclass
@@ -23,6 +23,8 @@ class DiagnosticsManager:
         self._only_txrx = bool(only_txrx)
         self._records: List[DiagnosticRecord] = []
         self._listeners: dict = {}
+        # 單調遞增的紀錄序號（每記錄一筆 +1），clear/裁切不會重設
+        self._sequence = 0
 
     def set_only_txrx(self, value: bool):
         with self._lock:
@@ -51,10 +53,35 @@ class DiagnosticsManager:
         with self._lock:
             self._records.clear()
 
+    def discard_if_idle(self) -> bool:
+        """沒有任何 listener 時清除已記錄的訊息；回傳是否有清除"""
+        with self._lock:
+            if self._listeners:
+                return False
+            self._records.clear()
+            return True
+
     def snapshot(self) -> List[DiagnosticRecord]:
         with self._lock:
             return list(self._records)
 
+    @property
+    def sequence(self) -> int:
+        """目前已記錄的紀錄總數；輪詢端可先比對此值，未變更就不必取 snapshot"""
+        return self._sequence
+
+    def snapshot_since(self, last_sequence: int) -> Tuple[int, List[DiagnosticRecord]]:
+        """回傳 (目前序號, 序號大於 last_sequence 且仍保留中的紀錄)
+
+        只複製新增的部分；已因容量裁切或 clear 而移除的紀錄不會回傳。
+        """
+        with self._lock:
+            seq = self._sequence
+            count = min(seq - last_sequence, len(self._records))
+            if count <= 0:
+                return seq, []
+            return seq, self._records[-count:]
+
     def _should_emit(self, text: str, context: Optional[Any] = None) -> bool:
         if not self._only_txrx:
             return True
@@ -100,6 +127,7 @@ class DiagnosticsManager:
 
         with self._lock:
             self._records.append(rec)
+            self._sequence += 1
             if len(self._records) > self._capacity:
                 self._records = self._records[-self._capacity :]
             listeners = list(self._listeners.values())
@@ -8,7 +8,10 @@ including network utilities, validation helpers, and other common functionality.
 import logging
 from typing import Any, Optional
 
-from .network_utils import detect_outbound_ip, get_network_adapters, find_adapter_for_ip, format_adapter_display
+from .network_utils import (
+    detect_outbound_ip, get_network_adapters, find_adapter_for_ip, format_adapter_display,
+    cached_network_adapters, cached_outbound_ip, invalidate_network_cache
+)
 from .validation_utils import (
     validate_ip_address, validate_port, normalize_numeric_value,
     safe_string_conversion, validate_boolean_string, clamp_value,
@@ -123,6 +126,7 @@ def update_tree_item_text(item: Any, column: int, text: str) -> bool:
 __all__ = [
     # Network utilities
     "detect_outbound_ip", "get_network_adapters", "find_adapter_for_ip", "format_adapter_display",
+    "cached_network_adapters", "cached_outbound_ip", "invalidate_network_cache",
     # Validation utilities
     "validate_ip_address", "validate_port", "normalize_numeric_value",
     "safe_string_conversion", "validate_boolean_string", "clamp_value",
@@ -5,7 +5,9 @@ This module consolidates IP detection logic used across the application
 to avoid code duplication.
 """
 
+import functools
 import socket
+import time
 from typing import Optional, List, Tuple, Dict, Any
 
 try:
@@ -83,6 +85,55 @@ def get_network_adapters() -> List[Tuple[str, str]]:
     return adapters
 
 
+# Seconds a detected outbound IP stays valid in cached_outbound_ip()
+OUTBOUND_IP_TTL = 30.0
+_outbound_ip_cache: Optional[Tuple[float, str]] = None
+
+
+@functools.lru_cache(maxsize=1)
+def _cached_adapters() -> Tuple[Tuple[str, str], ...]:
+    return tuple(get_network_adapters())
+
+
+def cached_network_adapters() -> List[Tuple[str, str]]:
+    """
+    Cached variant of get_network_adapters().
+
+    Adapters are enumerated once per process until
+    invalidate_network_cache() is called.
+
+    Returns:
+        List of tuples (display_name, ip_address)
+    """
+    return list(_cached_adapters())
+
+
+def cached_outbound_ip() -> str:
+    """
+    Cached variant of detect_outbound_ip().
+
+    The detected IP is reused for OUTBOUND_IP_TTL seconds.
+
+    Returns:
+        Detected IP address as string
+    """
+    global _outbound_ip_cache
+    now = time.monotonic()
+    cached = _outbound_ip_cache
+    if cached is not None and now - cached[0] <= OUTBOUND_IP_TTL:
+        return cached[1]
+    ip = detect_outbound_ip()
+    _outbound_ip_cache = (now, ip)
+    return ip
+
+
+def invalidate_network_cache() -> None:
+    """Drop cached adapter and outbound IP results so the next call rescans."""
+    global _outbound_ip_cache
+    _cached_adapters.cache_clear()
+    _outbound_ip_cache = None
+
+
 def find_adapter_for_ip(target_ip: str) -> Optional[str]:
     """
     Find the network adapter name that has the given IP address.
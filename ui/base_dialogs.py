@@ -14,7 +14,7 @@ from typing import Dict, Any, Optional, List
 from .components import FormBuilder
 
 # UI constants (avoiding circular import)
-from ui.components import get_form_field_style
+from ui.components import use_form_field_style
 SPACING = 6
 MARGIN_H = 12
 MARGIN_V = 12
@@ -63,7 +63,7 @@ class BaseDialog(QDialog):
 
         # Set minimum size and style
         self.setMinimumWidth(400)
-        self.setStyleSheet(get_form_field_style())
+        use_form_field_style(self)
 
     def _setup_content(self):
         """Override this method to add dialog-specific content."""
@@ -1,8 +1,74 @@
 from PyQt6.QtWidgets import QTreeWidgetItem, QMessageBox
 from PyQt6.QtCore import Qt
+from collections import deque
 import re
 import traceback
 
+# 反序列化時缺少 data 的節點共用此空 dict（唯讀，不可修改）
+_EMPTY_DICT = {}
+
+# 舊版剪貼格式以 data1..data6 直接存放欄位
+_LEGACY_DATA_KEYS = tuple(f"data{i}" for i in range(1, 7))
+
+# 剪貼內容節點數超過此門檻時，才對重複的子樹做結構去重
+_SUBTREE_DEDUP_THRESHOLD = 64
+
+
+def _split_trailing_digits(name):
+    # 將名稱拆成 (前綴, 尾端數字)，等同 re.match(r"^(.*?)(\d+)$") 但不經過 regex
+    i = len(name)
+    while i > 0 and name[i - 1].isdecimal():
+        i -= 1
+    return name[:i], name[i:]
+
+
+def _canon(value):
+    # 將節點資料轉為可雜湊的標準形式；dict 依鍵排序，純量帶型別名稱以區分 1 / True / 1.0
+    if isinstance(value, dict):
+        return ("dict", tuple(sorted((str(k), _canon(v)) for k, v in value.items())))
+    if isinstance(value, (list, tuple)):
+        return ("list", tuple(_canon(v) for v in value))
+    return (type(value).__name__, value)
+
+
+def _dedupe_subtrees(roots):
+    # 後序走訪：相同結構的子樹只保留第一次出現的節點，其餘以 {"$ref": i} 取代。
+    # roots 本身不會被取代（貼上時需要直接讀取其 type）。回傳 `$ref` 所指的子樹表，
+    # 若沒有任何重複則回傳空串列。
+    table = []
+    index = {}
+    replaced = 0
+
+    def visit(node):
+        nonlocal replaced
+        children = node.get("children") or ()
+        child_keys = []
+        for pos, child in enumerate(children):
+            key = visit(child)
+            child_keys.append(key)
+            if key is None:
+                continue
+            ref = index.get(key)
+            if ref is None:
+                index[key] = len(table)
+                table.append(child)
+            else:
+                children[pos] = {"$ref": ref}
+                replaced += 1
+        if None in child_keys:
+            return None
+        try:
+            key = (node.get("type"), node.get("name"), _canon(node.get("data")), tuple(child_keys))
+            hash(key)
+        except TypeError:
+            # 含不可雜湊的資料，不參與去重
+            return None
+        return key
+
+    for root in roots:
+        visit(root)
+    return table if replaced else []
+
 
 class ClipboardManager:
     # 管理剪貼（序列化/反序列化）並處理衝突策略。
@@ -12,6 +78,8 @@ class ClipboardManager:
     def __init__(self, app):
         self.app = app
         self.clipboard = None
+        # 目前貼上中的剪貼內容所使用的去重子樹表（`$ref` 指向此表）
+        self._subtrees = ()
 
     def copy(self, item):
         # Accept either a single QTreeWidgetItem or an iterable of items
@@ -20,30 +88,47 @@ class ClipboardManager:
             return
 
         try:
+            node_count = 0
+
             def _serialize(it):
+                nonlocal node_count
+                node_count += 1
                 node = {
                     "type": it.data(0, Qt.ItemDataRole.UserRole),
                     "name": it.text(0),
-                    "data": {},
-                    "children": [],
                 }
+                # 空的 data / children 不建立容器（大量葉節點 Tag 時可省下可觀的配置）
+                # QTreeWidgetItem.data() returns None for unset roles rather than raising
+                data = {}
                 for i in range(1, 9):
-                    try:
-                        node["data"][f"d{i}"] = it.data(i, Qt.ItemDataRole.UserRole)
-                    except Exception:
-                        node["data"][f"d{i}"] = None
-                for i in range(it.childCount()):
-                    child = it.child(i)
-                    if isinstance(child, QTreeWidgetItem):
-                        node["children"].append(_serialize(child))
+                    v = it.data(i, Qt.ItemDataRole.UserRole)
+                    if v is not None:
+                        data[f"d{i}"] = v
+                if data:
+                    node["data"] = data
+                count = it.childCount()
+                if count:
+                    children = []
+                    for i in range(count):
+                        child = it.child(i)
+                        if isinstance(child, QTreeWidgetItem):
+                            children.append(_serialize(child))
+                    node["children"] = children
                 return node
 
             # If an iterable of items is passed, store as Multi
             if isinstance(item, (list, tuple)):
                 children = [_serialize(it) for it in item]
                 self.clipboard = {"type": "Multi", "name": "Multiple", "children": children}
+                roots = children
             else:
                 self.clipboard = _serialize(item)
+                roots = [self.clipboard]
+            # 大型複製（例如含大量相同 Group/Tag 範本的 Device）才做子樹去重
+            if node_count > _SUBTREE_DEDUP_THRESHOLD:
+                subtrees = _dedupe_subtrees(roots)
+                if subtrees:
+                    self.clipboard["subtrees"] = subtrees
         except Exception as e:
             tb = traceback.format_exc()
             QMessageBox.critical(self.app, "Copy Error", f"複製時發生例外：{e}\n\n{tb}")
@@ -74,62 +159,73 @@ class ClipboardManager:
         if not self.clipboard or not target_item:
             return None
 
+        # 貼上期間暫停樹的重繪與訊號，結束後一次更新畫面
+        tree = getattr(self.app, "tree", None)
+        if tree is None:
+            return self._paste(target_item)
+        tree.setUpdatesEnabled(False)
+        was_blocked = tree.blockSignals(True)
+        try:
+            return self._paste(target_item)
+        finally:
+            tree.blockSignals(was_blocked)
+            tree.setUpdatesEnabled(True)
+            tree.viewport().update()
+
+    def _paste(self, target_item):
         clip = self.clipboard
+        # Normalize the payload once; the Multi / Device->Group paths below
+        # read from these locals instead of re-probing the dict.
+        is_dict = isinstance(clip, dict)
+        ctype = clip.get("type") if is_dict else None
+        children = (clip.get("children") or ()) if is_dict else ()
+        self._subtrees = (clip.get("subtrees") or ()) if is_dict else ()
         # Support Multi payloads: if clipboard type is Multi, infer the inner item type(s)
-        copy_type = None
-        if isinstance(clip, dict):
-            if clip.get("type") == "Multi":
-                children = clip.get("children", []) or []
-                if not children:
-                    QMessageBox.warning(self.app, "貼上失敗", f"剪貼簿為空的 Multi。")
-                    return None
-                child_types = set()
-                for c in children:
-                    try:
-                        if isinstance(c, dict) and c.get("type"):
-                            child_types.add(c.get("type"))
-                    except Exception:
-                        pass
-                # If all children share the same type, treat copy_type as that type
-                if len(child_types) == 1:
-                    copy_type = next(iter(child_types))
-                else:
-                    # Mixed types - fall back to first child's type for target resolution
-                    copy_type = children[0].get("type") if isinstance(children[0], dict) else None
+        if ctype == "Multi":
+            if not children:
+                QMessageBox.warning(self.app, "貼上失敗", f"剪貼簿為空的 Multi。")
+                return None
+            child_types = {c.get("type") for c in children if isinstance(c, dict) and c.get("type")}
+            # If all children share the same type, treat copy_type as that type
+            if len(child_types) == 1:
+                copy_type = next(iter(child_types))
             else:
-                copy_type = clip.get("type")
+                # Mixed types - fall back to first child's type for target resolution
+                copy_type = children[0].get("type") if isinstance(children[0], dict) else None
         else:
-            copy_type = None
+            copy_type = ctype
         target_type = target_item.data(0, Qt.ItemDataRole.UserRole)
 
         # Special-case: pasted clipboard is a serialized Device but target is a Group.
         # Users often copy a Device (containing Groups/Tags) and want to paste the Tag(s)
         # into an existing Group. Support that by extracting Tag nodes and deserializing
         # them directly under the target Group.
-        try:
-            if isinstance(clip, dict) and clip.get('type') == 'Device' and target_type == 'Group':
-                # recursively find Tag nodes and paste them under target_item
-                def _walk_and_paste(node):
-                    if not isinstance(node, dict):
-                        return
-                    ntype = node.get('type')
-                    if ntype == 'Tag':
-                        try:
-                            self._deserialize_item(target_item, node)
-                        except Exception:
-                            pass
-                    for c in node.get('children', []) or []:
-                        _walk_and_paste(c)
-
-                for child in clip.get('children', []) or []:
+        if ctype == 'Device' and target_type == 'Group':
+            # recursively find Tag nodes and paste them under target_item
+            def _walk_and_paste(node):
+                if not isinstance(node, dict):
+                    return
+                node = self._resolve_ref(node)
+                ntype = node.get('type')
+                if ntype == 'Tag':
+                    self._deserialize_item(target_item, node)
+                for c in node.get('children', []) or []:
+                    _walk_and_paste(c)
+
+            # 整個走訪只包一層 try：失敗時回報實際的錯誤並停在 target_item，
+            # 不落入下方「無法將 X 貼至 Y」的型別不支援訊息
+            try:
+                for child in children:
                     _walk_and_paste(child)
-                try:
-                    target_item.setExpanded(True)
-                except Exception:
-                    pass
-                return target_item
-        except Exception:
-            pass
+            except Exception as e:
+                QMessageBox.warning(
+                    self.app, "貼上失敗", f"貼上 Tag 時發生例外，已中止：{e}"
+                )
+            try:
+                target_item.setExpanded(True)
+            except Exception:
+                pass
+            return target_item
         # If the target has no explicit type (e.g. invisibleRootItem),
         # treat it as the top-level Connectivity container so Channels can be pasted.
         try:
@@ -164,10 +260,17 @@ class ClipboardManager:
             )
             return None
 
-        if isinstance(clip, dict) and "children" in clip:
+        # 新格式可能省略空的 data / children，因此以舊版專屬欄位判斷是否為舊格式
+        is_legacy = (
+            is_dict
+            and "data" not in clip
+            and "children" not in clip
+            and any(k in clip for k in _LEGACY_DATA_KEYS)
+        )
+        if is_dict and not is_legacy:
             # If this is a Multi clipboard payload, paste each child individually
-            if clip.get("type") == "Multi":
-                for child in clip.get("children", []):
+            if ctype == "Multi":
+                for child in children:
                     self._deserialize_item(parent_node, child)
             else:
                 self._deserialize_item(parent_node, clip)
@@ -255,33 +358,32 @@ class ClipboardManager:
         return parent_node
 
     def _unique_name(self, parent_node, base_name, node_type):
-        used = [
+        used = {
             parent_node.child(i).text(0)
             for i in range(parent_node.childCount())
             if parent_node.child(i).data(0, Qt.ItemDataRole.UserRole) == node_type
-        ]
+        }
+        # Fast path: the name is free in the target parent, keep it as-is
+        if base_name not in used:
+            return base_name
 
         # Normalize base_name by stripping repeated _Copy fragments
         # e.g., Tag_Copy1_Copy2 -> Tag
         clean = base_name
         # remove trailing _Copy or _Copy<number> fragments repeatedly
         while True:
-            m = re.search(r"(_Copy\d+|_Copy)$", clean)
-            if not m:
+            root, _digits = _split_trailing_digits(clean)
+            if not root.endswith("_Copy"):
                 break
-            clean = clean[: m.start()]
+            clean = root[:-5]
 
         # If cleaned name ends with digits (e.g., Tag12), treat trailing digits as counter
-        m_num = re.match(r"^(.*?)(\d+)$", clean)
-        if m_num:
-            root = m_num.group(1)
-            base_idx = int(m_num.group(2))
+        root, digits = _split_trailing_digits(clean)
+        if digits:
+            base_idx = int(digits)
             # find existing numeric suffixes for this root
-            nums = []
-            for u in used:
-                mu = re.match(rf"^{re.escape(root)}(\d+)$", u)
-                if mu:
-                    nums.append(int(mu.group(1)))
+            lr = len(root)
+            nums = [int(u[lr:]) for u in used if u.startswith(root) and u[lr:].isdecimal()]
             if nums:
                 nxt = max(nums) + 1
             else:
@@ -303,11 +405,8 @@ class ClipboardManager:
             return clean
 
         # find numeric suffices for clean
-        nums = []
-        for u in used:
-            mu = re.match(rf"^{re.escape(clean)}(\d+)$", u)
-            if mu:
-                nums.append(int(mu.group(1)))
+        lc = len(clean)
+        nums = [int(u[lc:]) for u in used if u.startswith(clean) and u[lc:].isdecimal()]
         if nums:
             nxt = max(nums) + 1
         else:
@@ -320,14 +419,33 @@ class ClipboardManager:
 
     # NOTE: next-id/next-address logic delegated to AppController
 
+    def _resolve_ref(self, node_dict):
+        # 去重後的子樹以 {"$ref": i} 表示；反序列化只讀取節點，直接共用範本即可
+        ref = node_dict.get("$ref")
+        if ref is None:
+            return node_dict
+        return self._subtrees[ref]
+
     def _deserialize_item(self, parent_node, node_dict):
+        # 以明確的佇列取代遞迴：依序處理 (父節點, 節點 dict)，子節點排到佇列尾端。
+        # 同一父節點下的兄弟節點仍依原順序建立（名稱/位址計算只看同層節點）。
+        pending = deque([(parent_node, node_dict)])
+        while pending:
+            parent, nd = pending.popleft()
+            nd = self._resolve_ref(nd)
+            new_item = self._deserialize_one(parent, nd)
+            for child in nd.get("children") or ():
+                pending.append((new_item, child))
+
+    def _deserialize_one(self, parent_node, node_dict):
         node_type = node_dict.get("type")
         base_name = node_dict.get("name") or f"{node_type}"
 
-        new_item = QTreeWidgetItem(parent_node)
+        # 先建立未掛載的項目並填好資料，最後才一次 addChild，避免每次 setData 都觸發模型更新
+        new_item = QTreeWidgetItem()
         new_item.setData(0, Qt.ItemDataRole.UserRole, node_type)
 
-        data = node_dict.get("data", {})
+        data = node_dict.get("data") or _EMPTY_DICT
 
         if node_type == "Tag":
             name = self._unique_name(parent_node, base_name, "Tag")
@@ -348,7 +466,6 @@ class ClipboardManager:
                 
                 # 如果原始地址有 [n] 格式，提取陣列大小
                 if is_array_type and addr and isinstance(addr, str):
-                    import re
                     match = re.search(r'\[(\d+)\]', addr)
                     if match:
                         array_size = int(match.group(1))
@@ -410,7 +527,6 @@ class ClipboardManager:
                 },
                 "scaling": data.get("d6") or {"type": "None"},
             }
-            new_item.setHidden(True)
             self.app.controller.save_tag(new_item, tag_data)
 
         elif node_type == "Device":
@@ -497,5 +613,9 @@ class ClipboardManager:
                 if v is not None:
                     new_item.setData(i, Qt.ItemDataRole.UserRole, v)
 
-        for child in node_dict.get("children", []):
-            self._deserialize_item(new_item, child)
+        # 立即掛上：後續兄弟節點的名稱/位址計算需要看到此節點。
+        # setHidden 對未掛載的項目無效，必須在 addChild 之後呼叫。
+        parent_node.addChild(new_item)
+        if node_type == "Tag":
+            new_item.setHidden(True)
+        return new_item
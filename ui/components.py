@@ -3,6 +3,9 @@ UI 組件工具模塊 - 統合所有 UI 相關的輔助工具和組件
 包含：表格設置、表單生成器、數據轉換、樹項工具等
 """
 
+import functools
+import logging
+
 from PyQt6.QtWidgets import (
     QTableWidget,
     QAbstractButton,
@@ -16,6 +19,8 @@ from PyQt6.QtWidgets import (
 from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QPalette
 
+logger = logging.getLogger(__name__)
+
 # UI constants defined locally to avoid import issues
 TABLE_STYLE_DARK = "QTableWidget { background-color: #2b2b2b; }"
 HEADER_V_STYLE_DARK = "QHeaderView::section { background-color: #2b2b2b; }"
@@ -28,9 +33,17 @@ HEADER_H_STYLE_LIGHT = "QHeaderView::section { background-color: white; color: b
 CORNER_BUTTON_STYLE_LIGHT = "background-color: white; border: none; color: black;"
 FORM_FIELD_STYLE_LIGHT = "QLineEdit { min-height: 22px; border: 1px solid #999; } QSpinBox { min-height: 22px; } QSpinBox QLineEdit { border: 1px solid #999; } QComboBox { min-height: 22px; border: 1px solid #999; }"
 FORM_FIELD_STYLE_DARK = "QLineEdit { min-height: 22px; } QSpinBox { min-height: 22px; } QComboBox { min-height: 22px; }"
+# 表單控件樣式只作用於設定此動態屬性的容器（見 use_form_field_style）
+FORM_FIELD_PROPERTY = "formFields"
 ROW_HEIGHT = 22
 FORM_ROW_SPACING = 6  # 統一使用6像素間距
 
+# FormBuilder 取值分派表：控件類型 -> 未綁定的取值方法
+_FIELD_GETTERS = {
+    QLineEdit: QLineEdit.text,
+    QComboBox: QComboBox.currentText,
+}
+
 
 def is_light_theme():
     """檢測系統是否為淺色主題"""
@@ -42,14 +55,38 @@ def is_light_theme():
     return False
 
 
+@functools.lru_cache(maxsize=1)
 def get_form_field_style():
-    """根據系統主題返回合適的表單控件樣式"""
+    """根據系統主題返回合適的表單控件樣式
+
+    結果會被快取；主題在執行期間變更時請呼叫 get_form_field_style.cache_clear()。
+    """
     if is_light_theme():
         return FORM_FIELD_STYLE_LIGHT
     else:
         return FORM_FIELD_STYLE_DARK
 
 
+def get_scoped_form_field_style():
+    """應用程式層級使用的表單控件樣式
+
+    每條規則都加上 FORM_FIELD_PROPERTY 屬性選擇器，只套用到
+    use_form_field_style() 標記過的容器內的控件；主視窗、QInputDialog、
+    QFileDialog 等其他控件維持原本外觀。啟動時 setStyleSheet 一次即可。
+    """
+    scope = f'*[{FORM_FIELD_PROPERTY}="true"] '
+    rules = [r.strip() for r in get_form_field_style().split("}") if r.strip()]
+    return " ".join(f"{scope}{rule} }}" for rule in rules)
+
+
+def use_form_field_style(widget):
+    """讓 widget 內的表單控件套用應用程式層級的表單樣式
+
+    只設定動態屬性，不需要像 setStyleSheet 一樣為每個實例重新解析樣式表。
+    """
+    widget.setProperty(FORM_FIELD_PROPERTY, True)
+
+
 # ===== 表格相關工具 =====
 
 
@@ -147,9 +184,19 @@ def call_controller(app, method_name, *args, **kwargs):
         ctrl = getattr(app, "controller", None)
         if ctrl is None:
             return None
-        fn = getattr(ctrl, method_name, None)
+        # 綁定方法快取：以 (controller, {方法名: 綁定方法}) 保存在 app 上，
+        # controller 被替換時（身分不同）整份快取失效
+        cache = getattr(app, "_controller_method_cache", None)
+        if cache is None or cache[0] is not ctrl:
+            cache = (ctrl, {})
+            app._controller_method_cache = cache
+        methods = cache[1]
+        fn = methods.get(method_name)
         if fn is None:
-            return None
+            fn = getattr(ctrl, method_name, None)
+            if fn is None:
+                return None
+            methods[method_name] = fn
         return fn(*args, **kwargs)
     except Exception:
         return None
@@ -167,22 +214,20 @@ def schedule_temp_export(app, delay=50):
 
 
 def collect_selected_tree_items(table):
-    items = []
     try:
         sel = table.selectionModel().selectedRows()
-        for s in sel:
-            row = s.row()
-            itm = table.item(row, 0)
-            if itm is None:
-                continue
-
-            tree_item = safe_data(itm, Qt.ItemDataRole.UserRole)
-            if tree_item is not None:
-                items.append(tree_item)
+        # 綁定為區域變數，避免逐列重複的屬性查找
+        _item = table.item
+        _safe_data = safe_data
+        _role = Qt.ItemDataRole.UserRole
+        return [
+            tree_item
+            for s in sel
+            if (itm := _item(s.row(), 0)) is not None
+            and (tree_item := _safe_data(itm, _role)) is not None
+        ]
     except Exception:
-        pass
-
-    return items
+        return []
 
 
 # ===== 表單生成器 =====
@@ -203,7 +248,7 @@ class FormBuilder(QWidget):
         self.layout = QFormLayout(self)
         self.layout.setVerticalSpacing(FORM_ROW_SPACING)
         self.fields = {}
-        self.setStyleSheet(get_form_field_style())
+        use_form_field_style(self)
 
     def add_field(
         self, field_id, label_text, field_type="text", options=None, default=""
@@ -215,7 +260,7 @@ class FormBuilder(QWidget):
             field_id: 字段唯一識別碼
             label_text: 標籤文本
             field_type: 字段類型 ('text' 或 'combo')
-            options: 組合框的選項列表
+            options: 組合框的選項序列（list 或 tuple，不會被修改）
             default: 默認值
         """
         label = QLabel(label_text)
@@ -235,6 +280,21 @@ class FormBuilder(QWidget):
         self.layout.addRow(label, widget)
         self.fields[field_id] = widget
 
+    def add_fields(self, specs):
+        """
+        批次添加表單字段（期間暫停重繪，只做一次版面計算）
+
+        Args:
+            specs: 可迭代的字典，每個字典為 add_field 的參數
+        """
+        self.setUpdatesEnabled(False)
+        try:
+            for spec in specs:
+                self.add_field(**spec)
+        finally:
+            self.setUpdatesEnabled(True)
+        self.updateGeometry()
+
     def clear_form(self):
         """清空所有字段"""
         while self.layout.count() > 0:
@@ -248,28 +308,30 @@ class FormBuilder(QWidget):
         Returns:
             字段 ID 到值的字典映射
         """
-        values = {}
-        for fid, widget in self.fields.items():
-            if isinstance(widget, QLineEdit):
-                values[fid] = widget.text()
-            elif isinstance(widget, QComboBox):
-                values[fid] = widget.currentText()
-        return values
+        getters = _FIELD_GETTERS
+        return {
+            fid: getter(widget)
+            for fid, widget in self.fields.items()
+            if (getter := getters.get(type(widget))) is not None
+        }
 
     def set_values(self, data):
         """
-        設置表單字段值
+        設置表單字段值（資料格式錯誤時只記錄 debug，不拋出例外）
 
         Args:
             data: 字段 ID 到值的字典映射
         """
-        for fid, value in data.items():
-            if fid in self.fields:
-                widget = self.fields[fid]
+        try:
+            fields = self.fields
+            for fid, value in data.items():
+                widget = fields.get(fid)
                 if isinstance(widget, QLineEdit):
                     widget.setText(str(value))
                 elif isinstance(widget, QComboBox):
                     widget.setCurrentText(str(value))
+        except Exception as e:
+            logger.debug("FormBuilder.set_values ignored invalid data: %s", e)
 
 
 __all__ = [
@@ -2,10 +2,12 @@ import sys, os
 # Allow running this dialog file directly from the project folder.
 # When executed directly, ensure the project root is on sys.path so
 # imports like `ui.widgets.form_builder` resolve correctly.
-_project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-if _project_root not in sys.path:
-    sys.path.insert(0, _project_root)
+if __name__ == "__main__":
+    _project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    if _project_root not in sys.path:
+        sys.path.insert(0, _project_root)
 
+import functools
 import serial.tools.list_ports
 import psutil
 import socket
@@ -19,19 +21,174 @@ from PyQt6.QtWidgets import (
     QComboBox,
     QLabel,
     QPushButton,
+    QStackedWidget,
 )
-from ui.components import FormBuilder, get_form_field_style
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+from ui.components import FormBuilder, use_form_field_style
 # UI constants
 DEFAULT_SPACING = 6  # 統一的垂直間距
+DETECTING_TEXT = "Detecting…"  # 背景列舉尚未完成時的佔位項目
+
+# Driver 名稱（interned，供各對話框以 dict 查表分派）
+DRIVER_RTU = sys.intern("Modbus RTU Serial")
+DRIVER_OVER_TCP = sys.intern("Modbus RTU over TCP")
+DRIVER_ETHERNET = sys.intern("Modbus TCP/IP Ethernet")
+DRIVERS = (DRIVER_RTU, DRIVER_OVER_TCP, DRIVER_ETHERNET)
 from collections import OrderedDict
 
+# 列舉迴圈中常用的全域屬性，於 import 時綁定
+_AF_INET = socket.AF_INET
+_net_if_addrs = psutil.net_if_addrs
+
+if sys.platform == "win32":
+    import ctypes
+    from ctypes import wintypes
+
+    # GetAdaptersAddresses：只取 FriendlyName + IPv4，略過 DNS / Anycast / Multicast 資訊
+    _GAA_FLAG_SKIP_ANYCAST = 0x0002
+    _GAA_FLAG_SKIP_MULTICAST = 0x0004
+    _GAA_FLAG_SKIP_DNS_SERVER = 0x0008
+    _GAA_FLAG_SKIP_DNS_INFO = 0x0800
+    _GAA_FLAGS = (
+        _GAA_FLAG_SKIP_ANYCAST
+        | _GAA_FLAG_SKIP_MULTICAST
+        | _GAA_FLAG_SKIP_DNS_SERVER
+        | _GAA_FLAG_SKIP_DNS_INFO
+    )
+    _ERROR_BUFFER_OVERFLOW = 111
+    _ERROR_NO_DATA = 232
+    _ADAPTERS_INITIAL_BUFSIZE = 15000  # MSDN 建議的起始大小
+
+    class _SOCKADDR_IN(ctypes.Structure):
+        _fields_ = [
+            ("sin_family", ctypes.c_ushort),
+            ("sin_port", ctypes.c_ushort),
+            ("sin_addr", ctypes.c_ubyte * 4),
+        ]
+
+    class _SOCKET_ADDRESS(ctypes.Structure):
+        _fields_ = [
+            ("lpSockaddr", ctypes.POINTER(_SOCKADDR_IN)),
+            ("iSockaddrLength", ctypes.c_int),
+        ]
+
+    class _IP_ADAPTER_UNICAST_ADDRESS(ctypes.Structure):
+        pass
+
+    _IP_ADAPTER_UNICAST_ADDRESS._fields_ = [
+        ("Length", wintypes.ULONG),
+        ("Flags", wintypes.DWORD),
+        ("Next", ctypes.POINTER(_IP_ADAPTER_UNICAST_ADDRESS)),
+        ("Address", _SOCKET_ADDRESS),
+    ]
+
+    class _IP_ADAPTER_ADDRESSES(ctypes.Structure):
+        # 只宣告到 FriendlyName，後續欄位用不到
+        pass
+
+    _IP_ADAPTER_ADDRESSES._fields_ = [
+        ("Length", wintypes.ULONG),
+        ("IfIndex", wintypes.DWORD),
+        ("Next", ctypes.POINTER(_IP_ADAPTER_ADDRESSES)),
+        ("AdapterName", ctypes.c_char_p),
+        ("FirstUnicastAddress", ctypes.POINTER(_IP_ADAPTER_UNICAST_ADDRESS)),
+        ("FirstAnycastAddress", ctypes.c_void_p),
+        ("FirstMulticastAddress", ctypes.c_void_p),
+        ("FirstDnsServerAddress", ctypes.c_void_p),
+        ("DnsSuffix", ctypes.c_wchar_p),
+        ("Description", ctypes.c_wchar_p),
+        ("FriendlyName", ctypes.c_wchar_p),
+    ]
+
+# Communication 表單欄位定義（add_field 參數），於 import 時建立一次
+_RTU_SERIAL_FIELDS = (
+    dict(field_id="com", label_text="COM ID:", field_type="combo",
+         options=[DETECTING_TEXT], default=DETECTING_TEXT),
+    dict(field_id="baud", label_text="Baud Rate:", field_type="combo",
+         options=["4800", "9600", "19200", "38400", "57600", "115200"], default="9600"),
+    dict(field_id="data_bits", label_text="Data Bits:", field_type="combo",
+         options=["5", "6", "7", "8"], default="8"),
+    dict(field_id="parity", label_text="Parity:", field_type="combo",
+         options=["None", "Odd", "Even"], default="None"),
+    dict(field_id="stop", label_text="Stop Bits:", field_type="combo",
+         options=["1", "2"], default="1"),
+    dict(field_id="flow", label_text="Flow Control:", field_type="combo",
+         options=["None", "DTR", "RTS", "RTS/DTR", "RTS Always", "RTS Manual"], default="None"),
+)
+_ADAPTER_FIELDS = (
+    dict(field_id="adapter", label_text="Network Adapter:", field_type="combo",
+         options=[DETECTING_TEXT], default=DETECTING_TEXT),
+)
+_DRIVER_TCP_FIELDS = (
+    dict(field_id="ip", label_text="IP Address:", field_type="text", default="127.0.0.1"),
+    dict(field_id="port", label_text="Port:", field_type="text", default="502"),
+    dict(field_id="protocol", label_text="Protocol:", field_type="combo",
+         options=["TCP/IP", "UDP"], default="TCP/IP"),
+)
+
+# Driver -> (Communication 頁面 index, 需要列舉的清單)
+_COMM_LAYOUTS = {
+    DRIVER_RTU: (0, "com"),
+    DRIVER_OVER_TCP: (1, "adapter"),
+    DRIVER_ETHERNET: (2, "adapter"),
+}
+
+
+@functools.lru_cache(maxsize=1)
+def _detect_local_ip():
+    # 以 UDP connect 取得本機對外 IP（不會實際送出封包），每個 process 只做一次
+    try:
+        s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        try:
+            s.settimeout(0.2)
+            s.connect(('8.8.8.8', 80))
+            return s.getsockname()[0]
+        finally:
+            s.close()
+    except Exception:
+        return '127.0.0.1'
+
+
+class _EnumerateSignals(QObject):
+    # QRunnable 不是 QObject，訊號需另外掛在此物件上
+    finished = pyqtSignal(str, list)
+
+
+class _EnumerateWorker(QRunnable):
+    # 在 QThreadPool 中列舉 COM Ports 或網卡（kind 為 "com" / "adapter"），
+    # 完成後以訊號送回 UI 執行緒
+    def __init__(self, kind, enumerate_fn):
+        super().__init__()
+        self.signals = _EnumerateSignals()
+        self._kind = kind
+        self._enumerate_fn = enumerate_fn
+
+    def run(self):
+        try:
+            items = self._enumerate_fn()
+        except Exception:
+            items = []
+        try:
+            self.signals.finished.emit(self._kind, items)
+        except RuntimeError:
+            # 對話框（與訊號物件）已在列舉期間被銷毀
+            pass
+
 
 class ChannelDialog(QDialog):
     def __init__(self, parent=None, suggested_name="Channel1"):
         super().__init__(parent)
         self.setWindowTitle("Channel Properties")
         self.setMinimumSize(600, 500)
-        self.setStyleSheet(get_form_field_style())
+        use_form_field_style(self)
+
+        # COM Port / 網卡列舉結果快取（列舉成本高，切換 Driver 時不重複查詢 OS）
+        self._ports_cache = None
+        self._adapters_cache = None
+        self._adapters_bufsize = None  # 上次 GetAdaptersAddresses 需要的 buffer 大小
+        self._enum_signals = {}  # kind -> 執行中的 worker 訊號物件
+        # load_data 在列舉完成前要求的 Communication 值，列舉完成後再套用一次
+        self._pending_comm = {}
 
         main_layout = QVBoxLayout(self)
         main_layout.setSpacing(DEFAULT_SPACING)  # 設置統一的垂直間距
@@ -58,13 +215,14 @@ class ChannelDialog(QDialog):
         drv_lay = QVBoxLayout(self.tab_driver)
         drv_lay.setSpacing(DEFAULT_SPACING)  # 設置統一的垂直間距
         self.driver_combo = QComboBox()
-        self.driver_combo.addItems(
-            ["Modbus RTU Serial", "Modbus RTU over TCP", "Modbus TCP/IP Ethernet"]
-        )
+        self.driver_combo.addItems(DRIVERS)
         drv_lay.addWidget(QLabel("Select Driver:"))
         drv_lay.addWidget(self.driver_combo)
         # Driver-specific settings builder (e.g. IP, Port, Protocol)
+        # 只有 TCP 類 Driver 會顯示，欄位建立一次即可
         self.driver_builder = FormBuilder()
+        self.driver_builder.add_fields(_DRIVER_TCP_FIELDS)
+        self.driver_builder.setVisible(False)
         drv_lay.addWidget(self.driver_builder)
         drv_lay.addStretch()
 
@@ -75,8 +233,23 @@ class ChannelDialog(QDialog):
         self.tab_comm = QWidget()
         comm_lay = QVBoxLayout(self.tab_comm)
         comm_lay.setSpacing(DEFAULT_SPACING)  # 設置統一的垂直間距
-        self.builder = FormBuilder()
-        comm_lay.addWidget(self.builder)
+        # 每個 Driver 的表單只建立一次，切換 Driver 時僅切換 QStackedWidget 頁面
+        # （順序與 driver_combo 相同：Serial / RTU over TCP / TCP/IP Ethernet）
+        self._form_serial = self._build_serial_form()
+        self._form_tcp = self._build_adapter_form()
+        self._form_ethernet = self._build_adapter_form()
+        self._comm_forms = (self._form_serial, self._form_tcp, self._form_ethernet)
+        self.comm_stack = QStackedWidget()
+        for form in self._comm_forms:
+            self.comm_stack.addWidget(form)
+        self.builder = self._form_serial  # 目前顯示中的 Communication 表單
+        comm_lay.addWidget(self.comm_stack)
+        # 列舉結果有快取，Refresh 按鈕可強制重新列舉（例如開窗後才插入的 COM Port）
+        refresh_h = QHBoxLayout()
+        refresh_h.addStretch()
+        self.btn_refresh = QPushButton("Refresh")
+        refresh_h.addWidget(self.btn_refresh)
+        comm_lay.addLayout(refresh_h)
 
         # 調整分頁順序：General -> Driver -> Communication
         self.tabs.addTab(self.tab_ident, "General")
@@ -95,113 +268,171 @@ class ChannelDialog(QDialog):
 
         # 事件連結
         self.driver_combo.currentIndexChanged.connect(self._update_comm_fields)
+        self.btn_refresh.clicked.connect(self.refresh_enumeration)
         self.btn_finish.clicked.connect(self.accept)
         self.btn_cancel.clicked.connect(self.reject)
 
-        # 初始化欄位
+        # 初始化欄位（只在背景列舉目前 Driver 需要的清單，對話框可立即開啟）
+        self._update_comm_fields()
+
+    def refresh_enumeration(self):
+        # 清除列舉快取並重新列舉 COM / 網卡清單（例如插拔 USB 轉 RS485 後）
+        self._ports_cache = None
+        self._adapters_cache = None
+        # 保留目前的選擇，列舉完成後若仍存在會重新選取
+        for fid in ("com", "adapter"):
+            widget = self.builder.fields.get(fid)
+            if widget is not None and widget.currentText() not in ("", DETECTING_TEXT):
+                self._pending_comm[fid] = widget.currentText()
+        for form in self._comm_forms:
+            for fid in ("com", "adapter"):
+                widget = form.fields.get(fid)
+                if widget is not None:
+                    widget.clear()
+                    widget.addItem(DETECTING_TEXT)
         self._update_comm_fields()
 
+    def _start_enumeration(self, kind):
+        if kind in self._enum_signals:
+            return
+        if kind == "com":
+            worker = _EnumerateWorker(kind, self._enumerate_ports)
+        else:
+            worker = _EnumerateWorker(kind, self._enumerate_network_adapters)
+        self._enum_signals[kind] = worker.signals
+        worker.signals.finished.connect(self._on_enumerated)
+        QThreadPool.globalInstance().start(worker)
+
+    def _on_enumerated(self, kind, items):
+        self._enum_signals.pop(kind, None)
+        if kind == "com":
+            if self._ports_cache is None:
+                self._ports_cache = items if items else ["COM1"]
+        elif self._adapters_cache is None:
+            self._adapters_cache = items if items else self._fallback_adapters()
+        self._fill_detected_combos()
+
+    def _fill_detected_combos(self):
+        # 將仍顯示佔位項目的 COM / 網卡下拉選單換成實際列舉結果
+        for fid, items in (("com", self._ports_cache), ("adapter", self._adapters_cache)):
+            if items is None:
+                continue
+            for form in self._comm_forms:
+                widget = form.fields.get(fid)
+                if widget is None or widget.findText(DETECTING_TEXT) < 0:
+                    continue
+                widget.clear()
+                widget.addItems(items)
+                wanted = self._pending_comm.get(fid)
+                if wanted:
+                    widget.setCurrentText(str(wanted))
+
+    def _resolve_pending_enumeration(self):
+        # 背景列舉尚未完成時（例如使用者立即按 Finish），改為同步列舉目前需要的清單
+        if "com" in self.builder.fields:
+            self._get_available_ports()
+        if "adapter" in self.builder.fields:
+            self._get_network_adapters()
+        self._fill_detected_combos()
+
     def _get_available_ports(self):
+        if self._ports_cache is None:
+            self._ports_cache = self._enumerate_ports()
+        return self._ports_cache
+
+    def _get_network_adapters(self):
+        if self._adapters_cache is None:
+            self._adapters_cache = self._enumerate_network_adapters()
+        return self._adapters_cache
+
+    def _enumerate_ports(self):
         # 🔍 自動搜尋目前電腦上的 COM Ports
         ports = [p.device for p in serial.tools.list_ports.comports()]
         return ports if ports else ["COM1"]
 
-    def _get_network_adapters(self):
+    def _enumerate_network_adapters(self):
         # 🌐 自動搜尋目前電腦上的 Network Adapters
+        adapters = None
+        if sys.platform == "win32":
+            adapters = self._get_network_adapters_win()
+        if adapters is not None:
+            return adapters if adapters else self._fallback_adapters()
         adapters = []
         try:
-            interfaces = psutil.net_if_addrs()
-            for name, snics in interfaces.items():
-                for snic in snics:
-                    if snic.family == socket.AF_INET:
-                        adapters.append(f"{name} ({snic.address})")
+            for name, snics in _net_if_addrs().items():
+                # 每張網卡只顯示第一個 IPv4 位址
+                ipv4 = next((s.address for s in snics if s.family is _AF_INET), None)
+                if ipv4:
+                    adapters.append(f"{name} ({ipv4})")
         except Exception:
             pass
         # 如果沒找到任何實體網卡，至少提供一個自動偵測項（Auto - <ip>）
         if not adapters:
-            try:
-                s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-                s.settimeout(0.2); s.connect(('8.8.8.8', 80)); ip = s.getsockname()[0]; s.close()
-            except Exception:
-                ip = '127.0.0.1'
-            adapters = [f"Auto - {ip}"]
+            adapters = self._fallback_adapters()
         return adapters
 
+    def _get_network_adapters_win(self):
+        # 直接呼叫 iphlpapi.GetAdaptersAddresses（psutil 會額外收集用不到的資訊）
+        # 失敗時回傳 None，由呼叫端改用 psutil
+        try:
+            gaa = ctypes.windll.iphlpapi.GetAdaptersAddresses
+            size = wintypes.ULONG(self._adapters_bufsize or _ADAPTERS_INITIAL_BUFSIZE)
+            for _ in range(3):
+                buf = ctypes.create_string_buffer(size.value)
+                ret = gaa(socket.AF_INET, _GAA_FLAGS, None, buf, ctypes.byref(size))
+                if ret != _ERROR_BUFFER_OVERFLOW:
+                    break
+            if ret == _ERROR_NO_DATA:
+                return []
+            if ret != 0:
+                return None
+            self._adapters_bufsize = size.value
+
+            adapters = []
+            node = ctypes.cast(buf, ctypes.POINTER(_IP_ADAPTER_ADDRESSES))
+            while node:
+                adapter = node.contents
+                addr = adapter.FirstUnicastAddress
+                while addr:
+                    sa = addr.contents.Address.lpSockaddr
+                    if sa and sa.contents.sin_family == socket.AF_INET:
+                        ip = ".".join(str(b) for b in sa.contents.sin_addr)
+                        adapters.append(f"{adapter.FriendlyName} ({ip})")
+                        break
+                    addr = addr.contents.Next
+                node = adapter.Next
+            return adapters
+        except Exception:
+            return None
+
+    def _fallback_adapters(self):
+        return [f"Auto - {_detect_local_ip()}"]
+
+    def _build_serial_form(self):
+        # ✨ COM ID 先顯示佔位項目，背景列舉完成後再填入自動偵測的 Ports 清單
+        form = FormBuilder()
+        form.add_fields(_RTU_SERIAL_FIELDS)
+        return form
+
+    def _build_adapter_form(self):
+        # ✨ 網卡清單同樣先顯示佔位項目（顯示為 'Interface (IP)'，預設第一張網卡）
+        form = FormBuilder()
+        form.add_fields(_ADAPTER_FIELDS)
+        return form
+
     def _update_comm_fields(self):
-        # 根據選擇的 Driver 動態更新 Communication 頁面
-        self.builder.clear_form()
-        # driver-specific settings
-        self.driver_builder.clear_form()
-        self.driver_builder.setVisible(False)
-        driver = self.driver_combo.currentText()
-
-        if driver == "Modbus RTU Serial":
-            # ✨ 使用自動偵測的 Ports 清單
-            ports = self._get_available_ports()
-            self.builder.add_field(
-                "com", "COM ID:", "combo", options=ports, default=ports[0]
-            )
-
-            self.builder.add_field(
-                "baud",
-                "Baud Rate:",
-                "combo",
-                options=["4800", "9600", "19200", "38400", "57600", "115200"],
-                default="9600",
-            )
-            self.builder.add_field(
-                "data_bits",
-                "Data Bits:",
-                "combo",
-                options=["5", "6", "7", "8"],
-                default="8",
-            )
-            self.builder.add_field(
-                "parity",
-                "Parity:",
-                "combo",
-                options=["None", "Odd", "Even"],
-                default="None",
-            )
-            self.builder.add_field(
-                "stop",
-                "Stop Bits:",
-                "combo",
-                options=["1", "2"],
-                default="1",
-            )
-            self.builder.add_field(
-                "flow",
-                "Flow Control:",
-                "combo",
-                options=[
-                    "None",
-                    "DTR",
-                    "RTS",
-                    "RTS/DTR",
-                    "RTS Always",
-                    "RTS Manual",
-                ],
-                default="None",
-            )
-        else:
-            # ✨ 使用自動偵測的網卡清單
-            adapters = self._get_network_adapters()
-            # default to first detected adapter
-            default_choice = adapters[0] if adapters else ''
-            # display as 'Interface (IP)' for clarity
-            self.builder.add_field(
-                "adapter", "Network Adapter:", "combo", options=adapters, default=default_choice
-            )
-            # show driver-level ethernet settings for TCP drivers
-            if driver in ("Modbus RTU over TCP", "Modbus TCP/IP Ethernet"):
-                # 將 IP, Port, Protocol 移到 Driver 分頁下
-                self.driver_builder.add_field("ip", "IP Address:", "text", default="127.0.0.1")
-                self.driver_builder.add_field("port", "Port:", "text", default="502")
-                self.driver_builder.add_field(
-                    "protocol", "Protocol:", "combo", options=["TCP/IP", "UDP"], default="TCP/IP"
-                )
-                self.driver_builder.setVisible(True)
+        # 根據選擇的 Driver 切換 Communication 頁面
+        idx, kind = _COMM_LAYOUTS.get(self.driver_combo.currentText(), _COMM_LAYOUTS[DRIVER_RTU])
+        self.comm_stack.setCurrentIndex(idx)
+        self.builder = self._comm_forms[idx]
+        # 將 IP, Port, Protocol 放在 Driver 分頁下，只有 TCP 類 Driver 顯示
+        self.driver_builder.setVisible(kind == "adapter")
+
+        # 只在背景列舉目前 Driver 需要的清單
+        cache = self._ports_cache if kind == "com" else self._adapters_cache
+        if cache is None:
+            self._start_enumeration(kind)
+        self._fill_detected_combos()
 
     def load_data(self, data):
         # 載入舊資料，包含描述內容
@@ -227,12 +458,9 @@ class ChannelDialog(QDialog):
                 if idx >= 0:
                     self.driver_combo.setCurrentIndex(idx)
             # driver-level params
-            try:
-                dp = driver_section.get("params") or {}
-                if isinstance(dp, dict):
-                    self.driver_builder.set_values(dp)
-            except Exception:
-                pass
+            dp = driver_section.get("params") or {}
+            if isinstance(dp, dict):
+                self.driver_builder.set_values(dp)
         else:
             idx = self.driver_combo.findText(data.get("driver", ""))
             if idx >= 0:
@@ -240,63 +468,41 @@ class ChannelDialog(QDialog):
 
         # Communication params: prefer explicit 'communication', then driver.params, then top-level 'params'
         comm = data.get("communication") if isinstance(data.get("communication"), dict) else None
-        if comm is not None:
-            try:
-                self.builder.set_values(comm)
-            except Exception:
-                pass
-        else:
+        if comm is None:
             # fallback to driver.params if present
             if isinstance(driver_section, dict) and isinstance(driver_section.get("params"), dict):
-                try:
-                    self.builder.set_values(driver_section.get("params") or {})
-                except Exception:
-                    pass
-            else:
-                if "params" in data:
-                    try:
-                        self.builder.set_values(data["params"])
-                    except Exception:
-                        pass
+                comm = driver_section.get("params") or {}
+            elif "params" in data:
+                comm = data["params"]
+        if isinstance(comm, dict):
+            self.builder.set_values(comm)
+            # COM / 網卡清單可能仍在背景列舉，記下要求的值待列舉完成後再套用
+            self._pending_comm = {k: comm[k] for k in ("com", "adapter") if k in comm}
 
     def get_data(self):
         # 回傳當前設定
-        params = {}
-        try:
-            params.update(self.driver_builder.get_values())
-        except Exception:
-            pass
-        try:
-            params.update(self.builder.get_values())
-        except Exception:
-            pass
-        # For compatibility: return flat structure as before, and also
-        # provide nested keys matching the configuration tree.
-        # split params into driver-level and comm-level where possible
+        self._resolve_pending_enumeration()
+        # split params into driver-level and comm-level; each form is read once
         driver_params = {}
         comm_params = {}
         try:
-            driver_params = self.driver_builder.get_values()
-        except Exception:
-            driver_params = {}
-        try:
+            # Serial Driver 沒有 Driver 層級參數
+            if not self.driver_builder.isHidden():
+                driver_params = self.driver_builder.get_values()
             comm_params = self.builder.get_values()
         except Exception:
-            comm_params = {}
+            pass
 
-        flat = {
-            "name": self.name_edit.text(),
-            "description": self.desc_edit.text(),
-            "driver": self.driver_combo.currentText(),
+        name = self.name_edit.text()
+        description = self.desc_edit.text()
+        # For compatibility: flat keys as before plus nested keys matching the
+        # configuration tree ('driver' is the nested form)
+        out = {
+            "name": name,
+            "description": description,
+            "driver": OrderedDict([("type", self.driver_combo.currentText()), ("params", driver_params)]),
             "params": {**driver_params, **comm_params},
+            "general": {"channel_name": name, "description": description},
+            "communication": comm_params,
         }
-
-        nested = OrderedDict([
-            ("general", {"channel_name": self.name_edit.text(), "description": self.desc_edit.text()}),
-            ("driver", OrderedDict([("type", self.driver_combo.currentText()), ("params", driver_params)])),
-            ("communication", comm_params),
-        ])
-
-        # merge flat and nested for backward compatibility
-        out = {**flat, **nested}
         return out
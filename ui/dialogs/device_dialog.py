@@ -1,3 +1,5 @@
+import re
+
 from PyQt6.QtWidgets import (
     QDialog,
     QVBoxLayout,
@@ -10,23 +12,135 @@ from PyQt6.QtWidgets import (
     QPushButton,
 )
 from PyQt6.QtCore import Qt
-from ui.components import FormBuilder, get_form_field_style
+from ui.components import FormBuilder, use_form_field_style
+from ui.dialogs.channel_dialog import DRIVER_RTU, DRIVER_OVER_TCP, DRIVER_ETHERNET
+from core.config.constants import (
+    MODBUS_DEFAULT_TIMING,
+    MODBUS_DEFAULT_DATA_ACCESS,
+    MODBUS_DEFAULT_ENCODING,
+    MODBUS_DEFAULT_BLOCK_SIZES,
+)
 # UI constants
 DEFAULT_SPACING = 6  # 統一的垂直間距
+_ENABLE_DISABLE = ("Enable", "Disable")  # 所有旗標下拉選單共用
+# 旗標值 -> 顯示文字（1 / True / 1.0 與 0 / False 經 hash 相等也會命中）
+_FLAG_MAP = {
+    **dict.fromkeys((1, "1", "enable", "Enable", "true", "True"), "Enable"),
+    **dict.fromkeys((0, "0", "disable", "Disable", "false", "False"), "Disable"),
+}
+
+# 各分頁欄位定義 (id, label, type, default)，於 import 時計算一次
+_CONNECT_TIMEOUT_FIELD = (
+    "connect_timeout", "Connect Timeout (s):", "text", MODBUS_DEFAULT_TIMING.get("connect_timeout", "")
+)
+_CONNECT_ATTEMPTS_FIELD = (
+    "connect_attempts", "Connect Attempts:", "text", MODBUS_DEFAULT_TIMING.get("connect_attempts", "")
+)
+_TIMING_FIELDS = (
+    ("req_timeout", "Request Timeout (ms):", "text", MODBUS_DEFAULT_TIMING.get("req_timeout", "")),
+    ("attempts", "Attempts Before Timeout:", "text", MODBUS_DEFAULT_TIMING.get("attempts", "")),
+    ("inter_req_delay", "Inter-Request Delay (ms):", "text", MODBUS_DEFAULT_TIMING.get("inter_req_delay", "")),
+)
+_ACCESS_FIELDS = tuple(
+    (key, label, "combo", MODBUS_DEFAULT_DATA_ACCESS.get(key, ""))
+    for key, label in (
+        ("zero_based", "Zero-Based Addressing:"),
+        ("zero_based_bit", "Zero-Based Bit Addressing:"),
+        ("bit_writes", "Holding Register Bit Writes:"),
+        ("func_06", "Modbus Function 06:"),
+        ("func_05", "Modbus Function 05:"),
+    )
+)
+_ENCODING_FIELDS = tuple(
+    (key, label, "combo", MODBUS_DEFAULT_ENCODING.get(key, ""))
+    for key, label in (
+        ("byte_order", "Modbus Byte Order:"),
+        ("word_order", "First Word Low:"),
+        ("dword_order", "First Dword Low:"),
+        ("bit_order", "Modicon Bit Order:"),
+        ("treat_longs_as_decimals", "Treat Longs as Decimals:"),
+    )
+)
+_BLOCK_FIELDS = tuple(
+    (key, label, "text", MODBUS_DEFAULT_BLOCK_SIZES.get(key, ""))
+    for key, label in (
+        ("out_coils", "Output Coils:"),
+        ("in_coils", "Input Coils:"),
+        ("int_regs", "Internal Registers:"),
+        ("hold_regs", "Holding Registers:"),
+    )
+)
+
+_CANONICAL_BLOCK_KEYS = frozenset({"out_coils", "in_coils", "int_regs", "hold_regs"})
+_INT_RE = re.compile(r"^-?\d+$")
+
+
+def _alt_block_key(name):
+    """Block Sizes 非標準名稱 -> 標準 key；無法對應時回傳 None
+
+    依序比對（先命中者為準），與舊版判斷相同，唯獨 "interval" 這類
+    只是剛好含有 "int" 的名稱不再歸入 int_regs。
+    """
+    lk = name.casefold()
+    if "hold" in lk:
+        return "hold_regs"
+    if ("int" in lk and "interval" not in lk) or ("input" in lk and "reg" in lk):
+        return "int_regs"
+    if "coil" in lk:
+        if "out" in lk:
+            return "out_coils"
+        if "in" in lk:
+            return "in_coils"
+    return None
+
+
+# load_data 用：旗標欄位 ID
+_ACCESS_KEYS = frozenset(field[0] for field in _ACCESS_FIELDS)
+_ENCODING_KEYS = frozenset(field[0] for field in _ENCODING_FIELDS)
+
+# Timing JSON key -> FormBuilder 欄位 ID
+# JSON: request_timeout, attempts_before_timeout, inter_request_delay, connect_timeout, connect_attempts
+# 短名稱在前、JSON 名稱在後，兩者並存時以 JSON 名稱為準
+_TIMING_JSON_TO_FIELD = {
+    "connect_timeout": "connect_timeout",
+    "connect_attempts": "connect_attempts",
+    "req_timeout": "req_timeout",
+    "request_timeout": "req_timeout",
+    "attempts": "attempts",
+    "attempts_before_timeout": "attempts",
+    "inter_req_delay": "inter_req_delay",
+    "inter_request_delay": "inter_req_delay",
+}
+
+# Driver -> (is_serial, is_over_tcp, is_ethernet)
+_DRIVER_FLAGS = {
+    DRIVER_RTU: (True, False, False),
+    DRIVER_OVER_TCP: (False, True, False),
+    DRIVER_ETHERNET: (False, False, True),
+}
+
+# 分頁 index -> 該分頁 FormBuilder 的屬性名稱（General 分頁沒有 FormBuilder）
+_TAB_BUILDERS = (None, "timing_builder", "access_builder", "encoding_builder", "block_builder")
+
+
+def _add_fields(builder, fields):
+    for id_, label, typ, default in fields:
+        options = _ENABLE_DISABLE if typ == "combo" else None
+        builder.add_field(id_, label, typ, options=options, default=default)
 
 
 class DeviceDialog(QDialog):
-    def __init__(self, parent=None, suggested_name="", driver_type="Modbus RTU Serial"):
+    def __init__(self, parent=None, suggested_name="", driver_type=DRIVER_RTU):
         super().__init__(parent)
         self.driver_type = str(driver_type)
         self.setWindowTitle("Device Properties")
         self.setMinimumSize(600, 550)
-        self.setStyleSheet(get_form_field_style())
+        use_form_field_style(self)
 
         # --- 根據 Driver 字串判斷顯示邏輯 ---
-        self.is_serial = self.driver_type == "Modbus RTU Serial"
-        self.is_over_tcp = self.driver_type == "Modbus RTU over TCP"
-        self.is_ethernet = self.driver_type == "Modbus TCP/IP Ethernet"
+        self.is_serial, self.is_over_tcp, self.is_ethernet = _DRIVER_FLAGS.get(
+            self.driver_type, (False, False, False)
+        )
 
         main_layout = QVBoxLayout(self)
         main_layout.setSpacing(DEFAULT_SPACING)  # 設置統一的垂直間距
@@ -35,17 +149,23 @@ class DeviceDialog(QDialog):
         # 1. General
         self._setup_general_tab(suggested_name)
 
-        # 2. Timing (預設值參考邏輯圖)
-        self._setup_timing_tab()
-
-        # 3. DataAccess (預設值參考邏輯圖)
-        self._setup_access_tab()
-
-        # 4. Data Encoding (預設值參考邏輯圖)
-        self._setup_encoding_tab()
-
-        # 5. Block Sizes (預設值參考圖)
-        self._setup_blocks_tab()
+        # 2-5. Timing / DataAccess / Data Encoding / Block Sizes (預設值參考邏輯圖)
+        # 先放空白頁，第一次切換到該分頁（或 get_data）時才建立表單
+        self._tab_setups = [
+            None,
+            self._setup_timing_tab,
+            self._setup_access_tab,
+            self._setup_encoding_tab,
+            self._setup_blocks_tab,
+        ]
+        self._tab_initialized = [True, False, False, False, False]
+        # load_data 在分頁建立前要求的值：tab index -> values
+        self._pending_tab_values = {}
+        for title in ("Timing", "DataAccess", "DataEncoding", "Block Sizes"):
+            page = QWidget()
+            QVBoxLayout(page).setSpacing(DEFAULT_SPACING)  # 設置統一的垂直間距
+            self.tabs.addTab(page, title)
+        self.tabs.currentChanged.connect(self._on_tab_changed)
 
         main_layout.addWidget(self.tabs)
 
@@ -85,162 +205,78 @@ class DeviceDialog(QDialog):
         lay.addStretch()
         self.tabs.addTab(self.tab_ident, "General")
 
+    def _on_tab_changed(self, idx):
+        self._ensure_tab(idx)
+
+    def _ensure_tab(self, idx):
+        # 建立尚未初始化的分頁表單，並套用 load_data 暫存的值
+        if idx < 0 or idx >= len(self._tab_initialized) or self._tab_initialized[idx]:
+            return
+        self._tab_initialized[idx] = True
+        self._tab_setups[idx]()
+        pending = self._pending_tab_values.pop(idx, None)
+        if pending:
+            self._tab_builder(idx).set_values(pending)
+
+    def _tab_builder(self, idx):
+        return getattr(self, _TAB_BUILDERS[idx])
+
+    def _set_tab_values(self, idx, values):
+        if self._tab_initialized[idx]:
+            self._tab_builder(idx).set_values(values)
+        elif isinstance(values, dict):  # 與 FormBuilder.set_values 相同，忽略格式錯誤的資料
+            self._pending_tab_values.setdefault(idx, {}).update(values)
+
     # Ethernet settings are now handled at Channel/Driver level
 
     def _setup_timing_tab(self):
         # 對應邏輯圖：Request Timeout, Attempts, Inter-Request Delay
-        self.tab_timing = QWidget()
-        lay = QVBoxLayout(self.tab_timing)
-        lay.setSpacing(DEFAULT_SPACING)  # 設置統一的垂直間距
+        self.tab_timing = self.tabs.widget(1)
+        lay = self.tab_timing.layout()
         self.timing_builder = FormBuilder()
 
-        from core.config.constants import MODBUS_DEFAULT_TIMING
-
+        fields = ()
         if self.is_over_tcp or self.is_ethernet:
-            self.timing_builder.add_field(
-                "connect_timeout", "Connect Timeout (s):", "text", default=MODBUS_DEFAULT_TIMING.get("connect_timeout", "")
-            )
-
+            fields += (_CONNECT_TIMEOUT_FIELD,)
         if self.is_over_tcp:
-            self.timing_builder.add_field(
-                "connect_attempts", "Connect Attempts:", "text", default=MODBUS_DEFAULT_TIMING.get("connect_attempts", "")
-            )
-
+            fields += (_CONNECT_ATTEMPTS_FIELD,)
         # 使用預設值
-        self.timing_builder.add_field(
-            "req_timeout", "Request Timeout (ms):", "text", default=MODBUS_DEFAULT_TIMING.get("req_timeout", "")
-        )
-        self.timing_builder.add_field(
-            "attempts", "Attempts Before Timeout:", "text", default=MODBUS_DEFAULT_TIMING.get("attempts", "")
-        )
-        self.timing_builder.add_field(
-            "inter_req_delay", "Inter-Request Delay (ms):", "text", default=MODBUS_DEFAULT_TIMING.get("inter_req_delay", "")
-        )
+        _add_fields(self.timing_builder, fields + _TIMING_FIELDS)
 
         lay.addWidget(self.timing_builder)
-        self.tabs.addTab(self.tab_timing, "Timing")
 
     def _setup_access_tab(self):
         # 對應邏輯圖 DataAccess 節點
-        self.tab_access = QWidget()
-        lay = QVBoxLayout(self.tab_access)
-        lay.setSpacing(DEFAULT_SPACING)  # 設置統一的垂直間距
+        self.tab_access = self.tabs.widget(2)
+        lay = self.tab_access.layout()
         self.access_builder = FormBuilder()
 
-        from core.config.constants import MODBUS_DEFAULT_DATA_ACCESS
-
         # 使用預設值
-        self.access_builder.add_field(
-            "zero_based",
-            "Zero-Based Addressing:",
-            "combo",
-            options=["Enable", "Disable"],
-            default=MODBUS_DEFAULT_DATA_ACCESS.get("zero_based", ""),
-        )
-        self.access_builder.add_field(
-            "zero_based_bit",
-            "Zero-Based Bit Addressing:",
-            "combo",
-            options=["Enable", "Disable"],
-            default=MODBUS_DEFAULT_DATA_ACCESS.get("zero_based_bit", ""),
-        )
-        self.access_builder.add_field(
-            "bit_writes",
-            "Holding Register Bit Writes:",
-            "combo",
-            options=["Enable", "Disable"],
-            default=MODBUS_DEFAULT_DATA_ACCESS.get("bit_writes", ""),
-        )
-        self.access_builder.add_field(
-            "func_06",
-            "Modbus Function 06:",
-            "combo",
-            options=["Enable", "Disable"],
-            default=MODBUS_DEFAULT_DATA_ACCESS.get("func_06", ""),
-        )
-        self.access_builder.add_field(
-            "func_05",
-            "Modbus Function 05:",
-            "combo",
-            options=["Enable", "Disable"],
-            default=MODBUS_DEFAULT_DATA_ACCESS.get("func_05", ""),
-        )
+        _add_fields(self.access_builder, _ACCESS_FIELDS)
 
         lay.addWidget(self.access_builder)
-        self.tabs.addTab(self.tab_access, "DataAccess")
 
     def _setup_encoding_tab(self):
         # 對應邏輯圖 Data Encoding 節點
-        self.tab_encoding = QWidget()
-        lay = QVBoxLayout(self.tab_encoding)
-        lay.setSpacing(DEFAULT_SPACING)  # 設置統一的垂直間距
+        self.tab_encoding = self.tabs.widget(3)
+        lay = self.tab_encoding.layout()
         self.encoding_builder = FormBuilder()
 
-        from core.config.constants import MODBUS_DEFAULT_ENCODING
-
         # 使用預設值
-        self.encoding_builder.add_field(
-            "byte_order",
-            "Modbus Byte Order:",
-            "combo",
-            options=["Enable", "Disable"],
-            default=MODBUS_DEFAULT_ENCODING.get("byte_order", ""),
-        )
-        self.encoding_builder.add_field(
-            "word_order",
-            "First Word Low:",
-            "combo",
-            options=["Enable", "Disable"],
-            default=MODBUS_DEFAULT_ENCODING.get("word_order", ""),
-        )
-        self.encoding_builder.add_field(
-            "dword_order",
-            "First Dword Low:",
-            "combo",
-            options=["Enable", "Disable"],
-            default=MODBUS_DEFAULT_ENCODING.get("dword_order", ""),
-        )
-        self.encoding_builder.add_field(
-            "bit_order",
-            "Modicon Bit Order:",
-            "combo",
-            options=["Enable", "Disable"],
-            default=MODBUS_DEFAULT_ENCODING.get("bit_order", ""),
-        )
-        self.encoding_builder.add_field(
-            "treat_longs_as_decimals",
-            "Treat Longs as Decimals:",
-            "combo",
-            options=["Enable", "Disable"],
-            default=MODBUS_DEFAULT_ENCODING.get("treat_longs_as_decimals", ""),
-        )
+        _add_fields(self.encoding_builder, _ENCODING_FIELDS)
 
         lay.addWidget(self.encoding_builder)
-        self.tabs.addTab(self.tab_encoding, "DataEncoding")
 
     def _setup_blocks_tab(self):
         # 對應邏輯圖 Block Sizes 節點
-        self.tab_blocks = QWidget()
-        lay = QVBoxLayout(self.tab_blocks)
-        lay.setSpacing(DEFAULT_SPACING)  # 設置統一的垂直間距
+        self.tab_blocks = self.tabs.widget(4)
+        lay = self.tab_blocks.layout()
         self.block_builder = FormBuilder()
 
-        from core.config.constants import MODBUS_DEFAULT_BLOCK_SIZES
-
         # 使用預設值
-        self.block_builder.add_field(
-            "out_coils", "Output Coils:", "text", default=MODBUS_DEFAULT_BLOCK_SIZES.get("out_coils", "")
-        )
-        self.block_builder.add_field("in_coils", "Input Coils:", "text", default=MODBUS_DEFAULT_BLOCK_SIZES.get("in_coils", ""))
-        self.block_builder.add_field(
-            "int_regs", "Internal Registers:", "text", default=MODBUS_DEFAULT_BLOCK_SIZES.get("int_regs", "")
-        )
-        self.block_builder.add_field(
-            "hold_regs", "Holding Registers:", "text", default=MODBUS_DEFAULT_BLOCK_SIZES.get("hold_regs", "")
-        )
+        _add_fields(self.block_builder, _BLOCK_FIELDS)
 
         lay.addWidget(self.block_builder)
-        self.tabs.addTab(self.tab_blocks, "Block Sizes")
 
     def load_data(self, data):
         from core.utils import safe_getattr, safe_item_data
@@ -286,60 +322,31 @@ class DeviceDialog(QDialog):
         self._load_tab_data(data, general)
 
     def _load_tab_data(self, data, general):
-        from core.config.constants import MODBUS_DEFAULT_TIMING, MODBUS_DEFAULT_DATA_ACCESS, MODBUS_DEFAULT_ENCODING, MODBUS_DEFAULT_BLOCK_SIZES
-        
         timing = data.get("timing") or general.get("timing")
         if timing:
-            # Map JSON keys to FormBuilder field IDs
-            # JSON: request_timeout, attempts_before_timeout, inter_request_delay, connect_timeout, connect_attempts
-            # FormBuilder: req_timeout, attempts, inter_req_delay, connect_timeout, connect_attempts
+            # Map JSON keys to FormBuilder field IDs (see _TIMING_JSON_TO_FIELD)
             timing_mapped = {}
             if isinstance(timing, dict):
-                # Direct mappings (same key)
-                if "connect_timeout" in timing:
-                    timing_mapped["connect_timeout"] = timing["connect_timeout"]
-                if "connect_attempts" in timing:
-                    timing_mapped["connect_attempts"] = timing["connect_attempts"]
-                # Key transformations
-                if "request_timeout" in timing:
-                    timing_mapped["req_timeout"] = timing["request_timeout"]
-                elif "req_timeout" in timing:
-                    timing_mapped["req_timeout"] = timing["req_timeout"]
-                if "attempts_before_timeout" in timing:
-                    timing_mapped["attempts"] = timing["attempts_before_timeout"]
-                elif "attempts" in timing:
-                    timing_mapped["attempts"] = timing["attempts"]
-                if "inter_request_delay" in timing:
-                    timing_mapped["inter_req_delay"] = timing["inter_request_delay"]
-                elif "inter_req_delay" in timing:
-                    timing_mapped["inter_req_delay"] = timing["inter_req_delay"]
-            self.timing_builder.set_values(timing_mapped)
+                timing_mapped = {
+                    field: timing[key]
+                    for key, field in _TIMING_JSON_TO_FIELD.items()
+                    if key in timing
+                }
+            self._set_tab_values(1, timing_mapped)
 
         access = data.get("data_access") or general.get("data_access")
         if access:
-            access_display = self._convert_flags_to_display(
-                access,
-                ["zero_based", "zero_based_bit", "bit_writes", "func_06", "func_05"],
-            )
-            self.access_builder.set_values(access_display)
+            access_display = self._convert_flags_to_display(access, _ACCESS_KEYS)
+            self._set_tab_values(2, access_display)
 
         enc = data.get("encoding") or general.get("encoding")
         if enc:
-            enc_display = self._convert_flags_to_display(
-                enc,
-                [
-                    "byte_order",
-                    "word_order",
-                    "dword_order",
-                    "bit_order",
-                    "treat_longs_as_decimals",
-                ],
-            )
-            self.encoding_builder.set_values(enc_display)
+            enc_display = self._convert_flags_to_display(enc, _ENCODING_KEYS)
+            self._set_tab_values(3, enc_display)
 
         blocks = data.get("block_sizes") or general.get("block_sizes")
         if blocks:
-            self.block_builder.set_values(blocks)
+            self._set_tab_values(4, blocks)
 
     def _convert_flags_to_display(self, flags_dict, flag_keys):
         display = {}
@@ -350,37 +357,34 @@ class DeviceDialog(QDialog):
         return display
 
     def _flag_to_display_value(self, value):
-        if value in (1, "1", "enable", "Enable", "true", "True"):
-            return "Enable"
-        elif value in (0, "0", "disable", "Disable", "false", "False"):
-            return "Disable"
-        return str(value)
+        try:
+            return _FLAG_MAP.get(value) or str(value)
+        except TypeError:  # unhashable（list / dict）
+            return str(value)
 
     def get_data(self):
         # Return both flat and nested structures for compatibility
-        nested = {
-            "general": {
-                "name": self.name_edit.text(),
-                "description": self.desc_edit.text(),
-                "device_id": self.id_spin.value(),
-            },
+        for idx in range(1, len(self._tab_initialized)):
+            self._ensure_tab(idx)
+        name = self.name_edit.text()
+        description = self.desc_edit.text()
+        device_id = self.id_spin.value()
+        # ethernet moved to Channel/Driver; Device no longer returns ethernet settings
+        result = {
+            "name": name,
+            "description": description,
+            "device_id": device_id,
             "timing": self.timing_builder.get_values(),
             "data_access": self.access_builder.get_values(),
             "encoding": self.encoding_builder.get_values(),
             # normalize block sizes to integers and canonical keys
             "block_sizes": self._normalize_block_sizes(self.block_builder.get_values()),
+            "general": {
+                "name": name,
+                "description": description,
+                "device_id": device_id,
+            },
         }
-        flat = {
-            "name": self.name_edit.text(),
-            "description": self.desc_edit.text(),
-            "device_id": self.id_spin.value(),
-            "timing": nested["timing"],
-            "data_access": nested["data_access"],
-            "encoding": nested["encoding"],
-            "block_sizes": nested["block_sizes"],
-        }
-        # ethernet moved to Channel/Driver; Device no longer returns ethernet settings
-        result = {**flat, **nested}
         import logging
 
         logger = logging.getLogger(__name__)
@@ -399,32 +403,28 @@ class DeviceDialog(QDialog):
                 return out
             if isinstance(raw, dict):
                 for k, v in raw.items():
-                    lk = str(k).strip()
-                    try:
-                        if v is None or str(v).strip() == "":
+                    lk = k.strip() if type(k) is str else str(k).strip()
+                    if type(v) is int:
+                        vi = v
+                    else:
+                        try:
+                            if v is None:
+                                continue
+                            sv = str(v).strip()
+                            if not sv:
+                                continue
+                            # 純整數字串不必經過 float 轉換
+                            vi = int(sv) if _INT_RE.match(sv) else int(float(sv))
+                        except Exception:
                             continue
-                        vi = int(float(str(v).strip()))
-                    except Exception:
-                        continue
                     # keep only expected keys
-                    if lk in ("out_coils", "in_coils", "int_regs", "hold_regs"):
+                    if lk in _CANONICAL_BLOCK_KEYS:
                         out[lk] = vi
                     else:
                         # try to map common alternative names
-                        lk2 = lk.lower()
-                        if "hold" in lk2:
-                            out.setdefault("hold_regs", vi)
-                        elif (
-                            "int" in lk2
-                            or "internal" in lk2
-                            or "input" in lk2
-                            and "reg" in lk2
-                        ):
-                            out.setdefault("int_regs", vi)
-                        elif "out" in lk2 and "coil" in lk2:
-                            out.setdefault("out_coils", vi)
-                        elif "in" in lk2 and "coil" in lk2:
-                            out.setdefault("in_coils", vi)
+                        canon = _alt_block_key(lk)
+                        if canon is not None:
+                            out.setdefault(canon, vi)
             # if caller passed a single numeric value, apply to registers
             elif isinstance(raw, (int, float)):
                 v = int(raw)
@@ -1,4 +1,5 @@
 import sys, os
+from contextlib import contextmanager
 # Allow running this dialog file directly from the project folder.
 # When executed directly, ensure the project root is on sys.path so
 # imports like `ui.widgets.form_builder` resolve correctly.
@@ -8,23 +9,77 @@ if _project_root not in sys.path:
 
 from PyQt6.QtWidgets import (
     QDialog, QDialogButtonBox, QVBoxLayout, QLabel, QTabWidget, 
-    QWidget, QHBoxLayout, QCheckBox, QFormLayout, QLineEdit
+    QWidget, QHBoxLayout, QCheckBox, QFormLayout, QLineEdit, QComboBox, QPushButton,
+    QListWidget, QListWidgetItem, QAbstractItemView, QLayout
 )
-from PyQt6.QtCore import Qt
-from ui.components import FormBuilder, get_form_field_style
+from PyQt6.QtCore import Qt, QTimer
+from ui.components import FormBuilder, ROW_HEIGHT
 # UI constants
 SPACING = 6  # 統一的垂直間距
 MARGIN_H = 12
 MARGIN_V = 12
 FORM_MAX_WIDTH = 600
-from core.utils.network_utils import detect_outbound_ip, get_network_adapters
+ENDPOINT_DEBOUNCE_MS = 150  # 連續輸入 Port 時合併 endpoint 更新
+from core.utils.network_utils import (
+    cached_network_adapters,
+    cached_outbound_ip,
+    invalidate_network_cache,
+)
+
+AUTH_OPTIONS = ['Anonymous', 'Username/Password']
+SECURITY_POLICIES = (
+    ('policy_none', 'None'),
+    ('policy_sign_aes128', 'Sign - Aes128'),
+    ('policy_sign_aes256', 'Sign - Aes256'),
+    ('policy_sign_basic256sha256', 'Sign - Basic256Sha256'),
+    ('policy_encrypt_aes128', 'Sign & Encrypt - Aes128'),
+    ('policy_encrypt_aes256', 'Sign & Encrypt - Aes256'),
+    ('policy_encrypt_basic256sha256', 'Sign & Encrypt - Basic256Sha256'),
+)
+SETTINGS_FIELDS = ('application_Name', 'namespace', 'port', 'network_adapter',
+                   'network_adapter_ip', 'max_sessions', 'publish_interval')
+AUTH_FIELDS = ('authentication', 'username', 'password')
+CERT_FIELDS = ('organization', 'organization_unit', 'locality', 'state', 'country', 'cert_validity')
+# get_data 輸出的巢狀區段名稱
+NESTED_SECTIONS = ('general', 'authentication', 'security_policies', 'certificate')
+# 巢狀區段的輸出 key 與表單欄位 key 對照（依輸出順序）；
+# security_policies / certificate 兩區段的 key 與欄位相同，不需對照
+SCHEMA = (
+    ('general', (
+        ('application_name', 'application_Name'),
+        ('namespace', 'namespace'),
+        ('port', 'port'),
+        ('product_uri', 'product_uri'),  # 唯讀，由 adapter IP + port 計算
+        ('network_adapter', 'network_adapter'),
+        ('network_adapter_ip', 'network_adapter_ip'),
+        ('max_sessions', 'max_sessions'),
+        ('publish_interval', 'publish_interval'),
+    )),
+    ('authentication', tuple((k, k) for k in AUTH_FIELDS)),
+)
+_SCHEMA_FIELD_KEYS = {out: field for _, spec in SCHEMA for out, field in spec}
+
+
+def _make_form(parent):
+    # 固定 QFormLayout 的成長/換行策略，避免版面計算時依 style 反覆查詢與重排
+    form = FormBuilder(parent)
+    form.layout.setSpacing(SPACING)
+    form.layout.setFieldGrowthPolicy(QFormLayout.FieldGrowthPolicy.AllNonFixedFieldsGrow)
+    form.layout.setRowWrapPolicy(QFormLayout.RowWrapPolicy.DontWrapRows)
+    form.setMaximumWidth(FORM_MAX_WIDTH)
+    return form
+
+
+def _check_state(checked):
+    return Qt.CheckState.Checked if checked else Qt.CheckState.Unchecked
+
 
 class OPCUADialog(QDialog):
     def __init__(self, parent=None, initial=None):
         super().__init__(parent)
         self.setWindowTitle("OPC UA Server")
         self.resize(640, 560)
-        self.setStyleSheet(get_form_field_style())
+        # 表單樣式已於啟動時套用在 QApplication 上，此處不再重複解析 QSS
 
         # 建立主分頁控制項
         self.tabs = QTabWidget(self)
@@ -35,9 +90,7 @@ class OPCUADialog(QDialog):
         s_layout.setSpacing(SPACING)
         s_layout.setContentsMargins(MARGIN_H, MARGIN_V, MARGIN_H, MARGIN_V)
         
-        self.settings_form = FormBuilder(self.settings_tab)
-        self.settings_form.layout.setSpacing(SPACING)
-        self.settings_form.setMaximumWidth(FORM_MAX_WIDTH)
+        self.settings_form = _make_form(self.settings_tab)
         self.settings_form.add_field('application_Name', 'Application Name')
             # removed host_name field: network adapter / adapter IP used instead
         self.settings_form.add_field('namespace', 'Namespace')
@@ -47,9 +100,17 @@ class OPCUADialog(QDialog):
         self.product_uri_label.setStyleSheet("color: #888;")
         self.settings_form.layout.addRow("Product URI (Application URI)", self.product_uri_label)
         # Network adapter selector (combo). We'll populate with adapter names and IPv4 addresses
-        self.settings_form.add_field('network_adapter', 'Network Adapter', field_type='combo', options=[])
+        # 網卡清單有快取，Refresh 按鈕可強制重新列舉
+        adapter_h = QHBoxLayout()
+        na_combo = QComboBox()
+        na_combo.setFixedHeight(ROW_HEIGHT)
+        adapter_h.addWidget(na_combo, 1)
+        self.refresh_adapters_btn = QPushButton('Refresh')
+        self.refresh_adapters_btn.clicked.connect(self._refresh_adapters)
+        adapter_h.addWidget(self.refresh_adapters_btn)
+        self.settings_form.layout.addRow("Network Adapter", adapter_h)
+        self.settings_form.fields['network_adapter'] = na_combo
         # keep a hidden field for adapter ip so values() returns it
-        from PyQt6.QtWidgets import QLineEdit
         self._adapter_ip_hidden = QLineEdit()
         self._adapter_ip_hidden.setVisible(False)
         self.settings_form.fields['network_adapter_ip'] = self._adapter_ip_hidden
@@ -60,207 +121,256 @@ class OPCUADialog(QDialog):
         s_layout.addWidget(self.settings_form)
         s_layout.addStretch()
 
-        # --- 2. Authentication Tab (具備 Username/Password 動態顯示邏輯) ---
+        # --- Authentication / Security Policies / Certificate Tabs ---
+        # 先放空白頁，第一次切換到該分頁時才建立內容；建立前的值保存在 _*_state
         self.auth_tab = QWidget()
+        self.sec_tab = QWidget()
+        self.cert_tab = QWidget()
+        self._built = {'auth': False, 'sec': False, 'cert': False}
+        self._auth_state = {'authentication': 'Anonymous', 'username': '', 'password': ''}
+        self._sec_state = {k: False for k, _ in SECURITY_POLICIES}
+        self._cert_state = {k: '' for k in CERT_FIELDS}
+        self._auto_generate_state = False
+        self._common_name_state = 'ModUA@ModUA'
+
+        # --- 組裝主視圖 ---
+        self.tabs.addTab(self.settings_tab, 'Settings')
+        self.tabs.addTab(self.auth_tab, 'Authentication')
+        self.tabs.addTab(self.sec_tab, 'Security Policies')
+        self.tabs.addTab(self.cert_tab, 'Certificate')
+
+        main_layout = QVBoxLayout(self)
+        main_layout.setSizeConstraint(QLayout.SizeConstraint.SetMinAndMaxSize)
+        main_layout.setContentsMargins(MARGIN_H, MARGIN_V, MARGIN_H, MARGIN_V)
+        main_layout.addWidget(QLabel('Configure OPC UA Server parameters below:'))
+        main_layout.addWidget(self.tabs)
+
+        buttons = QDialogButtonBox(QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel)
+        try:
+            ok_btn = buttons.button(QDialogButtonBox.StandardButton.Ok)
+            if ok_btn is not None:
+                ok_btn.setText('Finish')
+        except Exception:
+            pass
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+        main_layout.addWidget(buttons)
+
+        self.tabs.currentChanged.connect(self._on_tab_changed)
+
+        # endpoint 顯示更新的 debounce timer（single-shot，重複 start 即重新計時）
+        self._endpoint_timer = QTimer(self)
+        self._endpoint_timer.setSingleShot(True)
+        self._endpoint_timer.setInterval(ENDPOINT_DEBOUNCE_MS)
+        self._endpoint_timer.timeout.connect(self._update_endpoint_label)
+        # 對話框顯示前不計算 endpoint / 不列舉網卡，於第一次 showEvent（或 get_data）時一次完成
+        self._endpoint_dirty = False
+        self._adapters_populated = False
+        # load_data 在延後的 endpoint 計算前指定的 adapter IP，計算後需再套用
+        self._loaded_adapter_ip = None
+        # port / network adapter 的訊號於 Settings 分頁第一次啟用時才連接
+        self._settings_wired = False
+
+        # 初始初始化
+        self._apply_defaults(initial)
+        self._update_endpoint_label()
+
+    # --- 分頁延遲建立 ---
+
+    def _on_tab_changed(self, idx):
+        builder = {0: self._settings_tab_activated, 1: self._build_auth_tab, 2: self._build_sec_tab, 3: self._build_cert_tab}.get(idx)
+        if builder is not None:
+            builder()
+
+    def _build_auth_tab(self):
+        # Authentication Tab (具備 Username/Password 動態顯示邏輯)
+        if self._built['auth']:
+            return
+        self._built['auth'] = True
         a_layout = QVBoxLayout(self.auth_tab)
         a_layout.setSpacing(SPACING)
         a_layout.setContentsMargins(MARGIN_H, MARGIN_V, MARGIN_H, MARGIN_V)
-        
-        self.auth_form = FormBuilder(self.auth_tab)
-        self.auth_form.layout.setSpacing(SPACING)
-        self.auth_form.setMaximumWidth(FORM_MAX_WIDTH)
-        self.auth_form.add_field('authentication', 'Authentication', field_type='combo', 
-                                 options=['Anonymous', 'Username/Password'], 
+
+        self.auth_form = _make_form(self.auth_tab)
+        self.auth_form.add_field('authentication', 'Authentication', field_type='combo',
+                                 options=AUTH_OPTIONS,
                                  default='Anonymous')
         self.auth_form.add_field('username', 'Username')
         self.auth_form.add_field('password', 'Password')
-        
+        self.auth_form.set_values(self._auth_state)
+
         a_layout.addWidget(self.auth_form)
         a_layout.addStretch()
+        self._setup_auth_visibility()
 
-        # --- Security Policies Tab ---
-        self.sec_tab = QWidget()
+    def _build_sec_tab(self):
+        # Security Policies Tab
+        if self._built['sec']:
+            return
+        self._built['sec'] = True
         sec_layout = QVBoxLayout(self.sec_tab)
         sec_layout.setSpacing(SPACING)
         sec_layout.setContentsMargins(MARGIN_H, MARGIN_V, MARGIN_H, MARGIN_V)
 
-        self.sec_checkboxes = {
-            'policy_none': QCheckBox('None'),
-            'policy_sign_aes128': QCheckBox('Sign - Aes128'),
-            'policy_sign_aes256': QCheckBox('Sign - Aes256'),
-            'policy_sign_basic256sha256': QCheckBox('Sign - Basic256Sha256'),
-            'policy_encrypt_aes128': QCheckBox('Sign & Encrypt - Aes128'),
-            'policy_encrypt_aes256': QCheckBox('Sign & Encrypt - Aes256'),
-            'policy_encrypt_basic256sha256': QCheckBox('Sign & Encrypt - Basic256Sha256')
-        }
-
-        for cb in self.sec_checkboxes.values():
-            sec_layout.addWidget(cb)
-        sec_layout.addStretch()
-
-        # --- Certificate Tab ---
-        self.cert_tab = QWidget()
+        # 單一 QListWidget 內的可勾選項目，取代每個 policy 各一個 QCheckBox
+        self.sec_list = QListWidget()
+        self.sec_list.setSelectionMode(QAbstractItemView.SelectionMode.NoSelection)
+        items = []
+        for k, label in SECURITY_POLICIES:
+            item = QListWidgetItem(label)
+            item.setFlags(item.flags() | Qt.ItemFlag.ItemIsUserCheckable)
+            item.setCheckState(_check_state(self._sec_state[k]))
+            item.setData(Qt.ItemDataRole.UserRole, k)
+            self.sec_list.addItem(item)
+            items.append((k, item))
+        # 固定順序的 (key, item) 清單，供 set_values / get_data 迭代
+        self._sec_items = tuple(items)
+        sec_layout.addWidget(self.sec_list)
+
+    def _build_cert_tab(self):
+        # Certificate Tab
+        if self._built['cert']:
+            return
+        self._built['cert'] = True
         cert_layout = QVBoxLayout(self.cert_tab)
         cert_layout.setSpacing(SPACING)
         cert_layout.setContentsMargins(MARGIN_H, MARGIN_V, MARGIN_H, MARGIN_V)
-        
+
         self.auto_generate = QCheckBox('Auto Generate Certificate')
+        self.auto_generate.setChecked(self._auto_generate_state)
         cert_layout.addWidget(self.auto_generate)
 
-        self.cert_form = FormBuilder(self.cert_tab)
-        self.cert_form.layout.setSpacing(SPACING)
-        self.cert_form.setMaximumWidth(FORM_MAX_WIDTH)
-        
-        self.common_name_label = QLabel('ModUA@ModUA')
+        self.cert_form = _make_form(self.cert_tab)
+
+        self.common_name_label = QLabel(self._common_name_state)
         self.common_name_label.setStyleSheet("color: #888;")
         self.cert_form.layout.addRow("Common Name", self.common_name_label)
-        
+
         self.cert_form.add_field('organization', 'Organization')
         self.cert_form.add_field('organization_unit', 'Organization Unit')
         self.cert_form.add_field('locality', 'Locality')
         self.cert_form.add_field('state', 'State')
-        
-        # Country + 提示說明
-        country_h = QHBoxLayout()
+
+        # Country / Validity：提示說明放在 placeholder，不另建 QLabel 與 HBox
         self.country_input = QLineEdit()
-        country_h.addWidget(self.country_input)
-        country_h.addWidget(QLabel("(e.g. DE, US, ...)") )
-        self.cert_form.layout.addRow("Country", country_h)
+        self.country_input.setFixedHeight(ROW_HEIGHT)
+        self.country_input.setPlaceholderText("e.g. DE, US, ...")
+        self.cert_form.layout.addRow("Country", self.country_input)
         self.cert_form.fields['country'] = self.country_input
 
-        # Validity + 提示說明
-        validity_h = QHBoxLayout()
         self.validity_input = QLineEdit()
-        validity_h.addWidget(self.validity_input)
-        validity_h.addWidget(QLabel("(Years, 1 - 20)"))
-        self.cert_form.layout.addRow("Certificate Validity", validity_h)
+        self.validity_input.setFixedHeight(ROW_HEIGHT)
+        self.validity_input.setPlaceholderText("Years, 1 - 20")
+        self.cert_form.layout.addRow("Certificate Validity", self.validity_input)
         self.cert_form.fields['cert_validity'] = self.validity_input
+        self.cert_form.set_values(self._cert_state)
 
         cert_layout.addWidget(self.cert_form)
         cert_layout.addStretch()
 
-        # --- 組裝主視圖 ---
-        self.tabs.addTab(self.settings_tab, 'Settings')
-        self.tabs.addTab(self.auth_tab, 'Authentication')
-        self.tabs.addTab(self.sec_tab, 'Security Policies')
-        self.tabs.addTab(self.cert_tab, 'Certificate')
-
-        main_layout = QVBoxLayout(self)
-        main_layout.setContentsMargins(MARGIN_H, MARGIN_V, MARGIN_H, MARGIN_V)
-        main_layout.addWidget(QLabel('Configure OPC UA Server parameters below:'))
-        main_layout.addWidget(self.tabs)
-
-        buttons = QDialogButtonBox(QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel)
-        try:
-            ok_btn = buttons.button(QDialogButtonBox.StandardButton.Ok)
-            if ok_btn is not None:
-                ok_btn.setText('Finish')
-        except Exception:
-            pass
-        buttons.accepted.connect(self.accept)
-        buttons.rejected.connect(self.reject)
-        main_layout.addWidget(buttons)
-
-        # 初始初始化
-        self._apply_defaults(initial)
-        self._connect_endpoint_updaters()
-        self._setup_auth_visibility()
-        self._update_endpoint_label()
-
     # --- 邏輯功能輔助方法 ---
 
     def _setup_auth_visibility(self):
         # 控制 Username 與 Password 欄位的動態顯示與隱藏
         combo = self.auth_form.fields.get('authentication')
-        def toggle():
-            is_up = combo.currentText() == 'Username/Password'
-            for key in ['username', 'password']:
-                widget = self.auth_form.fields.get(key)
-                if widget:
-                    widget.setVisible(is_up)
-                    label = self.auth_form.layout.labelForField(widget)
-                    if label: label.setVisible(is_up)
         if combo:
-            combo.currentTextChanged.connect(toggle)
-            toggle()
+            combo.currentTextChanged.connect(self._update_auth_visibility)
+            self._update_auth_visibility()
 
-    def _update_endpoint_label(self):
-        # 即時計算並顯示 opc.tcp 連線字串，優先使用選取的 network adapter IP 或自動偵測
-        try:
-            vals = self.settings_form.get_values()
-            # prefer selected network adapter IP
-            host = ''
-            try:
-                na_widget = self.settings_form.fields.get('network_adapter')
-                if na_widget and hasattr(na_widget, 'currentData'):
-                    ipdata = na_widget.currentData()
-                    if ipdata:
-                        host = str(ipdata).strip()
-                if not host:
-                    host = (vals.get('network_adapter_ip') or '').strip()
-            except Exception:
-                host = (vals.get('network_adapter_ip') or '').strip()
-
-            port = (vals.get('port') or '').strip()
-
-            # if host resolves to loopback or is empty, auto-detect a LAN IP
-            try:
-                if not host or host.lower() in ('localhost', '127.0.0.1', 'modua'):
-                    h = detect_outbound_ip()
-                else:
-                    h = host
-            except Exception:
-                h = detect_outbound_ip()
-
-            # expose chosen adapter ip in hidden field for persistence
-            try:
-                if hasattr(self, '_adapter_ip_hidden'):
-                    self._adapter_ip_hidden.setText(h)
-            except Exception:
-                pass
-
-            # Update product URI label with computed opc.tcp endpoint
-            try:
-                if port:
-                    endpoint = f"opc.tcp://{h}:{port}/"
-                else:
-                    endpoint = f"opc.tcp://{h}:4848/"
-                if hasattr(self, 'product_uri_label'):
-                    self.product_uri_label.setText(endpoint)
-            except Exception:
-                pass
-        except Exception:
-            pass
-
-    def _connect_endpoint_updaters(self):
-        # update when port changes or network adapter selection changes
-        for k in ['port', 'network_adapter']:
-            w = self.settings_form.fields.get(k)
-            try:
-                if hasattr(w, 'textChanged'):
-                    w.textChanged.connect(self._update_endpoint_label)
-                elif hasattr(w, 'currentIndexChanged'):
-                    w.currentIndexChanged.connect(self._on_adapter_changed)
-            except Exception:
-                pass
-        # initially populate adapters
+    def _update_auth_visibility(self):
+        combo = self.auth_form.fields.get('authentication')
+        if combo is None:
+            return
+        is_up = combo.currentText() == 'Username/Password'
+        for key in ['username', 'password']:
+            widget = self.auth_form.fields.get(key)
+            if widget:
+                widget.setVisible(is_up)
+                label = self.auth_form.layout.labelForField(widget)
+                if label: label.setVisible(is_up)
+
+    @contextmanager
+    def _bulk_update(self):
+        # 批次套用值時暫停所有欄位的訊號，結束後由呼叫端統一更新一次
+        widgets = [self.settings_form, *self.settings_form.fields.values()]
+        if self._built['auth']:
+            widgets += [self.auth_form, *self.auth_form.fields.values()]
+        if self._built['sec']:
+            widgets.append(self.sec_list)
+        if self._built['cert']:
+            widgets += [self.cert_form, self.auto_generate, *self.cert_form.fields.values()]
+        prev = [w.blockSignals(True) for w in widgets]
         try:
+            yield
+        finally:
+            for w, p in zip(widgets, prev):
+                w.blockSignals(p)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self._ensure_settings_ready()
+
+    def _ensure_settings_ready(self):
+        # 列舉網卡並套用延後的 endpoint 更新
+        self._settings_tab_activated()
+        if not self._adapters_populated:
+            self._adapters_populated = True
             self._populate_adapters()
-        except Exception:
-            pass
+        if self._endpoint_dirty or self._endpoint_timer.isActive():
+            self._endpoint_timer.stop()
+            self._update_endpoint_label(force=True)
+        if self._loaded_adapter_ip is not None:
+            self._adapter_ip_hidden.setText(self._loaded_adapter_ip)
+            self._loaded_adapter_ip = None
+
+    def _update_endpoint_label(self, force=False):
+        # 即時計算並顯示 opc.tcp 連線字串，優先使用選取的 network adapter IP 或自動偵測
+        if not force and not self.isVisible():
+            self._endpoint_dirty = True
+            return
+        self._endpoint_dirty = False
+        # 只讀取需要的兩個欄位，不走整張表單的 get_values()
+        fields = self.settings_form.fields
+        # prefer selected network adapter IP
+        ipdata = fields['network_adapter'].currentData()
+        host = str(ipdata).strip() if ipdata else ''
+        if not host:
+            host = self._adapter_ip_hidden.text().strip()
+        port = fields['port'].text().strip()
+
+        # if host resolves to loopback or is empty, auto-detect a LAN IP
+        if not host or host.lower() in ('localhost', '127.0.0.1', 'modua'):
+            host = cached_outbound_ip()
+
+        # expose chosen adapter ip in hidden field for persistence
+        self._adapter_ip_hidden.setText(host)
+        # Update product URI label with computed opc.tcp endpoint
+        self.product_uri_label.setText(f"opc.tcp://{host}:{port or '4848'}/")
+
+    def _settings_tab_activated(self):
+        # update when port changes or network adapter selection changes
+        if self._settings_wired:
+            return
+        self._settings_wired = True
+        fields = self.settings_form.fields
+        fields['port'].textChanged.connect(self._endpoint_timer.start)
+        fields['network_adapter'].currentIndexChanged.connect(self._on_adapter_changed)
+        # adapters are populated on first show (see _ensure_settings_ready)
 
     def _on_adapter_changed(self, idx=None):
-        try:
-            na = self.settings_form.fields.get('network_adapter')
-            if na and hasattr(na, 'currentData'):
-                ip = na.currentData()
-                try:
-                    self._adapter_ip_hidden.setText(str(ip or ''))
-                except Exception:
-                    pass
-            self._update_endpoint_label()
-        except Exception:
-            pass
+        ip = self.settings_form.fields['network_adapter'].currentData()
+        self._adapter_ip_hidden.setText(str(ip or ''))
+        self._endpoint_timer.start()
+
+    def _flush_endpoint_label(self):
+        # 立即套用尚未觸發的 endpoint 更新（讀取或覆寫相關欄位前呼叫）
+        self._endpoint_timer.stop()
+        self._update_endpoint_label()
+
+    def _refresh_adapters(self):
+        invalidate_network_cache()
+        self._populate_adapters()
+        self._flush_endpoint_label()
 
     def _populate_adapters(self):
         # Populate the network adapter combo with available IPv4 addresses using network_utils.
@@ -268,75 +378,56 @@ class OPCUADialog(QDialog):
             na_widget = self.settings_form.fields.get('network_adapter')
             if na_widget is None:
                 return
-            
+
             # Get current values before clearing
-            try:
-                current_vals = self.settings_form.get_values() or {}
-                saved_ip = current_vals.get('network_adapter_ip') or None
-                saved_name = current_vals.get('network_adapter') or None
-            except Exception:
-                saved_ip = None
-                saved_name = None
-            
+            saved_ip = self._adapter_ip_hidden.text() or None
+            saved_name = na_widget.currentText() or None
+
+            # Get adapters using unified utility; resolve the selection from the
+            # Python list instead of searching the combo model (first match wins)
+            adapters = cached_network_adapters()
+            ip_to_idx = {}
+            name_to_idx = {}
+            for i, (display_name, ip_addr) in enumerate(adapters):
+                ip_to_idx.setdefault(ip_addr, i)
+                name_to_idx.setdefault(display_name, i)
+
+            if saved_ip:
+                idx = ip_to_idx.get(saved_ip, -1)
+                if idx < 0:
+                    # target ip not present in detected adapters -> add a synthetic entry
+                    name = saved_name or ''
+                    if name.endswith(f"({saved_ip})"):
+                        display = name  # 重新列舉時沿用先前加入的項目名稱
+                    else:
+                        display = f"{name} ({saved_ip})" if name else f"Auto ({saved_ip})"
+                    adapters = [*adapters, (display, saved_ip)]
+                    idx = len(adapters) - 1
+            elif saved_name:
+                # Try to match by adapter name if no IP saved, else default to first adapter
+                idx = name_to_idx.get(saved_name, 0)
+            else:
+                # if no saved target, default to the first detected adapter
+                idx = 0
+
+            # 重建清單與選取期間暫停訊號，結束後只更新一次
+            was_blocked = na_widget.blockSignals(True)
             try:
                 na_widget.clear()
-            except Exception:
-                pass
-
-            # Get adapters using unified utility
-            adapters = get_network_adapters()
-            for display_name, ip_addr in adapters:
-                na_widget.addItem(display_name, ip_addr)
-
-            # Handle saved adapter IP selection
-            try:
-                if saved_ip:
-                    idx = na_widget.findData(saved_ip)
-                    if idx >= 0:
-                        na_widget.setCurrentIndex(idx)
-                        self._adapter_ip_hidden.setText(str(saved_ip))
-                    else:
-                        # target ip not present in detected adapters -> add a synthetic entry
-                        try:
-                            name = saved_name or ''
-                            display = f"{name} ({saved_ip})" if name else f"Auto ({saved_ip})"
-                            na_widget.addItem(display, saved_ip)
-                            # select the newly added item
-                            idx2 = na_widget.findData(saved_ip)
-                            if idx2 >= 0:
-                                na_widget.setCurrentIndex(idx2)
-                                self._adapter_ip_hidden.setText(str(saved_ip))
-                        except Exception:
-                            pass
-                elif saved_name:
-                    # Try to match by adapter name if no IP saved
-                    for i in range(na_widget.count()):
-                        if na_widget.itemText(i) == saved_name:
-                            na_widget.setCurrentIndex(i)
-                            current_ip = na_widget.currentData()
-                            if current_ip:
-                                self._adapter_ip_hidden.setText(str(current_ip))
-                            break
-                    else:
-                        # if no match, default to first adapter
-                        if na_widget.count() > 0:
-                            na_widget.setCurrentIndex(0)
-                            current_ip = na_widget.currentData()
-                            if current_ip:
-                                self._adapter_ip_hidden.setText(str(current_ip))
-                else:
-                    # if no saved target, default to the first detected adapter
-                    try:
-                        if na_widget.count() > 0:
-                            na_widget.setCurrentIndex(0)
-                            # Set hidden field to the selected adapter's IP
-                            current_ip = na_widget.currentData()
-                            if current_ip:
-                                self._adapter_ip_hidden.setText(str(current_ip))
-                    except Exception:
-                        pass
-            except Exception:
-                pass
+                # 一次插入所有名稱，再逐列補上 IP 資料
+                na_widget.addItems([display_name for display_name, _ in adapters])
+                for i, (_, ip_addr) in enumerate(adapters):
+                    na_widget.setItemData(i, ip_addr)
+                if idx < na_widget.count():
+                    na_widget.setCurrentIndex(idx)
+            finally:
+                na_widget.blockSignals(was_blocked)
+
+            if saved_ip:
+                self._adapter_ip_hidden.setText(str(saved_ip))
+            else:
+                self._adapter_ip_hidden.setText(str(na_widget.currentData() or ''))
+            self._endpoint_timer.start()
         except Exception:
             pass
 
@@ -363,135 +454,137 @@ class OPCUADialog(QDialog):
 
     def set_values(self, data: dict):
         if not data: return
-        for f in [self.settings_form, self.auth_form, self.cert_form]:
-            f.set_values(data)
-        for k, cb in self.sec_checkboxes.items():
-            cb.setChecked(bool(data.get(k, False)))
-        self.auto_generate.setChecked(bool(data.get('auto_generate', True)))
-        # 支援設置 Common Name（在表單中為 QLabel）
-        if 'common_name' in data and hasattr(self, 'common_name_label'):
-            try:
+        na_widget = self.settings_form.fields['network_adapter']
+        na_index = na_widget.currentIndex()
+        with self._bulk_update():
+            self._apply_values(data)
+        # 訊號暫停期間的變更在此統一處理一次
+        if na_widget.currentIndex() != na_index:
+            self._on_adapter_changed()
+        if self._built['auth']:
+            self._update_auth_visibility()
+        self._endpoint_timer.stop()
+        self._update_endpoint_label()
+
+    def _apply_values(self, data):
+        self.settings_form.set_values(data)
+
+        if self._built['auth']:
+            self.auth_form.set_values(data)
+        else:
+            for k in self._auth_state:
+                if k in data:
+                    v = str(data[k])
+                    # 與 QComboBox.setCurrentText 相同：不在選項中的值忽略
+                    if k != 'authentication' or v in AUTH_OPTIONS:
+                        self._auth_state[k] = v
+
+        if self._built['sec']:
+            for k, item in self._sec_items:
+                item.setCheckState(_check_state(data.get(k, False)))
+        else:
+            self._sec_state = {k: bool(data.get(k, False)) for k in self._sec_state}
+
+        if self._built['cert']:
+            self.cert_form.set_values(data)
+            self.auto_generate.setChecked(bool(data.get('auto_generate', True)))
+            # 支援設置 Common Name（在表單中為 QLabel）
+            if 'common_name' in data:
                 self.common_name_label.setText(str(data.get('common_name') or ''))
-            except: pass
+        else:
+            for k in self._cert_state:
+                if k in data:
+                    self._cert_state[k] = str(data[k])
+            self._auto_generate_state = bool(data.get('auto_generate', True))
+            if 'common_name' in data:
+                self._common_name_state = str(data.get('common_name') or '')
 
     def load_data(self, data: dict):
         # Accept nested or flat structures and populate the dialog
         if not data:
             return
+        self._settings_tab_activated()
         try:
-            # Some callers provide a combined {**flat, **nested} structure where
-            # nested sections like 'authentication' or 'general' are dicts.
-            # FormBuilder.set_values expects flat key->value pairs. Build a
-            # flattened view that prefers explicit top-level scalar keys but
-            # will pull values from nested sections when present.
-            flat = {}
-            try:
-                # copy non-dict top-level entries first
-                for k, v in (data.items() if isinstance(data, dict) else []):
-                    if not isinstance(v, dict):
-                        flat[k] = v
-            except Exception:
-                pass
-
-            # Pull from known nested sections to ensure fields like
-            # authentication/username/password/network_adapter_ip are available
-            for sec in ('general', 'authentication', 'security_policies', 'certificate'):
-                try:
-                    sub = data.get(sec) if isinstance(data.get(sec), dict) else None
+            sections = [data.get(sec) for sec in NESTED_SECTIONS]
+            if not any(isinstance(sub, dict) for sub in sections):
+                # 已是扁平結構（常見情況），直接套用，不需再展開
+                to_apply = {k: v for k, v in data.items() if k != 'network_adapter'}
+            else:
+                # Some callers provide a combined {**flat, **nested} structure where
+                # nested sections like 'authentication' or 'general' are dicts.
+                # FormBuilder.set_values expects flat key->value pairs. Build a
+                # flattened view that prefers explicit top-level scalar keys but
+                # will pull values from nested sections when present.
+                flat = {k: v for k, v in data.items() if not isinstance(v, dict)}
+                for sub in sections:
                     if isinstance(sub, dict):
                         for k, v in sub.items():
+                            # section keys map to form field keys via SCHEMA;
                             # do not overwrite explicit top-level scalar keys
+                            k = _SCHEMA_FIELD_KEYS.get(k, k)
                             if k not in flat:
                                 flat[k] = v
-                except Exception:
-                    pass
 
-            # Fallback: if nothing found, use original data
-            to_apply = flat if flat else data
-
-            # Remove network_adapter from to_apply since _populate_adapters handles it
-            to_apply = {k: v for k, v in to_apply.items() if k != 'network_adapter'}
+                # Remove network_adapter from to_apply since _populate_adapters handles it
+                to_apply = {k: v for k, v in flat.items() if k != 'network_adapter'}
 
             # reuse set_values for most fields
             self.set_values(to_apply)
+            self._flush_endpoint_label()
 
             # ensure network_adapter_ip hidden field is set if provided
-            na_ip = None
-            try:
-                na_ip = to_apply.get('network_adapter_ip') if isinstance(to_apply, dict) else None
-            except Exception:
-                na_ip = None
-            try:
-                if hasattr(self, '_adapter_ip_hidden') and na_ip is not None:
-                    self._adapter_ip_hidden.setText(str(na_ip))
-            except Exception:
-                pass
+            na_ip = to_apply.get('network_adapter_ip')
+            if na_ip is not None:
+                self._adapter_ip_hidden.setText(str(na_ip))
+                if self._endpoint_dirty:
+                    self._loaded_adapter_ip = str(na_ip)
         except Exception:
             pass
 
+    @staticmethod
+    def _read(form, keys):
+        # 欄位固定，直接依 key 讀取控件，不走 FormBuilder.get_values() 的整表走訪
+        fields = form.fields
+        return {
+            k: w.currentText() if isinstance(w, QComboBox) else w.text()
+            for k in keys if (w := fields.get(k)) is not None
+        }
+
     def get_data(self):
         # Return both flat and nested representations for compatibility
-        vals = {}
-        try:
-            vals = self.settings_form.get_values() or {}
-        except Exception:
-            vals = {}
-        try:
-            auth_vals = self.auth_form.get_values() or {}
-            vals.update(auth_vals)
-        except Exception:
-            pass
-        try:
-            cert_vals = self.cert_form.get_values() or {}
-        except Exception:
-            cert_vals = {}
-
-        policies = {k: bool(cb.isChecked()) for k, cb in self.sec_checkboxes.items()}
-
-        adapter_ip = ''
-        try:
-            if hasattr(self, '_adapter_ip_hidden'):
-                adapter_ip = self._adapter_ip_hidden.text() or ''
-        except Exception:
-            adapter_ip = ''
-
-        # canonicalize application name key (support existing mixed-case)
-        app_name = vals.get('application_Name') or vals.get('application_name') or ''
+        self._ensure_settings_ready()
+        vals = self._read(self.settings_form, SETTINGS_FIELDS)
+        # 尚未建立的分頁直接回傳保存的值
+        if self._built['auth']:
+            vals.update(self._read(self.auth_form, AUTH_FIELDS))
+        else:
+            vals.update(self._auth_state)
+        if self._built['cert']:
+            cert_vals = self._read(self.cert_form, CERT_FIELDS)
+            auto_generate = bool(self.auto_generate.isChecked())
+            common_name = self.common_name_label.text()
+        else:
+            cert_vals = dict(self._cert_state)
+            auto_generate = self._auto_generate_state
+            common_name = self._common_name_state
+
+        if self._built['sec']:
+            policies = {k: item.checkState() == Qt.CheckState.Checked for k, item in self._sec_items}
+        else:
+            policies = dict(self._sec_state)
 
         # Get product_uri from the label (computed from adapter IP + port)
-        product_uri = ''
-        try:
-            if hasattr(self, 'product_uri_label'):
-                product_uri = self.product_uri_label.text() or ''
-        except Exception:
-            product_uri = ''
-
-        nested = {
-            'general': {
-                'application_name': app_name,
-                'namespace': vals.get('namespace', ''),
-                'port': vals.get('port', ''),
-                'product_uri': product_uri,
-                'network_adapter': vals.get('network_adapter', ''),
-                'network_adapter_ip': vals.get('network_adapter_ip', '') or adapter_ip,
-                'max_sessions': vals.get('max_sessions', ''),
-                'publish_interval': vals.get('publish_interval', ''),
-            },
-            'authentication': {
-                'authentication': vals.get('authentication', 'Anonymous'),
-                'username': vals.get('username', ''),
-                'password': vals.get('password', ''),
-            },
-            'security_policies': policies,
-            'certificate': {**cert_vals, 'auto_generate': bool(self.auto_generate.isChecked()), 'common_name': (self.common_name_label.text() if hasattr(self, 'common_name_label') else '')},
-        }
-
-        # flatten for legacy callers
-        flat = {}
-        flat.update(nested['general'])
-        flat.update(nested['authentication'])
-        flat.update(nested['security_policies'])
-        flat.update(nested['certificate'])
-
-        out = {**flat, **nested}
+        vals['product_uri'] = self.product_uri_label.text()
+
+        nested = {sec: {out: vals[field] for out, field in spec} for sec, spec in SCHEMA}
+        nested['security_policies'] = policies
+        nested['certificate'] = {**cert_vals, 'auto_generate': auto_generate, 'common_name': common_name}
+
+        # flatten for legacy callers, then add the section keys (the nested
+        # 'authentication' dict replaces the flat value of the same name)
+        out = dict(nested['general'])
+        out.update(nested['authentication'])
+        out.update(nested['security_policies'])
+        out.update(nested['certificate'])
+        out.update(nested)
         return out
@@ -1,3 +1,8 @@
+import functools
+import re
+import weakref
+from contextlib import contextmanager
+
 from PyQt6.QtWidgets import (
     QDialog,
     QVBoxLayout,
@@ -10,10 +15,12 @@ from PyQt6.QtWidgets import (
     QWidget,
     QFrame,
 )
+from PyQt6.QtCore import QSignalBlocker, QTimer
 from PyQt6.QtGui import QIntValidator
-from ui.components import get_form_field_style
+from ui.components import use_form_field_style
 # UI constants
 DEFAULT_SPACING = 6  # 統一的垂直間距
+MODBUS_LOGIC_DEBOUNCE_MS = 50  # 連續切換 Data Type / Access 時合併位址重算
 from core.config import (
     MODBUS_ADDRESS_OFFSET,
     MODBUS_SEQUENCE_WIDTH,
@@ -23,6 +30,120 @@ from core.config import (
     MODBUS_DISCRETE_PREFIX,
 )
 
+# 位址中的陣列長度標記，例如 "400001 [10]"
+_ARRAY_IDX_RE = re.compile(r"\[(\d+)\]")
+_ARRAY_IDX_SUB_RE = re.compile(r"\[\d+\]")
+_NONDIGIT_RE = re.compile(r"\D+")
+# 位址格式：前綴 + 補零的序號，例如 "4" + "00001"
+_ADDR_FMT = "{}{:0" + str(MODBUS_SEQUENCE_WIDTH) + "d}"
+
+# 跨對話框共用的 calculate_next_address 結果快取（每個 controller 一份），
+# 標籤樹有任何新增/刪除/修改時整份清除
+_NEXT_ADDR_CACHES = weakref.WeakKeyDictionary()
+_NEXT_ADDR_CACHE_SIZE = 256
+
+
+def _next_address(owner, target, prefix, new_type):
+    """經由快取呼叫 owner.controller.calculate_next_address"""
+    controller = owner.controller
+    tree = getattr(owner, "tree", None)
+    if tree is None:
+        # 無法得知樹狀結構何時變動，不快取
+        return controller.calculate_next_address(
+            target, prefix=prefix, new_type=new_type
+        )
+    cache = _NEXT_ADDR_CACHES.get(controller)
+    if cache is None:
+        cache = _NEXT_ADDR_CACHES[controller] = {}
+        model = tree.model()
+        for signal in (
+            model.rowsInserted,
+            model.rowsRemoved,
+            model.rowsMoved,
+            model.dataChanged,
+            model.modelReset,
+            model.layoutChanged,
+        ):
+            signal.connect(lambda *_, c=cache: c.clear())
+    # QTreeWidgetItem 不可雜湊，以 id 作為 key；項目刪除時快取已被清除
+    key = (id(target), prefix, new_type)
+    try:
+        return cache[key]
+    except KeyError:
+        pass
+    result = controller.calculate_next_address(
+        target, prefix=prefix, new_type=new_type
+    )
+    if len(cache) >= _NEXT_ADDR_CACHE_SIZE:
+        # 依插入順序淘汰最舊的一筆
+        del cache[next(iter(cache))]
+    cache[key] = result
+    return result
+
+
+# Scaling 分頁的下拉選項、參數欄位 (key, 標籤, 下拉選項或 None=文字欄位) 與預設值
+_SCALE_TYPES = ("None", "Linear", "Square Root")
+_SCALED_TYPES = ("Char", "Byte", "Short", "Word", "Long", "DWord", "Float", "Double")
+_YES_NO = ("No", "Yes")
+_SCALING_PARAMS = (
+    ("raw_low", "Raw Low:", None),
+    ("raw_high", "Raw High:", None),
+    ("scaled_type", "Scaled Data Type:", _SCALED_TYPES),
+    ("scaled_low", "Scaled Low:", None),
+    ("scaled_high", "Scaled High:", None),
+    ("clamp_low", "Clamp Low:", _YES_NO),
+    ("clamp_high", "Clamp High:", _YES_NO),
+    ("negate", "Negate Value:", _YES_NO),
+    ("units", "Units:", None),
+)
+_SCALING_OPTIONS = {"type": _SCALE_TYPES}
+_SCALING_OPTIONS.update((key, options) for key, _, options in _SCALING_PARAMS)
+_SCALING_DEFAULTS = {
+    "type": "None",
+    "raw_low": "0",
+    "raw_high": "1000",
+    "scaled_type": "Float",
+    "scaled_low": "0.0",
+    "scaled_high": "100.0",
+    "clamp_low": "No",
+    "clamp_high": "No",
+    "negate": "No",
+    "units": "",
+}
+
+
+def _scaling_text(value):
+    """文字欄位的 Scaling 值轉為字串（匯入的專案可能存成數字或 None）"""
+    return "" if value is None else str(value)
+
+
+@functools.lru_cache(maxsize=1)
+def _scan_rate_validator():
+    """所有 TagDialog 共用的 Scan Rate 驗證器（需在 QApplication 建立後呼叫）"""
+    return QIntValidator(1, 600000)
+
+
+# Register 類型清單
+_REGISTER_TYPES = (
+    "Word",
+    "Short",
+    "Long",
+    "DWord",
+    "Float",
+    "Double",
+    "BCD",
+    "LBCD",
+    "LLong",
+    "QWord",
+    "Char",
+    "Byte",
+    "String",
+)
+# Data Type 下拉選單內容：Boolean 與所有 Register 類型，各自附 Array 版本
+_ALL_DATA_TYPES = ["Boolean", "Boolean(Array)"] + [
+    x for t in _REGISTER_TYPES for x in (t, f"{t}(Array)")
+]
+
 
 class TagDialog(QDialog):
     def __init__(
@@ -36,30 +157,18 @@ class TagDialog(QDialog):
         super().__init__(parent)
         self.setWindowTitle("Tag Properties")
         self.setMinimumSize(480, 580)
-        self.setStyleSheet(get_form_field_style())
+        use_form_field_style(self)
 
         # 儲存目標 item（用於計算下一個地址）
         self.target_item = target_item
 
         # 是否為新增標籤（不只是根據 suggested_addr 是否為 None）
         self._is_new = is_new
+        # _calculate_tag_address 的結果快取，輸入相同時不再詢問 controller
+        self._addr_cache = {}
 
         # 暫存 Register 類型清單，用於 UI 邏輯判斷
-        self.register_types = [
-            "Word",
-            "Short",
-            "Long",
-            "DWord",
-            "Float",
-            "Double",
-            "BCD",
-            "LBCD",
-            "LLong",
-            "QWord",
-            "Char",
-            "Byte",
-            "String",
-        ]
+        self.register_types = _REGISTER_TYPES
 
         main_layout = QVBoxLayout(self)
         main_layout.setSpacing(DEFAULT_SPACING)  # 設置統一的垂直間距
@@ -78,14 +187,7 @@ class TagDialog(QDialog):
 
         # 1-1. Data Type 下拉選單
         self.type_combo = QComboBox()
-        all_types = []
-        # 加入 Boolean
-        all_types.extend(["Boolean", "Boolean(Array)"])
-        # 加入所有 Register 類型及其 Array 版本
-        for t in self.register_types:
-            all_types.append(t)
-            all_types.append(f"{t}(Array)")
-        self.type_combo.addItems(all_types)
+        self.type_combo.addItems(_ALL_DATA_TYPES)
         self.type_combo.setCurrentText("Word")
 
         # 1-2. Client Access 下拉選單
@@ -100,7 +202,7 @@ class TagDialog(QDialog):
 
         # 1-4. Scan Rate (default centralized here)
         self.scan_rate = QLineEdit("10")
-        self.scan_rate.setValidator(QIntValidator(1, 600000))
+        self.scan_rate.setValidator(_scan_rate_validator())
 
         gen_lay.addRow("Tag Name:", self.name_edit)
         gen_lay.addRow("Description:", self.desc_edit)
@@ -109,55 +211,12 @@ class TagDialog(QDialog):
         gen_lay.addRow("Address:", self.addr_edit)
         gen_lay.addRow("Scan Rate (ms):", self.scan_rate)
 
-        # 2. Scaling 分頁
+        # 2. Scaling 分頁：先放空白頁，第一次切換到該分頁時才建立內容；
+        # 建立前的值保存在 _scaling_state / _scaling_enabled
         self.tab_scaling = QWidget()
-        scaling_layout_container = QVBoxLayout(self.tab_scaling)
-        scaling_layout_container.setSpacing(DEFAULT_SPACING)  # 設置統一的垂直間距
-
-        type_form = QFormLayout()
-        type_form.setVerticalSpacing(DEFAULT_SPACING)  # 設置統一的垂直間距
-        self.scale_type = QComboBox()
-        self.scale_type.addItems(["None", "Linear", "Square Root"])
-        type_form.addRow("Scaling Type:", self.scale_type)
-        scaling_layout_container.addLayout(type_form)
-
-        # Scaling 參數容器 (可隱藏)
-        self.scaling_params_frame = QFrame()
-        self.params_layout = QFormLayout(self.scaling_params_frame)
-        self.params_layout.setVerticalSpacing(DEFAULT_SPACING)  # 設置統一的垂直間距
-
-        self.raw_low = QLineEdit("0")
-        self.raw_high = QLineEdit("1000")
-        self.scaled_low = QLineEdit("0.0")
-        self.scaled_high = QLineEdit("100.0")
-        self.scaled_type = QComboBox()
-        self.scaled_type.addItems(
-            ["Char", "Byte", "Short", "Word", "Long", "DWord", "Float", "Double"]
-        )
-        self.scaled_type.setCurrentText("Float")
-        self.clamp_low = QComboBox()
-        self.clamp_low.addItems(["No", "Yes"])
-        self.clamp_low.setCurrentText("No")
-        self.clamp_high = QComboBox()
-        self.clamp_high.addItems(["No", "Yes"])
-        self.clamp_high.setCurrentText("No")
-        self.negate = QComboBox()
-        self.negate.addItems(["No", "Yes"])
-        self.negate.setCurrentText("No")
-        self.units = QLineEdit("")
-
-        self.params_layout.addRow("Raw Low:", self.raw_low)
-        self.params_layout.addRow("Raw High:", self.raw_high)
-        self.params_layout.addRow("Scaled Data Type:", self.scaled_type)
-        self.params_layout.addRow("Scaled Low:", self.scaled_low)
-        self.params_layout.addRow("Scaled High:", self.scaled_high)
-        self.params_layout.addRow("Clamp Low:", self.clamp_low)
-        self.params_layout.addRow("Clamp High:", self.clamp_high)
-        self.params_layout.addRow("Negate Value:", self.negate)
-        self.params_layout.addRow("Units:", self.units)
-
-        scaling_layout_container.addWidget(self.scaling_params_frame)
-        scaling_layout_container.addStretch()
+        self._scaling_built = False
+        self._scaling_state = dict(_SCALING_DEFAULTS)
+        self._scaling_enabled = True
 
         # 加入 Tabs
         self.tabs.addTab(self.tab_general, "General")
@@ -178,20 +237,75 @@ class TagDialog(QDialog):
         self.btn_cancel.clicked.connect(self.reject)
 
         # 關鍵 UI 邏輯：Data Type 或 Access 改變時自動修正位址與 Scaling 權限
-        self.type_combo.currentTextChanged.connect(self._update_modbus_logic)
-        self.access_combo.currentTextChanged.connect(self._update_modbus_logic)
+        # （single-shot timer 合併短時間內的多次變更，只重算一次）
+        self._modbus_timer = QTimer(self)
+        self._modbus_timer.setSingleShot(True)
+        self._modbus_timer.setInterval(MODBUS_LOGIC_DEBOUNCE_MS)
+        self._modbus_timer.timeout.connect(self._update_modbus_logic)
+        self.type_combo.currentTextChanged.connect(self._modbus_timer.start)
+        self.access_combo.currentTextChanged.connect(self._modbus_timer.start)
 
-        # Scaling 顯示/隱藏切換
-        self.scale_type.currentTextChanged.connect(self._toggle_scaling_visibility)
+        self.tabs.currentChanged.connect(self._on_tab_changed)
 
         # 初始化執行一次
         self._update_modbus_logic()
+
+    def _on_tab_changed(self, idx):
+        if self.tabs.widget(idx) is self.tab_scaling:
+            self._ensure_scaling_built()
+
+    def _ensure_scaling_built(self):
+        if self._scaling_built:
+            return
+        self._scaling_built = True
+        state = self._scaling_state
+
+        scaling_layout_container = QVBoxLayout(self.tab_scaling)
+        scaling_layout_container.setSpacing(DEFAULT_SPACING)  # 設置統一的垂直間距
+
+        type_form = QFormLayout()
+        type_form.setVerticalSpacing(DEFAULT_SPACING)  # 設置統一的垂直間距
+        self.scale_type = QComboBox()
+        self.scale_type.addItems(_SCALE_TYPES)
+        self.scale_type.setCurrentText(state["type"])
+        self.scale_type.setEnabled(self._scaling_enabled)
+        type_form.addRow("Scaling Type:", self.scale_type)
+        scaling_layout_container.addLayout(type_form)
+
+        # Scaling 參數容器 (可隱藏)
+        self.scaling_params_frame = QFrame()
+        self.params_layout = QFormLayout(self.scaling_params_frame)
+        self.params_layout.setVerticalSpacing(DEFAULT_SPACING)  # 設置統一的垂直間距
+
+        for key, label, options in _SCALING_PARAMS:
+            if options is None:
+                widget = QLineEdit(state[key])
+            else:
+                widget = QComboBox()
+                widget.addItems(options)
+                widget.setCurrentText(state[key])
+            setattr(self, key, widget)
+            self.params_layout.addRow(label, widget)
+
+        scaling_layout_container.addWidget(self.scaling_params_frame)
+        scaling_layout_container.addStretch()
+
+        # Scaling 顯示/隱藏切換
+        self.scale_type.currentTextChanged.connect(self._toggle_scaling_visibility)
         # 根據目前 scaling 值設定初始可見性
         self._toggle_scaling_visibility(self.scale_type.currentText())
 
-    def _update_modbus_logic(self):
-        import re
+    def _set_scaling_enabled(self, enabled, reset=False):
+        # Boolean 型態不支援 Scaling；reset 時同時把 Scaling Type 改回 None
+        self._scaling_enabled = enabled
+        if self._scaling_built:
+            self.scale_type.setEnabled(enabled)
+            if reset and not enabled and self.scale_type.currentText() != "None":
+                self.scale_type.setCurrentText("None")
+        elif reset and not enabled:
+            self._scaling_state["type"] = "None"
 
+    def _update_modbus_logic(self):
         data_type = self.type_combo.currentText()
         access = self.access_combo.currentText()
         addr_text = self.addr_edit.text()
@@ -199,15 +313,15 @@ class TagDialog(QDialog):
         is_array = "Array" in data_type
         array_size = 1
         try:
-            match = re.search(r"\[(\d+)\]", addr_text)
+            match = _ARRAY_IDX_RE.search(addr_text)
             if match:
                 array_size = int(match.group(1))
         except Exception:
             pass
 
         try:
-            addr_without_array = re.sub(r"\[\d+\]", "", addr_text)
-            nums = "".join(filter(str.isdigit, addr_without_array))
+            addr_without_array = _ARRAY_IDX_SUB_RE.sub("", addr_text)
+            nums = _NONDIGIT_RE.sub("", addr_without_array)
             offset = int(nums) % MODBUS_ADDRESS_OFFSET if nums else 0
         except ValueError:
             offset = 0
@@ -224,33 +338,53 @@ class TagDialog(QDialog):
             )
 
         base_addr = self._calculate_tag_address(prefix, offset, is_array, array_size)
-        self.addr_edit.setText(base_addr)
-        self.scale_type.setEnabled("Boolean" not in data_type)
-        if "Boolean" in data_type:
-            self.scale_type.setCurrentText("None")
+        # 位址未變時不重設（避免游標重置與重繪）；設定時不發出 textChanged，避免連鎖觸發
+        if base_addr != addr_text:
+            with QSignalBlocker(self.addr_edit):
+                self.addr_edit.setText(base_addr)
+        self._set_scaling_enabled("Boolean" not in data_type, reset=True)
+
+    def _flush_modbus_logic(self):
+        # 立即套用尚未觸發的位址重算（讀取欄位前呼叫）
+        if self._modbus_timer.isActive():
+            self._modbus_timer.stop()
+            self._update_modbus_logic()
 
     def _calculate_tag_address(self, prefix, offset, is_array, array_size):
+        key = (
+            prefix,
+            offset,
+            is_array,
+            array_size,
+            id(self.target_item),
+            self.type_combo.currentText(),
+        )
+        cached = self._addr_cache.get(key)
+        if cached is not None:
+            return cached
+
         if self._is_new and self.parent() and hasattr(self.parent(), "controller"):
             target = getattr(self, "target_item", None)
             if target:
                 try:
-                    nxt = self.parent().controller.calculate_next_address(
-                        target, prefix=prefix, new_type=self.type_combo.currentText()
+                    nxt = _next_address(
+                        self.parent(), target, prefix, self.type_combo.currentText()
                     )
                     base_addr = (
                         nxt
                         if isinstance(nxt, str)
-                        else f"{prefix}{int(nxt):0{MODBUS_SEQUENCE_WIDTH}d}"
+                        else _ADDR_FMT.format(prefix, int(nxt))
                     )
                 except Exception:
-                    base_addr = f"{prefix}{offset:0{MODBUS_SEQUENCE_WIDTH}d}"
+                    base_addr = _ADDR_FMT.format(prefix, offset)
             else:
-                base_addr = f"{prefix}{offset:0{MODBUS_SEQUENCE_WIDTH}d}"
+                base_addr = _ADDR_FMT.format(prefix, offset)
         else:
-            base_addr = f"{prefix}{offset:0{MODBUS_SEQUENCE_WIDTH}d}"
+            base_addr = _ADDR_FMT.format(prefix, offset)
 
         if is_array:
             base_addr = f"{base_addr} [{array_size}]"
+        self._addr_cache[key] = base_addr
         return base_addr
 
     def _toggle_scaling_visibility(self, text):
@@ -259,16 +393,18 @@ class TagDialog(QDialog):
 
     def get_data(self):
         # 回傳雙層結構字典給 IoTApp 使用
-        nested = {
-            "general": {
-                "name": self.name_edit.text(),
-                "description": self.desc_edit.text(),
-                "address": self.addr_edit.text(),
-                "data_type": self.type_combo.currentText(),
-                "access": self.access_combo.currentText(),
-                "scan_rate": self.scan_rate.text(),
-            },
-            "scaling": {
+        self._flush_modbus_logic()
+        # 每個控件只讀取一次，扁平與巢狀欄位共用同一份 general 內容
+        general = {
+            "name": self.name_edit.text(),
+            "description": self.desc_edit.text(),
+            "address": self.addr_edit.text(),
+            "data_type": self.type_combo.currentText(),
+            "access": self.access_combo.currentText(),
+            "scan_rate": self.scan_rate.text(),
+        }
+        if self._scaling_built:
+            scaling = {
                 "type": self.scale_type.currentText(),
                 "raw_low": self.raw_low.text(),
                 "raw_high": self.raw_high.text(),
@@ -279,97 +415,114 @@ class TagDialog(QDialog):
                 "clamp_high": self.clamp_high.currentText(),
                 "negate": self.negate.currentText(),
                 "units": self.units.text(),
-            },
-        }
-        flat = {
-            "name": self.name_edit.text(),
-            "description": self.desc_edit.text(),
-            "address": self.addr_edit.text(),
-            "data_type": self.type_combo.currentText(),
-            "access": self.access_combo.currentText(),
-            "scan_rate": self.scan_rate.text(),
-            "scaling": nested["scaling"],
-        }
-        out = {**flat, **nested}
-        return out
+            }
+        else:
+            # 尚未建立的分頁直接回傳保存的值
+            scaling = dict(self._scaling_state)
+        return {**general, "scaling": scaling, "general": dict(general)}
+
+    @contextmanager
+    def _bulk_update(self):
+        widgets = [
+            self.name_edit,
+            self.desc_edit,
+            self.type_combo,
+            self.access_combo,
+            self.addr_edit,
+            self.scan_rate,
+        ]
+        if self._scaling_built:
+            widgets.append(self.scale_type)
+            widgets += [getattr(self, key) for key, _, _ in _SCALING_PARAMS]
+        blockers = [QSignalBlocker(w) for w in widgets]
+        self.setUpdatesEnabled(False)
+        try:
+            yield
+        finally:
+            for b in blockers:
+                b.unblock()
+            self.setUpdatesEnabled(True)
+            self.update()
 
     def load_data(self, data):
         # 載入現有 Tag 資料進入 Dialog
         if not data:
             return
 
-        # 暫時封鎖訊號，避免載入資料時觸發 _update_modbus_logic 導致位址被覆蓋
-        self.type_combo.blockSignals(True)
-        self.access_combo.blockSignals(True)
-
-        gen = data.get("general", {})
-        # load general values, falling back to dialog defaults or controller suggestions
-        self.name_edit.setText(gen.get("name", self.name_edit.text()))
-        self.desc_edit.setText(gen.get("description", self.desc_edit.text()))
-        # Address: prefer provided, otherwise use suggested_addr set in constructor or controller-suggested
-        addr = gen.get("address")
-        if not addr:
-            # try controller suggestion if available; pass prefix computed from current type/access
-            if (
-                self.parent()
-                and hasattr(self.parent(), "controller")
-                and hasattr(self.parent(), "tree")
-            ):
-                current = self.parent().tree.currentItem()
-                if current:
-                    try:
-                        # determine prefix consistent with _update_modbus_logic
-                        data_type = self.type_combo.currentText()
-                        access = self.access_combo.currentText()
-                        if "Boolean" in data_type:
-                            prefix = "0" if access == "Read/Write" else "1"
+        # 載入的位址優先，捨棄尚未觸發的位址重算
+        self._modbus_timer.stop()
+        self._addr_cache.clear()
+        # 暫停所有欄位的訊號與重繪，避免載入資料時觸發 _update_modbus_logic
+        # 導致位址被覆蓋，並把逐欄位的重繪合併為結束時一次
+        with self._bulk_update():
+            gen = data.get("general", {})
+            # load general values, falling back to dialog defaults or controller suggestions
+            self.name_edit.setText(gen.get("name", self.name_edit.text()))
+            self.desc_edit.setText(gen.get("description", self.desc_edit.text()))
+            # Address: prefer provided, otherwise use suggested_addr set in constructor or controller-suggested
+            addr = gen.get("address")
+            if not addr:
+                # try controller suggestion if available; pass prefix computed from current type/access
+                if (
+                    self.parent()
+                    and hasattr(self.parent(), "controller")
+                    and hasattr(self.parent(), "tree")
+                ):
+                    current = self.parent().tree.currentItem()
+                    if current:
+                        try:
+                            # determine prefix consistent with _update_modbus_logic
+                            data_type = self.type_combo.currentText()
+                            access = self.access_combo.currentText()
+                            if "Boolean" in data_type:
+                                prefix = "0" if access == "Read/Write" else "1"
+                            else:
+                                prefix = "4" if access == "Read/Write" else "3"
+                            # pass current selected data type as fallback for step calculation
+                            addr = _next_address(
+                                self.parent(),
+                                current,
+                                prefix,
+                                self.type_combo.currentText(),
+                            )
+                        except Exception:
+                            addr = self.addr_edit.text()
+                else:
+                    addr = self.addr_edit.text()
+
+            self.addr_edit.setText(addr)
+            self.type_combo.setCurrentText(
+                gen.get("data_type", self.type_combo.currentText())
+            )
+            self.access_combo.setCurrentText(
+                gen.get("access", self.access_combo.currentText())
+            )
+            self.scan_rate.setText(gen.get("scan_rate", self.scan_rate.text()))
+
+            sc = data.get("scaling", {})
+            if self._scaling_built:
+                stype = sc.get("type", self.scale_type.currentText())
+                self.scale_type.setCurrentText(stype)
+                for key, _, options in _SCALING_PARAMS:
+                    if key in sc:
+                        widget = getattr(self, key)
+                        if options is None:
+                            widget.setText(_scaling_text(sc[key]))
                         else:
-                            prefix = "4" if access == "Read/Write" else "3"
-                        # pass current selected data type as fallback for step calculation
-                        addr = self.parent().controller.calculate_next_address(
-                            current,
-                            prefix=prefix,
-                            new_type=self.type_combo.currentText(),
-                        )
-                    except Exception:
-                        addr = self.addr_edit.text()
+                            widget.setCurrentText(sc[key])
             else:
-                addr = self.addr_edit.text()
-
-        self.addr_edit.setText(addr)
-        self.type_combo.setCurrentText(
-            gen.get("data_type", self.type_combo.currentText())
-        )
-        self.access_combo.setCurrentText(
-            gen.get("access", self.access_combo.currentText())
-        )
-        self.scan_rate.setText(gen.get("scan_rate", self.scan_rate.text()))
-
-        sc = data.get("scaling", {})
-        stype = sc.get("type", self.scale_type.currentText())
-        self.scale_type.setCurrentText(stype)
-        self.raw_low.setText(sc.get("raw_low", self.raw_low.text()))
-        self.raw_high.setText(sc.get("raw_high", self.raw_high.text()))
-        self.scaled_type.setCurrentText(
-            sc.get("scaled_type", self.scaled_type.currentText())
-        )
-        self.scaled_low.setText(sc.get("scaled_low", self.scaled_low.text()))
-        self.scaled_high.setText(sc.get("scaled_high", self.scaled_high.text()))
-        self.clamp_low.setCurrentText(sc.get("clamp_low", self.clamp_low.currentText()))
-        self.clamp_high.setCurrentText(
-            sc.get("clamp_high", self.clamp_high.currentText())
-        )
-        self.negate.setCurrentText(sc.get("negate", self.negate.currentText()))
-        self.units.setText(sc.get("units", self.units.text()))
-
-        # 恢復訊號
-        self.type_combo.blockSignals(False)
-        self.access_combo.blockSignals(False)
+                # 尚未建立 Scaling 分頁：只更新保存的值（下拉選單僅接受既有選項）
+                state = self._scaling_state
+                for key, value in sc.items():
+                    if key in state:
+                        options = _SCALING_OPTIONS[key]
+                        if options is None:
+                            state[key] = _scaling_text(value)
+                        elif value in options:
+                            state[key] = value
 
         # 載入完畢後手動整理一次 UI 狀態
-        self._toggle_scaling_visibility(stype)
+        if self._scaling_built:
+            self._toggle_scaling_visibility(stype)
         # 根據載入的型態檢查 Scaling 是否該禁用
-        if "Boolean" in self.type_combo.currentText():
-            self.scale_type.setEnabled(False)
-        else:
-            self.scale_type.setEnabled(True)
+        self._set_scaling_enabled("Boolean" not in self.type_combo.currentText())
@@ -16,11 +16,59 @@ from PyQt6.QtWidgets import (
 )
 from PyQt6.QtCore import Qt, pyqtSignal
 from typing import Any, Optional, Dict
-from ui.components import get_form_field_style
+from ui.components import use_form_field_style
 
 # UI constants
 DEFAULT_SPACING = 6  # 統一的垂直間距
 
+# 布爾值可接受的輸入（不分大小寫）
+_BOOL_TRUE = frozenset({'1', 'true', 'yes', 'on'})
+_BOOL_FALSE = frozenset({'0', 'false', 'no', 'off'})
+
+
+def _to_int(value: Any, default: int) -> int:
+    """轉換為 int，None 或無法轉換時返回預設值"""
+    if type(value) is int:
+        # 常見情況：標籤資訊本身已是 int，不需解析
+        return value
+    if value is None:
+        return default
+    try:
+        return int(value)
+    except (ValueError, TypeError):
+        return default
+
+
+def _parse_bool(value_str: str) -> bool:
+    """解析布爾值字符串"""
+    lowered = value_str.lower()
+    if lowered in _BOOL_TRUE:
+        return True
+    elif lowered in _BOOL_FALSE:
+        return False
+    else:
+        raise ValueError(f"布爾值必須是 0/1 或 True/False")
+
+
+def _data_type_category(data_type: str) -> str:
+    """
+    將小寫的數據類型名稱歸類為單字元代碼
+    
+    Returns:
+        'b' 布爾值、'f' 浮點值、'i' 整數值、's' 字符串值
+    """
+    if 'bool' in data_type:
+        return 'b'
+    if 'float' in data_type or 'double' in data_type:
+        return 'f'
+    if 'int' in data_type:
+        return 'i'
+    return 's'
+
+
+# 類別代碼 -> 解析函數
+_PARSERS = {'b': _parse_bool, 'f': float, 'i': int, 's': str}
+
 
 class WriteValueDialog(QDialog):
     """
@@ -55,6 +103,19 @@ class WriteValueDialog(QDialog):
         self.current_value = current_value
         self.new_value = None
         
+        # 標籤資訊建構後不會改變，一次取出並轉換好供顯示與寫入使用
+        info = self.tag_info
+        self._name = str(info.get('name', 'Unknown'))
+        self._address_text = str(info.get('address', 'N/A'))
+        self._fc_text = str(info.get('function_code', 'N/A'))
+        self._data_type = str(info.get('data_type', 'Unknown'))
+        self._read_write = str(info.get('read_write', 'Unknown'))
+        self._is_read_only = 'Read Only' in self._read_write
+        self._address_int = _to_int(info.get('address'), 0)
+        self._fc_int = _to_int(info.get('function_code'), 16)
+        self._cat = _data_type_category(str(info.get('data_type', 'int')).lower())
+        self._parser = _PARSERS[self._cat]
+        
         self._setup_ui()
         self._populate_info()
     
@@ -63,11 +124,17 @@ class WriteValueDialog(QDialog):
         self.setWindowTitle("寫入值")
         self.setModal(True)
         self.setMinimumWidth(400)
-        self.setStyleSheet(get_form_field_style())  # 應用統一的控件樣式
+        use_form_field_style(self)  # 應用統一的控件樣式
         
         layout = QVBoxLayout()
         layout.setSpacing(DEFAULT_SPACING)  # 設置統一的垂直間距
         
+        # 只讀提示橫幅（預設隱藏，於 showEvent 決定是否顯示）
+        self.read_only_banner = QLabel("此標籤為只讀，無法寫入！")
+        self.read_only_banner.setStyleSheet("color: #d32f2f; font-weight: bold;")
+        self.read_only_banner.setVisible(False)
+        layout.addWidget(self.read_only_banner)
+        
         # 標籤名稱和地址
         name_layout = QHBoxLayout()
         name_layout.addWidget(QLabel("標籤名稱:"))
@@ -137,29 +204,22 @@ class WriteValueDialog(QDialog):
     
     def _populate_info(self):
         """填充標籤資訊"""
-        name = self.tag_info.get('name', 'Unknown')
-        address = self.tag_info.get('address', 'N/A')
-        fc = self.tag_info.get('function_code', 'N/A')
-        data_type = self.tag_info.get('data_type', 'Unknown')
-        read_write = self.tag_info.get('read_write', 'Unknown')
-        
-        self.name_label.setText(str(name))
-        self.addr_label.setText(str(address))
-        self.fc_label.setText(str(fc))
+        self.name_label.setText(self._name)
+        self.addr_label.setText(self._address_text)
+        self.fc_label.setText(self._fc_text)
         self.curr_value_label.setText(str(self.current_value if self.current_value is not None else 'N/A'))
-        self.type_label.setText(str(data_type))
-        self.perm_label.setText(str(read_write))
+        self.type_label.setText(self._data_type)
+        self.perm_label.setText(self._read_write)
         
-        # 驗證權限
-        if 'Read Only' in str(read_write):
-            QMessageBox.warning(
-                self,
-                "警告",
-                "此標籤為只讀，無法寫入！",
-                QMessageBox.StandardButton.Ok
-            )
+        # 驗證權限（提示改由 showEvent 以橫幅顯示，不在建構時彈出模態視窗）
+        if self._is_read_only:
             self.new_value_input.setEnabled(False)
     
+    def showEvent(self, event):
+        """顯示時依權限切換只讀提示橫幅"""
+        super().showEvent(event)
+        self.read_only_banner.setVisible(self._is_read_only)
+    
     def _on_ok(self):
         """處理確定按鈕"""
         value_str = self.new_value_input.text().strip()
@@ -181,22 +241,8 @@ class WriteValueDialog(QDialog):
             if not self._validate_value(self.new_value):
                 return
             
-            # 發出信號
-            address = self.tag_info.get('address')
-            fc = self.tag_info.get('function_code')
-            
-            # 轉換 address 為 int
-            try:
-                address = int(address) if address is not None else 0
-            except (ValueError, TypeError):
-                address = 0
-            
-            try:
-                fc = int(fc) if fc is not None else 16
-            except (ValueError, TypeError):
-                fc = 16
-            
-            self.write_requested.emit(address, fc, self.new_value)
+            # 發出信號（address / fc 已於建構時轉換為 int）
+            self.write_requested.emit(self._address_int, self._fc_int, self.new_value)
             
             # 不立即關閉，讓信號槽完成後才自動關閉
             # self.accept() 會由信號槽完成後調用
@@ -223,28 +269,7 @@ class WriteValueDialog(QDialog):
         Raises:
             ValueError: 如果無法解析
         """
-        data_type = self.tag_info.get('data_type', 'int').lower()
-        
-        # 布爾值
-        if 'bool' in data_type:
-            if value_str.lower() in ('1', 'true', 'yes', 'on'):
-                return True
-            elif value_str.lower() in ('0', 'false', 'no', 'off'):
-                return False
-            else:
-                raise ValueError(f"布爾值必須是 0/1 或 True/False")
-        
-        # 浮點值
-        elif 'float' in data_type or 'double' in data_type:
-            return float(value_str)
-        
-        # 整數值
-        elif 'int' in data_type:
-            return int(value_str)
-        
-        # 字符串值
-        else:
-            return value_str
+        return self._parser(value_str)
     
     def _validate_value(self, value: Any) -> bool:
         """
@@ -1,19 +1,128 @@
-from PyQt6.QtWidgets import QTreeWidget, QTreeWidgetItem, QMenu, QApplication
-from PyQt6.QtCore import Qt, pyqtSignal, QBuffer, QByteArray, QIODevice
-from PyQt6.QtGui import QPixmap, QPainter, QPen, QColor, QIcon, QPalette
-import base64
+from PyQt6.QtWidgets import (
+    QTreeWidget,
+    QTreeWidgetItem,
+    QTreeWidgetItemIterator,
+    QMenu,
+    QApplication,
+    QStyle,
+)
+from PyQt6.QtCore import Qt, pyqtSignal, QSignalBlocker, QSize, QTimer
+from PyQt6.QtGui import (
+    QPixmap,
+    QPixmapCache,
+    QPainter,
+    QPen,
+    QColor,
+    QIcon,
+    QPalette,
+)
+import functools
+from urllib.parse import quote
+
+# 分支 +/- 符號只是幾條線段，直接以 SVG 內嵌於樣式表，免去 PNG 編碼與 base64
+_SYMBOL_SVG = (
+    "<svg xmlns='http://www.w3.org/2000/svg' width='28' height='28' "
+    "viewBox='0 0 28 28' stroke='#c8c8c8' stroke-width='3'>{}</svg>"
+)
+_MINUS_SVG = _SYMBOL_SVG.format("<line x1='7' y1='14' x2='21' y2='14'/>")
+_PLUS_SVG = _SYMBOL_SVG.format(
+    "<line x1='7' y1='14' x2='21' y2='14'/><line x1='14' y1='7' x2='14' y2='21'/>"
+)
+_PLUS_URL = "data:image/svg+xml;utf8," + quote(_PLUS_SVG)
+_MINUS_URL = "data:image/svg+xml;utf8," + quote(_MINUS_SVG)
+
+_BRANCH_ICON_SIZE = 28
+_PLUS_PIXMAP_KEY = "connectree_plus_28"
+_MINUS_PIXMAP_KEY = "connectree_minus_28"
+
+
+_LIGHT_THEME_CACHE = None
+_THEME_SIGNAL_CONNECTED = False
+
+
+def _invalidate_theme_cache(*_args):
+    global _LIGHT_THEME_CACHE
+    _LIGHT_THEME_CACHE = None
 
 
 def _is_light_theme():
-    """檢測系統是否為淺色主題"""
+    """檢測系統是否為淺色主題（結果快取，palette 變更時失效）"""
+    global _LIGHT_THEME_CACHE, _THEME_SIGNAL_CONNECTED
+    if _LIGHT_THEME_CACHE is not None:
+        return _LIGHT_THEME_CACHE
     app = QApplication.instance()
     if app:
         palette = app.palette()
         window_color = palette.color(QPalette.ColorRole.Window)
-        return window_color.lightness() > 128  # 亮度大於128視為淺色
+        _LIGHT_THEME_CACHE = window_color.lightness() > 128  # 亮度大於128視為淺色
+        if not _THEME_SIGNAL_CONNECTED:
+            app.paletteChanged.connect(_invalidate_theme_cache)
+            _THEME_SIGNAL_CONNECTED = True
+        return _LIGHT_THEME_CACHE
     return False
 
 
+def _make_branch_pixmaps(size, dpr=1.0):
+    """回傳 (plus_pix, minus_pix)：兩個符號畫在同一張 pixmap 後裁切，只開一次 QPainter"""
+    # 依螢幕 devicePixelRatio 產生實體像素，避免 HiDPI 上每次繪製都放大；
+    # 設定 DPR 後 painter 仍以邏輯座標 (size) 作畫
+    phys = int(size * dpr)
+    combined = QPixmap(phys * 2, phys)
+    combined.setDevicePixelRatio(dpr)
+    combined.fill(QColor(0, 0, 0, 0))
+    p = QPainter(combined)
+    pen = QPen(QColor(200, 200, 200))
+    pen.setWidth(max(2, size // 8))
+    p.setPen(pen)
+    y = size // 2
+    # 左半為 +，右半為 -
+    p.drawLine(size // 4, y, size * 3 // 4, y)
+    x = size // 2
+    p.drawLine(x, size // 4, x, size * 3 // 4)
+    p.drawLine(size + size // 4, y, size + size * 3 // 4, y)
+    p.end()
+    # copy 以實體像素為單位
+    plus_pix = combined.copy(0, 0, phys, phys)
+    minus_pix = combined.copy(phys, 0, phys, phys)
+    plus_pix.setDevicePixelRatio(dpr)
+    minus_pix.setDevicePixelRatio(dpr)
+    return plus_pix, minus_pix
+
+
+def _cached_branch_pixmaps(size, dpr=1.0):
+    # 經由 QPixmapCache 共用同一份 pixmap，所有 tree 與項目共享記憶體
+    plus_key = f"{_PLUS_PIXMAP_KEY}@{dpr:g}"
+    minus_key = f"{_MINUS_PIXMAP_KEY}@{dpr:g}"
+    plus_pix = QPixmapCache.find(plus_key)
+    minus_pix = QPixmapCache.find(minus_key)
+    if plus_pix is None or plus_pix.isNull() or minus_pix is None or minus_pix.isNull():
+        plus_pix, minus_pix = _make_branch_pixmaps(size, dpr)
+        QPixmapCache.insert(plus_key, plus_pix)
+        QPixmapCache.insert(minus_key, minus_pix)
+    return plus_pix, minus_pix
+
+
+class TypedTreeItem(QTreeWidgetItem):
+    """以 Python 屬性 ntype 保存節點類型的 QTreeWidgetItem。
+
+    讀取 ntype 不需經由 data(0, UserRole) 解開 QVariant；setData 仍寫入 UserRole，
+    讓其他以 UserRole 判斷節點類型的程式維持相容。
+    """
+
+    __slots__ = ("ntype",)
+
+    def __init__(self, *args, ntype=None):
+        super().__init__(*args)
+        self.ntype = None
+        if ntype is not None:
+            self.setData(0, Qt.ItemDataRole.UserRole, ntype)
+
+    def setData(self, column, role, value):
+        if column == 0 and role == Qt.ItemDataRole.UserRole:
+            self.ntype = value
+        super().setData(column, role, value)
+
+
 class ConnectivityTree(QTreeWidget):
     # 📡 定義操作訊號
     request_new_channel = pyqtSignal(QTreeWidgetItem)
@@ -32,15 +141,79 @@ class ConnectivityTree(QTreeWidget):
     # New signal: request the main UI show the content page for an item (used for Group double-click)
     request_show_content = pyqtSignal(QTreeWidgetItem)
 
+    # 樣式表模板；淺色/深色完成後的字串快取於類別層級，多個 tree 實例共用
+    _STYLESHEET_TEMPLATE = """
+QTreeWidget::branch:closed:has-children { image: url("%(plus_url)s"); width: %(size)dpx; height: %(size)dpx; margin-left: 0px; margin-right: 5px; }
+QTreeWidget::branch:open:has-children { image: url("%(minus_url)s"); width: %(size)dpx; height: %(size)dpx; margin-left: 0px; margin-right: 5px; }
+QTreeWidget { 
+    margin-left: 0px; 
+    padding-left: 0px; 
+    outline: none; 
+    border: none;
+    background-color: %(bg_color)s;
+}
+QTreeWidget::item { 
+    padding-left: 0px; 
+    outline: none; 
+    border: none;
+    background-color: %(bg_color)s;
+    color: %(text_color)s;
+}
+QTreeWidget::item:selected { 
+    background-color: %(selected_bg)s;
+    color: %(text_color)s;
+    outline: none;
+    border: none;
+}
+QTreeWidget::item:selected:hover {
+    background-color: %(selected_hover)s;
+    outline: none;
+    border: none;
+}
+"""
+    _BRANCH_VALUES = {
+        "plus_url": _PLUS_URL,
+        "minus_url": _MINUS_URL,
+        "size": _BRANCH_ICON_SIZE,
+    }
+    # 根據系統主題選擇顏色（key: 是否為淺色主題）
+    _THEME_COLORS = {
+        True: {
+            "bg_color": "#ffffff",
+            "text_color": "#000000",
+            "selected_bg": "#cce7ff",
+            "selected_hover": "#99d6ff",
+        },
+        False: {
+            "bg_color": "#2b2b2b",
+            "text_color": "#ffffff",
+            "selected_bg": "#0d47a1",
+            "selected_hover": "#1565c0",
+        },
+    }
+    _sheet_light = None
+    _sheet_dark = None
+    # +/- 圖示與主題無關，整個程序共用同一組 QIcon
+    _plus_icon = None
+    _minus_icon = None
+
     def __init__(self, parent=None):
         super().__init__(parent)
 
-        self.root_node = QTreeWidgetItem(self)
-        self.root_node.setText(0, "Project")
-        self.root_node.setData(0, Qt.ItemDataRole.UserRole, "Project")
-        self.conn_node = QTreeWidgetItem(self.root_node)
-        self.conn_node.setText(0, "Connectivity")
-        self.conn_node.setData(0, Qt.ItemDataRole.UserRole, "Connectivity")
+        # id(item) -> (item, node_type)；保留 item 參考使 id 在項目存活期間不會被重用
+        self._node_type = {}
+
+        # 所有列共用同一個 sizeHint，版面計算時不必逐列詢問 delegate；
+        # 其他地方建立項目時也應 setSizeHint(0, tree._uniform_size)
+        text_size = self.fontMetrics().boundingRect("Mg").size()
+        icon_h = self.style().pixelMetric(QStyle.PixelMetric.PM_SmallIconSize)
+        self._uniform_size = QSize(
+            text_size.width(), max(text_size.height() + 4, icon_h + 2)
+        )
+
+        self.root_node = None
+        self.conn_node = None
+        self._ensure_roots()
 
         self.setHeaderHidden(True)
         self.setUniformRowHeights(True)
@@ -49,85 +222,103 @@ class ConnectivityTree(QTreeWidget):
         self.setItemsExpandable(True)
         self.setIndentation(20)
 
+        self._icon_refresh_pending = False
+        self._walk_stack = []
         self._create_branch_symbols()
         self._setup_icons_and_tags()
         self.setExpandsOnDoubleClick(False)
         self.itemDoubleClicked.connect(self._handle_double_click)
 
-    def _create_branch_symbols(self):
+        # 右鍵選單依節點類型分派，各選單於第一次使用時建立並快取；
+        # 動作透過 _current_context_item 取得目標節點
+        self._current_context_item = None
+        self._menus = {}
+        self._menu_builders = {
+            "Connectivity": self._build_conn_menu,
+            "Channel": self._build_channel_menu,
+            "Device": self._build_device_menu,
+            "Group": self._build_group_menu,
+            "Tag": self._build_tag_menu,
+        }
+
+    def _ensure_roots(self):
+        # 🟢 建立符合 Project -> Connectivity 的結構（若尚未建立）
         try:
+            if self.root_node is None:
+                self.root_node = TypedTreeItem(self, ntype="Project")
+                self.root_node.setText(0, "Project")
+                self.root_node.setSizeHint(0, self._uniform_size)
+                try:
+                    self.root_node.setExpanded(False)
+                except Exception:
+                    pass
+            if self.conn_node is None:
+                self.conn_node = TypedTreeItem(self.root_node, ntype="Connectivity")
+                self.conn_node.setText(0, "Connectivity")
+                self.conn_node.setSizeHint(0, self._uniform_size)
+                try:
+                    self.conn_node.setExpanded(False)
+                except Exception:
+                    pass
+        except Exception:
+            pass
+        # 確保頂層節點使用與其他節點相同的字型，避免因字型或樣式造成高度差異
+        try:
+            default_font = self.font()
+            self.root_node.setFont(0, default_font)
+            self.conn_node.setFont(0, default_font)
+        except Exception:
+            pass
 
-            def _make_symbol_pixmap(size, minus=False):
-                pix = QPixmap(size, size)
-                pix.fill(QColor(0, 0, 0, 0))
-                p = QPainter(pix)
-                pen = QPen(QColor(200, 200, 200))
-                pen.setWidth(max(2, size // 8))
-                p.setPen(pen)
-                y = size // 2
-                p.drawLine(size // 4, y, size * 3 // 4, y)
-                if not minus:
-                    x = size // 2
-                    p.drawLine(x, size // 4, x, size * 3 // 4)
-                p.end()
-                return pix
-
-            def _pixmap_to_dataurl(pix):
-                buf = QBuffer()
-                buf.open(QIODevice.OpenModeFlag.WriteOnly)
-                pix.save(buf, "PNG")
-                data = bytes(buf.data())
-                b64 = base64.b64encode(data).decode("ascii")
-                return f"data:image/png;base64,{b64}"
-
-            size = 28
-            self._plus_icon = QIcon(_make_symbol_pixmap(size, minus=False))
-            self._minus_icon = QIcon(_make_symbol_pixmap(size, minus=True))
-            plus_url = _pixmap_to_dataurl(self._plus_icon.pixmap(size))
-            minus_url = _pixmap_to_dataurl(self._minus_icon.pixmap(size))
-
-            # 根據系統主題選擇顏色
-            if _is_light_theme():
-                bg_color = "#ffffff"
-                text_color = "#000000"
-                selected_bg = "#cce7ff"
-                selected_hover = "#99d6ff"
-            else:
-                bg_color = "#2b2b2b"
-                text_color = "#ffffff"
-                selected_bg = "#0d47a1"
-                selected_hover = "#1565c0"
-
-            sheet = f"""
-QTreeWidget::branch:closed:has-children {{ image: url({plus_url}); width: {size}px; height: {size}px; margin-left: 0px; margin-right: 5px; }}
-QTreeWidget::branch:open:has-children {{ image: url({minus_url}); width: {size}px; height: {size}px; margin-left: 0px; margin-right: 5px; }}
-QTreeWidget {{ 
-    margin-left: 0px; 
-    padding-left: 0px; 
-    outline: none; 
-    border: none;
-    background-color: {bg_color};
-}}
-QTreeWidget::item {{ 
-    padding-left: 0px; 
-    outline: none; 
-    border: none;
-    background-color: {bg_color};
-    color: {text_color};
-}}
-QTreeWidget::item:selected {{ 
-    background-color: {selected_bg};
-    color: {text_color};
-    outline: none;
-    border: none;
-}}
-QTreeWidget::item:selected:hover {{
-    background-color: {selected_hover};
-    outline: none;
-    border: none;
-}}
-"""
-            self.setStyleSheet(sheet)
+    @staticmethod
+    def _get_branch_icons(dpr=1.0):
+        if ConnectivityTree._plus_icon is None:
+            plus_pix, minus_pix = _cached_branch_pixmaps(_BRANCH_ICON_SIZE, dpr)
+            ConnectivityTree._plus_icon = QIcon(plus_pix)
+            ConnectivityTree._minus_icon = QIcon(minus_pix)
+        return ConnectivityTree._plus_icon, ConnectivityTree._minus_icon
+
+    @classmethod
+    def _get_stylesheet(cls, light_theme):
+        """回傳對應主題的樣式表；淺色/深色各只組一次並保存在類別屬性"""
+        if light_theme:
+            if cls._sheet_light is None:
+                cls._sheet_light = cls._STYLESHEET_TEMPLATE % dict(
+                    cls._THEME_COLORS[True], **cls._BRANCH_VALUES
+                )
+            return cls._sheet_light
+        if cls._sheet_dark is None:
+            cls._sheet_dark = cls._STYLESHEET_TEMPLATE % dict(
+                cls._THEME_COLORS[False], **cls._BRANCH_VALUES
+            )
+        return cls._sheet_dark
+
+    def _create_branch_symbols(self):
+        self._branch_icon_size = _BRANCH_ICON_SIZE
+        self._get_branch_icons(self.devicePixelRatioF())
+        self._current_stylesheet_hash = None
+        self._theme_refresh_pending = False
+        self._apply_stylesheet()
+        app = QApplication.instance()
+        if app is not None:
+            app.paletteChanged.connect(self.refresh_theme)
+
+    def refresh_theme(self):
+        # 主題變更可能連續觸發多次，以零延遲計時器合併成一次套用
+        if self._theme_refresh_pending:
+            return
+        self._theme_refresh_pending = True
+        QTimer.singleShot(0, self._apply_stylesheet)
+
+    def _apply_stylesheet(self):
+        self._theme_refresh_pending = False
+        try:
+            sheet = self._get_stylesheet(_is_light_theme())
+            # setStyleSheet 會重新 polish 並重排所有列，內容相同時略過
+            sheet_hash = hash(sheet)
+            if sheet_hash != self._current_stylesheet_hash:
+                self._current_stylesheet_hash = sheet_hash
+                self.setStyleSheet(sheet)
         except Exception as e:
             import traceback
 
@@ -136,61 +327,132 @@ QTreeWidget::item:selected:hover {{
 
     def _setup_icons_and_tags(self):
         try:
+            self.itemExpanded.connect(self._on_item_expanded)
+            self.itemCollapsed.connect(self._update_item_icon)
+            model = self.model()
+            model.rowsInserted.connect(self._on_rows_inserted)
+            model.rowsAboutToBeRemoved.connect(self._on_rows_about_to_be_removed)
+            model.dataChanged.connect(self._on_data_changed)
+            model.modelAboutToBeReset.connect(self._node_type.clear)
+            self._refresh_all_icons()
+        except Exception:
+            pass
 
-            def _has_non_tag_child(node):
-                if node is None:
-                    return False
-                for ii in range(node.childCount()):
-                    ch = node.child(ii)
-                    if ch is None:
-                        continue
-                    if ch.data(0, Qt.ItemDataRole.UserRole) != "Tag":
-                        return True
-                return False
+    def _get_node_type(self, item):
+        if type(item) is TypedTreeItem:
+            return item.ntype
+        # 一般 QTreeWidgetItem 使用型別快取：避免每次走訪都經由 data(0, UserRole) 跨越 Python/C++
+        entry = self._node_type.get(id(item))
+        if entry is not None:
+            return entry[1]
+        ntype = item.data(0, Qt.ItemDataRole.UserRole)
+        self._node_type[id(item)] = (item, ntype)
+        return ntype
+
+    def _on_data_changed(self, top_left, _bottom_right, roles=()):
+        # 外部以 setData 變更 UserRole 時讓快取失效；圖示等其他角色的變更則略過
+        if roles and Qt.ItemDataRole.UserRole not in roles:
+            return
+        item = self.itemFromIndex(top_left)
+        if item is not None:
+            self._node_type.pop(id(item), None)
 
-            def _update_item_icon(item):
-                if item is None:
-                    return
-                ntype = item.data(0, Qt.ItemDataRole.UserRole)
-                if ntype == "Tag":
-                    item.setHidden(True)
-                    return
-
-                if _has_non_tag_child(item):
-                    if item.isExpanded():
-                        item.setIcon(0, self._minus_icon)
-                    else:
-                        item.setIcon(0, self._plus_icon)
-                else:
-                    item.setIcon(0, QIcon())
-
-            def _apply_recursive(node):
+    def _on_rows_about_to_be_removed(self, parent_index, start, end):
+        try:
+            if parent_index.isValid():
+                parent_item = self.itemFromIndex(parent_index)
+            else:
+                parent_item = self.invisibleRootItem()
+            stack = [parent_item.child(i) for i in range(start, end + 1)]
+            while stack:
+                node = stack.pop()
                 if node is None:
-                    return
-                _update_item_icon(node)
+                    continue
+                self._node_type.pop(id(node), None)
                 for i in range(node.childCount()):
-                    _apply_recursive(node.child(i))
+                    stack.append(node.child(i))
+        except Exception:
+            pass
 
-            self.itemExpanded.connect(lambda it: _update_item_icon(it))
-            self.itemCollapsed.connect(lambda it: _update_item_icon(it))
+    def _update_item_icon(self, item):
+        if item is None:
+            return
+        ntype = self._get_node_type(item)
+        if ntype == "Tag":
+            item.setHidden(True)
+            return
 
-            model = self.model()
+        if self._has_non_tag_child(item):
+            if item.isExpanded():
+                item.setIcon(0, self._minus_icon)
+            else:
+                item.setIcon(0, self._plus_icon)
+        else:
+            item.setIcon(0, QIcon())
+
+    def _apply_recursive(self, node):
+        # 以明確堆疊走訪子樹（重用同一個 list），避免 Python 遞迴的呼叫開銷與深度限制；
+        # 收合節點的子孫看不到，留待 itemExpanded 展開時再補上
+        stack = self._walk_stack
+        stack.clear()
+        stack.append(node)
+        while stack:
+            node = stack.pop()
+            if node is None:
+                continue
+            self._update_item_icon(node)
+            if node.isExpanded():
+                for i in range(node.childCount()):
+                    stack.append(node.child(i))
+
+    def _on_item_expanded(self, item):
+        self._apply_recursive(item)
+
+    def _hide_tag_descendants(self, node):
+        # 隱藏 node 底下所有 Tag（不論節點是否展開）；圖示仍留待展開時更新
+        stack = [node.child(i) for i in range(node.childCount())]
+        while stack:
+            child = stack.pop()
+            if child is None:
+                continue
+            if self._get_node_type(child) == "Tag":
+                child.setHidden(True)
+            for i in range(child.childCount()):
+                stack.append(child.child(i))
+
+    def _on_rows_inserted(self, parent_index, start, end):
+        # 只更新新插入的列與其父節點的圖示，不遞迴整個子樹；
+        # 但插入的預建子樹中的 Tag 一律立即隱藏，即使父節點是收合的。
+        # 批次插入期間的型別/子節點變化由延遲的整樹刷新一次補齊
+        try:
+            if parent_index.isValid():
+                parent_item = self.itemFromIndex(parent_index)
+            else:
+                parent_item = self.invisibleRootItem()
+            for i in range(start, end + 1):
+                child = parent_item.child(i)
+                if child is None:
+                    continue
+                self._update_item_icon(child)
+                self._hide_tag_descendants(child)
+            if parent_index.isValid():
+                self._update_item_icon(parent_item)
+            self._schedule_icon_refresh()
+        except Exception:
+            pass
 
-            def _on_rows_inserted(parent_index, start, end):
-                try:
-                    if parent_index.isValid():
-                        parent_item = self.itemFromIndex(parent_index)
-                    else:
-                        parent_item = self.invisibleRootItem()
-                    for i in range(start, end + 1):
-                        child = parent_item.child(i)
-                        _apply_recursive(child)
-                    _update_item_icon(parent_item)
-                except Exception:
-                    pass
+    def _schedule_icon_refresh(self):
+        if self._icon_refresh_pending:
+            return
+        self._icon_refresh_pending = True
+        QTimer.singleShot(0, self._refresh_all_icons)
 
-            model.rowsInserted.connect(_on_rows_inserted)
-            _apply_recursive(self.invisibleRootItem())
+    def _refresh_all_icons(self):
+        self._icon_refresh_pending = False
+        try:
+            with QSignalBlocker(self):
+                for i in range(self.topLevelItemCount()):
+                    self._apply_recursive(self.topLevelItem(i))
         except Exception:
             pass
 
@@ -199,61 +461,28 @@ QTreeWidget::item:selected:hover {{
         # This prevents the | symbols from appearing
         pass
 
-    def drawTree(self, painter, region):
-        # Skip drawing tree to prevent any branch lines
-        # Call parent's item painting but not branch painting
-        super().drawTree(painter, region)
-
     def hide_all_tags(self):
         # Public helper: walk the whole tree and hide any Tag-level nodes.
+        # 走訪期間暫停重繪並阻擋訊號，讓大量 setHidden 合併為一次重排
+        self.setUpdatesEnabled(False)
+        blocker = QSignalBlocker(self)
         try:
-
-            def _walk(node):
-                if node is None:
-                    return
-                try:
-                    ntype = node.data(0, Qt.ItemDataRole.UserRole)
-                    if ntype == "Tag":
-                        try:
-                            node.setHidden(True)
-                        except Exception:
-                            pass
-                except Exception:
-                    pass
-                for i in range(node.childCount()):
-                    _walk(node.child(i))
-
-            _walk(self.invisibleRootItem())
-        except Exception:
-            pass
-
-        # 2. 🟢 建立符合 Project -> Connectivity 的結構（若尚未建立）
-        try:
-            if not getattr(self, "root_node", None):
-                self.root_node = QTreeWidgetItem(self)
-                self.root_node.setText(0, "Project")
-                self.root_node.setData(0, Qt.ItemDataRole.UserRole, "Project")
+            # QTreeWidgetItemIterator 於 C++ 端依 DFS 順序走訪整棵樹
+            it = QTreeWidgetItemIterator(self)
+            node = it.value()
+            while node is not None:
                 try:
-                    self.root_node.setExpanded(False)
+                    if self._get_node_type(node) == "Tag":
+                        node.setHidden(True)
                 except Exception:
                     pass
-            if not getattr(self, "conn_node", None):
-                self.conn_node = QTreeWidgetItem(self.root_node)
-                self.conn_node.setText(0, "Connectivity")
-                self.conn_node.setData(0, Qt.ItemDataRole.UserRole, "Connectivity")
-                try:
-                    self.conn_node.setExpanded(False)
-                except Exception:
-                    pass
-        except Exception:
-            pass
-        # 確保頂層節點使用與其他節點相同的字型，避免因字型或樣式造成高度差異
-        try:
-            default_font = self.font()
-            self.root_node.setFont(0, default_font)
-            self.conn_node.setFont(0, default_font)
+                it += 1
+                node = it.value()
         except Exception:
             pass
+        finally:
+            blocker.unblock()
+            self.setUpdatesEnabled(True)
 
     def _has_non_tag_child(self, node):
         # Return True if node has any child that is not a Tag (Tags are hidden)
@@ -266,7 +495,7 @@ QTreeWidget::item:selected:hover {{
                     if ch is None:
                         continue
                     try:
-                        if ch.data(0, Qt.ItemDataRole.UserRole) != "Tag":
+                        if self._get_node_type(ch) != "Tag":
                             return True
                     except Exception:
                         return True
@@ -277,7 +506,7 @@ QTreeWidget::item:selected:hover {{
         return False
 
     def _handle_double_click(self, item, _column):
-        node_type = item.data(0, Qt.ItemDataRole.UserRole)
+        node_type = self._get_node_type(item)
 
         if node_type in ["Project", "Connectivity"]:
             item.setExpanded(not item.isExpanded())
@@ -299,21 +528,8 @@ QTreeWidget::item:selected:hover {{
                 except Exception:
                     rect = None
                 if rect is not None:
-                    # define a branch-hit zone using our branch icon size (fallback to 28)
-                    icon_w = getattr(self, "_branch_icon_size", None)
-                    try:
-                        if icon_w is None:
-                            # attempt to infer from icon available
-                            icon_w = (
-                                self._plus_icon.actualSize(
-                                    self._plus_icon.availableSizes()[0]
-                                ).width()
-                                if hasattr(self, "_plus_icon")
-                                and self._plus_icon.availableSizes()
-                                else 28
-                            )
-                    except Exception:
-                        icon_w = 28
+                    # define a branch-hit zone using our branch icon size
+                    icon_w = self._branch_icon_size
                     zone_left = rect.left()
                     x, y, w, h = (zone_left, rect.top(), icon_w + 8, rect.height())
                     if x <= pos.x() <= x + w and rect.top() <= pos.y() <= rect.bottom():
@@ -338,6 +554,66 @@ QTreeWidget::item:selected:hover {{
             pass
         super().mousePressEvent(event)
 
+    def _build_conn_menu(self):
+        menu = self._menus.get("Connectivity")
+        if menu is None:
+            menu = self._menus["Connectivity"] = QMenu(self)
+            self._add_action(menu, "➕ 新增 Channel", self.request_new_channel)
+        return menu
+
+    def _build_channel_menu(self):
+        menu = self._menus.get("Channel")
+        if menu is None:
+            menu = self._menus["Channel"] = QMenu(self)
+            self._add_action(menu, "➕ 新增 Device", self.request_new_device)
+            menu.addSeparator()
+            self._add_common_actions(menu)
+        return menu
+
+    def _build_device_menu(self):
+        menu = self._menus.get("Device")
+        if menu is None:
+            menu = self._menus["Device"] = QMenu(self)
+            self._add_action(menu, "➕ 新增 Group", self.request_new_group)
+            self._add_action(menu, "➕ 新增 Tag", self.request_new_tag)
+            menu.addSeparator()
+            self._add_common_actions(menu)
+            # Diagnostics only for Device (show per-device diagnostics window)
+            menu.addSeparator()
+            self._add_action(menu, "📊 Diagnostics", self.request_device_diagnostics)
+            # CSV import/export only on Device nodes
+            menu.addSeparator()
+            self._add_action(menu, "📥 匯入 CSV", self.request_import_csv)
+            self._add_action(menu, "📤 匯出 CSV", self.request_export_csv)
+        return menu
+
+    def _build_group_menu(self):
+        menu = self._menus.get("Group")
+        if menu is None:
+            menu = self._menus["Group"] = QMenu(self)
+            self._add_action(menu, "➕ 新增 Group", self.request_new_group)
+            self._add_action(menu, "➕ 新增 Tag", self.request_new_tag)
+            menu.addSeparator()
+            self._add_common_actions(menu)
+        return menu
+
+    def _build_tag_menu(self):
+        menu = self._menus.get("Tag")
+        if menu is None:
+            menu = self._menus["Tag"] = QMenu(self)
+            self._add_common_actions(menu)
+        return menu
+
+    def _add_action(self, menu, text, signal):
+        action = menu.addAction(text)
+        action.triggered.connect(functools.partial(self._emit_for_context, signal))
+        return action
+
+    def _emit_for_context(self, signal, *_args):
+        item = self._current_context_item
+        if item is not None:
+            signal.emit(item)
+
     def contextMenuEvent(self, event):
         # 處理右鍵選單邏輯
         # Qt override - this method is invoked by the framework; keep it even if static analysis flags it.
@@ -345,49 +621,22 @@ QTreeWidget::item:selected:hover {{
         if not item:
             return
 
-        node_type = item.data(0, Qt.ItemDataRole.UserRole)
-        menu = QMenu(self)
-
         # 根據節點類型顯示不同選單
-        if node_type == "Connectivity":
-            menu.addAction(
-                "➕ 新增 Channel", lambda: self.request_new_channel.emit(item)
-            )
-        elif node_type == "Channel":
-            menu.addAction("➕ 新增 Device", lambda: self.request_new_device.emit(item))
-            menu.addSeparator()
-            self._add_common_actions(menu, item)
-        elif node_type in ["Device", "Group"]:
-            menu.addAction("➕ 新增 Group", lambda: self.request_new_group.emit(item))
-            menu.addAction("➕ 新增 Tag", lambda: self.request_new_tag.emit(item))
-            menu.addSeparator()
-            self._add_common_actions(menu, item)
-            # Diagnostics only for Device (show per-device diagnostics window)
-            if node_type == "Device":
-                menu.addSeparator()
-                menu.addAction(
-                    "📊 Diagnostics", lambda: self.request_device_diagnostics.emit(item)
-                )
-            # CSV import/export only on Device nodes
-            if node_type == "Device":
-                menu.addSeparator()
-                menu.addAction(
-                    "📥 匯入 CSV", lambda: self.request_import_csv.emit(item)
-                )
-                menu.addAction(
-                    "📤 匯出 CSV", lambda: self.request_export_csv.emit(item)
-                )
-        elif node_type == "Tag":
-            self._add_common_actions(menu, item)
-
-        if not menu.isEmpty():
+        builder = self._menu_builders.get(self._get_node_type(item))
+        if builder is None:
+            return
+        menu = builder()
+        self._current_context_item = item
+        try:
             menu.exec(event.globalPos())
+        finally:
+            self._current_context_item = None
 
-    def _add_common_actions(self, menu, item):
+    def _add_common_actions(self, menu):
         # 通用選單動作：剪切、複製、貼上、刪除、內容
-        menu.addAction("✂️ 剪下", lambda: self.request_cut_item.emit(item))
-        menu.addAction("📋 複製", lambda: self.request_copy_item.emit(item))
-        menu.addAction("📥 貼上", lambda: self.request_paste_item.emit(item))
+        self._add_action(menu, "✂️ 剪下", self.request_cut_item)
+        self._add_action(menu, "📋 複製", self.request_copy_item)
+        self._add_action(menu, "📥 貼上", self.request_paste_item)
         menu.addSeparator()
-        menu.addAction("❌ 刪除", lambda: self.request_delete_item.emit(item))
-        menu.addAction("✏️ 內容", lambda: self.request_edit_item.emit(item))
+        self._add_action(menu, "❌ 刪除", self.request_delete_item)
+        self._add_action(menu, "✏️ 內容", self.request_edit_item)
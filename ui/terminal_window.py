@@ -1,16 +1,245 @@
 from PyQt6.QtWidgets import (
-    QMainWindow, QWidget, QVBoxLayout, QTableWidget, 
-    QTableWidgetItem, QFileDialog, QMessageBox
+    QMainWindow, QWidget, QVBoxLayout, QTableView, QHeaderView,
+    QFileDialog, QMessageBox
 )
 from PyQt6.QtGui import QAction
-from PyQt6.QtCore import Qt, QTimer
-import threading
+from PyQt6.QtCore import Qt, QTimer, QAbstractTableModel, QModelIndex, pyqtSignal
+import collections
+import csv
+import re
+from datetime import date
 
 from core.config import GROUP_SEPARATOR
 
+# 診斷訊息比對/解析用的 regex，於模組載入時編譯一次
+_TXRX_RE = re.compile(r"\b(TX|RX)\b")
+_DEVID_RE = re.compile(r"DEV_ID=(\d+)")
+_HEXBLOCK_RE = re.compile(r"\|\s*([0-9A-Fa-f\s]+)\s*\|")
+_IDKV_RE = re.compile(r"id=(\d+)")
+_TX_HEX_RE = re.compile(r"TX:\s*\|\s*([0-9A-Fa-f\s]+)\s*\|")
+_RX_HEX_RE = re.compile(r"RX:\s*\|\s*([0-9A-Fa-f\s]+)\s*\|")
+
+
+# (date ordinal, 格式化後的日期字串)；日期變更時才重新 strftime
+_date_cache = (None, "")
+
+
+def _today_str():
+    """回傳今天的 "%Y/%m/%d" 字串，同一天內重複使用快取結果"""
+    global _date_cache
+    today = date.today()
+    day = today.toordinal()
+    if day != _date_cache[0]:
+        _date_cache = (day, today.strftime("%Y/%m/%d"))
+    return _date_cache[1]
+
+
+def _to_int(value):
+    """轉為 int；無法轉換時回傳 None（集中處理，呼叫端不必各自包 try/except）"""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _has_txrx(txt):
+    """訊息是否含獨立的 TX/RX token
+
+    先以 C 層的子字串檢查過濾（不含 TX/RX 的訊息不必進入 regex），
+    只有含子字串時才用 regex 確認為獨立 token。
+    """
+    return ("TX" in txt or "RX" in txt) and _TXRX_RE.search(txt) is not None
+
+
+class DiagModel(QAbstractTableModel):
+    """诊断表格的資料模型 - 每列為 (date, time, event, length, data) tuple
+
+    資料存放在外部傳入的 deque 中；QTableView 只會查詢可見的儲存格，
+    不需要為每個儲存格建立 QTableWidgetItem。
+    """
+
+    HEADERS = ("Date", "Time", "Event", "Length", "Data")
+
+    # data() 會對每個可見儲存格呼叫；role 與對齊值預先取出，避免逐格查詢 enum 屬性
+    _DISPLAY_ROLE = Qt.ItemDataRole.DisplayRole
+    _ALIGN_ROLE = Qt.ItemDataRole.TextAlignmentRole
+    _CENTER = Qt.AlignmentFlag.AlignCenter
+    _CENTERED_COLUMNS = 4  # Date/Time/Event/Length 置中
+
+    def __init__(self, rows, parent=None):
+        super().__init__(parent)
+        self._rows = rows
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == self._DISPLAY_ROLE:
+            return self._rows[index.row()][index.column()]
+        if role == self._ALIGN_ROLE and index.column() < self._CENTERED_COLUMNS:
+            return self._CENTER
+        return None
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.HEADERS[section]
+        return super().headerData(section, orientation, role)
+
+    def append_row(self, row):
+        """新增一列；deque 已滿時先通知 view 移除最舊的一列"""
+        rows = self._rows
+        if rows.maxlen is not None and len(rows) >= rows.maxlen:
+            self.beginRemoveRows(QModelIndex(), 0, 0)
+            rows.popleft()
+            self.endRemoveRows()
+        n = len(rows)
+        self.beginInsertRows(QModelIndex(), n, n)
+        rows.append(row)
+        self.endInsertRows()
+
+    def append_rows(self, new_rows):
+        """批次新增多列，只發出一組 insert（及必要時一組 remove）通知"""
+        rows = self._rows
+        maxlen = rows.maxlen
+        if maxlen is not None:
+            if len(new_rows) >= maxlen:
+                self.beginResetModel()
+                rows.clear()
+                rows.extend(new_rows[-maxlen:])
+                self.endResetModel()
+                return
+            excess = len(rows) + len(new_rows) - maxlen
+            if excess > 0:
+                self.beginRemoveRows(QModelIndex(), 0, excess - 1)
+                for _ in range(excess):
+                    rows.popleft()
+                self.endRemoveRows()
+        n = len(rows)
+        self.beginInsertRows(QModelIndex(), n, n + len(new_rows) - 1)
+        rows.extend(new_rows)
+        self.endInsertRows()
+
+    def clear(self):
+        self.beginResetModel()
+        self._rows.clear()
+        self.endResetModel()
+
+
+# (direction, fc) -> "TX FC3" 之類的 Event 字串；組合數量很少，快取後幾乎都命中
+_event_labels = {}
+
+
+def _format_modbus_ctx(ts, text, ctx, date_str):
+    """modbus_client.trace_packet 產生的標準 ctx（real_packet）的快速格式化
+
+    ctx 形狀不符預期時回傳 None，由 _format_record 走一般路徑。
+    """
+    direction = ctx.get("direction")
+    fc = ctx.get("fc")
+    length = ctx.get("length")
+    hex_text = ctx.get("hex")
+    if (direction not in ("TX", "RX") or type(length) is not int
+            or not (fc is None or type(fc) is int)
+            or type(hex_text) is not str or not hex_text):
+        return None
+    key = (direction, fc)
+    event = _event_labels.get(key)
+    if event is None:
+        event = direction if fc is None else f"{direction} FC{fc}"
+        _event_labels[key] = event
+    meta = ", ".join(
+        f"{label}={value}"
+        for label, value in (
+            ("unit", ctx.get("unit")),
+            ("addr", ctx.get("address")),
+            ("count", ctx.get("count")),
+            ("host", ctx.get("host") or None),
+            ("port", ctx.get("port")),
+        )
+        if value is not None
+    )
+    data_text = f"{hex_text}   ({meta})" if meta else hex_text
+    return (date_str, ts, event, str(length), data_text)
+
+
+def _format_record(ts, text, ctx=None):
+    """將一筆診斷紀錄轉為表格列 (date, time, event, length, data)
+
+    純函式，不觸碰任何 Qt 物件，可在非 GUI 執行緒呼叫。
+    """
+    date_str = _today_str()
+    if type(ctx) is dict and ctx.get("real_packet"):
+        row = _format_modbus_ctx(ts, text, ctx, date_str)
+        if row is not None:
+            return row
+    event = ""
+    length = ""
+    data_text = str(text or "")
+    if isinstance(ctx, dict):
+        direction = str(ctx.get("direction") or "").upper()
+        fc_val = ctx.get("fc")
+        fc_int = _to_int(fc_val)
+        if fc_int is not None:
+            fc_val = fc_int
+        if direction:
+            event = direction if fc_val is None else f"{direction} FC{fc_val}"
+        length_val = ctx.get("length")
+        if length_val is not None:
+            length_int = _to_int(length_val)
+            length = str(length_val if length_int is None else length_int)
+        hex_text = ctx.get("hex") or ctx.get("hex_str")
+        if hex_text:
+            data_text = str(hex_text)
+        meta_bits = []
+        unit_val = ctx.get("unit")
+        host_val = ctx.get("host")
+        port_val = ctx.get("port")
+        addr_val = ctx.get("address")
+        count_val = ctx.get("count")
+        if unit_val is not None:
+            meta_bits.append(f"unit={unit_val}")
+        if addr_val is not None:
+            meta_bits.append(f"addr={addr_val}")
+        if count_val is not None:
+            meta_bits.append(f"count={count_val}")
+        if host_val:
+            meta_bits.append(f"host={host_val}")
+        if port_val is not None:
+            meta_bits.append(f"port={port_val}")
+        if meta_bits and data_text:
+            data_text = f"{data_text}   ({', '.join(meta_bits)})"
+    if not event:
+        txt_str = str(text or "")
+        m = _TX_HEX_RE.search(txt_str) or _RX_HEX_RE.search(txt_str)
+        if m:
+            parts = m.group(1).split()
+            data_text = " ".join(p.upper() for p in parts)
+            length = length or str(len(parts))
+            if 'TX:' in txt_str:
+                event = 'TX'
+            elif 'RX:' in txt_str:
+                event = 'RX'
+        else:
+            data_text = txt_str
+    return (date_str, ts, event, length, data_text)
+
 
 class TerminalWindow(QMainWindow):
     """诊断信息窗口 - 显示设备的诊断数据"""
+
+    # 要求於 GUI 執行緒處理 _pending（以 QueuedConnection 連接，任何執行緒皆可 emit）
+    _drainRequested = pyqtSignal()
+
+    # 表格最多保留的列數；超過時 deque 自動淘汰最舊的列
+    MAX_ROWS = 20000
+    # 每次 _drain_pending 最多處理的紀錄數
+    DRAIN_BATCH = 500
+
     def __init__(self, parent=None, device_item=None, diagnostics_manager=None):
         super().__init__(parent)
         self.device_item = device_item
@@ -25,34 +254,23 @@ class TerminalWindow(QMainWindow):
         main_widget = QWidget()
         # 診斷資訊表格
         layout = QVBoxLayout()
-        self.diagnostics_table = QTableWidget()
-        self.diagnostics_table.setColumnCount(5)
-        self.diagnostics_table.setHorizontalHeaderLabels(["Date", "Time", "Event", "Length", "Data"])
+        self._rows = collections.deque(maxlen=self.MAX_ROWS)
+        self.diagnostics_model = DiagModel(self._rows, self)
+        self.diagnostics_table = QTableView()
+        self.diagnostics_table.setModel(self.diagnostics_model)
         
-        # 配置表头自动调整大小
+        # 欄位寬度：Date/Time/Event/Length 內容長度固定，使用固定寬度；
+        # Data 欄位伸縮填滿。Qt 不需為了計算寬度走訪整個 model
         header = self.diagnostics_table.horizontalHeader()
-        try:
-            # 設置欄位寬度策略
-            header.setSectionResizeMode(0, QTableWidget.ResizeMode.Fixed)  # Date - 固定寬度
-            header.setSectionResizeMode(1, QTableWidget.ResizeMode.Fixed)  # Time - 固定寬度
-            header.setSectionResizeMode(2, QTableWidget.ResizeMode.Fixed)  # Event - 固定寬度
-            header.setSectionResizeMode(3, QTableWidget.ResizeMode.Fixed)  # Length - 固定寬度
-            header.setSectionResizeMode(4, QTableWidget.ResizeMode.Stretch)  # Data - 伸縮寬度
-            
-            # 設置初始寬度
-            header.setSectionResizeMode(QTableWidget.ResizeMode.Interactive)  # 先設為互動模式以便設置寬度
-            self.diagnostics_table.setColumnWidth(0, 80)   # Date
-            self.diagnostics_table.setColumnWidth(1, 100)  # Time
-            self.diagnostics_table.setColumnWidth(2, 80)   # Event
-            self.diagnostics_table.setColumnWidth(3, 60)   # Length
-            # Data 欄位會自動伸縮
-            
-        except Exception:
-            # 備用方案：所有欄位都自動調整
-            try:
-                header.setSectionResizeMode(QTableWidget.ResizeMode.ResizeToContents)
-            except Exception:
-                pass
+        header.setSectionResizeMode(0, QHeaderView.ResizeMode.Fixed)  # Date - 固定寬度
+        header.setSectionResizeMode(1, QHeaderView.ResizeMode.Fixed)  # Time - 固定寬度
+        header.setSectionResizeMode(2, QHeaderView.ResizeMode.Fixed)  # Event - 固定寬度
+        header.setSectionResizeMode(3, QHeaderView.ResizeMode.Fixed)  # Length - 固定寬度
+        header.setSectionResizeMode(4, QHeaderView.ResizeMode.Stretch)  # Data - 伸縮寬度
+        self.diagnostics_table.setColumnWidth(0, 80)   # Date
+        self.diagnostics_table.setColumnWidth(1, 100)  # Time
+        self.diagnostics_table.setColumnWidth(2, 80)   # Event
+        self.diagnostics_table.setColumnWidth(3, 60)   # Length
         
         layout.addWidget(self.diagnostics_table)
         main_widget.setLayout(layout)
@@ -62,6 +280,7 @@ class TerminalWindow(QMainWindow):
         self._device_path_str = None
         self._device_unit = None
         self._device_config_id = None
+        self._device_item_id = None
         if device_item is not None:
             try:
                 # 收集裝置底下的 Tag id
@@ -94,65 +313,78 @@ class TerminalWindow(QMainWindow):
             except Exception:
                 pass
 
+        # matches_message 熱路徑使用的比對值，於建立視窗時計算一次
+        self._is_wildcard = device_item is None
+        self._expected_cfgid = self._device_config_id
+        self._expected_path = self._device_path_str
+        # matches_message 也作為 listener 的 matcher，會在送出紀錄的執行緒上執行，
+        # 因此比對時不得讀取 tree item；裝置名稱與通道參數先快取於此
+        self._expected_name = None
+        self._ch_host = None
+        self._ch_port = None
+        if device_item is not None:
+            self._refresh_device_cache()
+            # 裝置改名或通道參數變更時才於 GUI 執行緒重新讀取
+            try:
+                tree = device_item.treeWidget()
+                if tree is not None:
+                    tree.itemChanged.connect(self._on_tree_item_changed)
+            except Exception:
+                pass
+
+        # listener 送來的紀錄先放入佇列（deque 的 append/popleft 為執行緒安全），
+        # 每次突發只 emit 一次 _drainRequested，於 GUI 執行緒批次處理
+        self._pending = collections.deque()
+        self._drain_scheduled = False
+        self._drainRequested.connect(self._drain_pending, Qt.ConnectionType.QueuedConnection)
+        # 已處理到的 DiagnosticsManager.sequence，供輪詢備援只取新紀錄
+        self._last_diag_seq = 0
+
         if self._diag_manager:
+            # 註冊前的序號：之前的紀錄由下方重播載入，之後的由 listener 送達，
+            # 兩者不重疊，避免註冊與重播之間的紀錄出現兩次
+            start_seq = self._diag_manager.sequence
             try:
+                # 紀錄已由 manager 以 matcher 過濾，callback 只需負責送達
                 def _cb(ts, txt, ctx=None):
                     try:
-                        def _deliver():
-                            try:
-                                if self.matches_message(txt, ctx):
-                                    self.add_message(ts, txt, ctx)
-                            except Exception:
-                                pass
-
-                        if threading.current_thread() is threading.main_thread():
-                            _deliver()
-                        else:
-                            QTimer.singleShot(0, _deliver)
+                        # 先入列再檢查旗標：若 drain 已清除旗標，這裡會重新排程
+                        self._pending.append((ts, txt, ctx))
+                        if not self._drain_scheduled:
+                            self._drain_scheduled = True
+                            self._drainRequested.emit()
                     except Exception:
                         pass
 
-                import re as _re
-                lightweight_matcher = lambda t, c: bool(_re.search(r"\b(TX|RX)\b", str(t or "")))
-
+                # 由 manager 在送出前過濾，每個視窗只收到屬於自己的紀錄；
+                # 「全部」視窗不需過濾
                 self._diag_listener_token = self._diag_manager.register_listener(
                     name=f"terminal-{id(self)}",
                     callback=_cb,
-                    matcher=None,
+                    matcher=None if self._is_wildcard else self.matches_message,
                 )
-                try:
-                    snap = self._diag_manager.snapshot()
-                    for rec in snap:
-                        try:
-                            ctx = getattr(rec, 'context', None)
-                            if self.matches_message(rec.text, ctx):
-                                _cb(rec.timestamp, rec.text, ctx)
-                        except Exception:
-                            pass
-                    try:
-                        self._last_diag_index = len(snap)
-                    except Exception:
-                        self._last_diag_index = 0
-                except Exception:
-                    self._last_diag_index = 0
             except Exception:
                 self._diag_listener_token = None
+            # 載入開窗前已記錄的紀錄（一次批次插入）；註冊失敗時沒有 listener，
+            # 全部交由輪詢處理
+            if self._diag_listener_token is None:
+                self._poll_diagnostics()
+            else:
+                self._poll_diagnostics(upto=start_seq)
 
         self._setup_menu()
 
-        try:
-            self._diag_poll_timer = QTimer(self)
-            self._diag_poll_timer.setInterval(200)
-            self._diag_poll_timer.timeout.connect(self._poll_diagnostics)
-            self._diag_poll_timer.start()
-        except Exception:
-            self._diag_poll_timer = None
-
-        # 初始調整欄位寬度
-        try:
-            self._adjust_column_widths()
-        except Exception:
-            pass
+        # listener 已會即時送達每筆紀錄；只有註冊失敗時才以輪詢作為備援，
+        # 備援只需定期重新同步，間隔可放寬
+        self._diag_poll_timer = None
+        if self._diag_listener_token is None:
+            try:
+                self._diag_poll_timer = QTimer(self)
+                self._diag_poll_timer.setInterval(1000)
+                self._diag_poll_timer.timeout.connect(self._poll_diagnostics)
+                self._diag_poll_timer.start()
+            except Exception:
+                self._diag_poll_timer = None
 
     def closeEvent(self, event):
         try:
@@ -163,9 +395,7 @@ class TerminalWindow(QMainWindow):
                     pass
                 # ✅ 效能優化：視窗關閉時，如果沒有其他 listener，清除已記錄的訊息
                 try:
-                    with self._diag_manager._lock:
-                        if len(self._diag_manager._listeners) == 0:
-                            self._diag_manager._records.clear()
+                    self._diag_manager.discard_if_idle()
                 except Exception:
                     pass
         except Exception:
@@ -196,12 +426,38 @@ class TerminalWindow(QMainWindow):
         except Exception:
             event.accept()
 
+    def _refresh_device_cache(self):
+        """重新讀取比對用的裝置名稱與所屬通道的 host/port"""
+        item = self.device_item
+        try:
+            self._expected_name = item.text(0)
+        except Exception:
+            self._expected_name = None
+        ch_host = ch_port = None
+        try:
+            ch = item.parent()
+            ch_params = ch.data(2, Qt.ItemDataRole.UserRole) if ch else None
+            if isinstance(ch_params, dict):
+                ch_host = ch_params.get('host') or ch_params.get('ip') or ch_params.get('address')
+                ch_port = _to_int(ch_params.get('port'))
+        except Exception:
+            pass
+        self._ch_host = None if ch_host is None else str(ch_host)
+        self._ch_port = ch_port
+
+    def _on_tree_item_changed(self, item, column):
+        device = self.device_item
+        if device is not None and (item is device or item is device.parent()):
+            self._refresh_device_cache()
+
     def _device_path(self, item):
         parts = []
         it = item
-        while it is not None and it.data(0, Qt.ItemDataRole.UserRole) != "Connectivity":
-            parts.insert(0, it.text(0))
+        user_role = Qt.ItemDataRole.UserRole
+        while it is not None and it.data(0, user_role) != "Connectivity":
+            parts.append(it.text(0))
             it = it.parent()
+        parts.reverse()
         return GROUP_SEPARATOR.join(parts)
 
     def matches_message(self, text: str, ctx=None) -> bool:
@@ -210,262 +466,142 @@ class TerminalWindow(QMainWindow):
         For ADU messages with config_id in context, matches against device path.
         config_id format: "ChannelName_DeviceName" (e.g., "Channel1_Device1")
         """
-        if self.device_item is None:
+        if self._is_wildcard:
             return True
         txt = str(text or "")
-        import re
-        if not re.search(r"\b(TX|RX)\b", txt):
+        if not _has_txrx(txt):
             return False
         try:
-            if isinstance(ctx, dict):
-                # For ADU messages, check config_id match
-                config_id = ctx.get("config_id")
-                if "[ADU]" in txt and config_id is not None:
-                    # Get this terminal's expected config_id from device path
-                    device_config_id = getattr(self, "_device_config_id", None)
-                    
-                    # Match config_id - only show if it matches this terminal's device
-                    if device_config_id and str(config_id) == str(device_config_id):
-                        return True
-                    else:
-                        # Strict mode: reject if config_id doesn't match
-                        return False
-                
-                # Legacy matching for non-ADU messages
-                dev_ctx = ctx.get("dev_id") or ctx.get("device_id")
-                if dev_ctx is not None and getattr(self, "_device_item_id", None) is not None:
-                    try:
-                        if int(dev_ctx) == int(self._device_item_id):
-                            return True
-                    except Exception:
-                        pass
-                if self._device_unit is not None and ctx.get("unit") is not None:
-                    try:
-                        if int(ctx.get("unit")) != int(self._device_unit):
-                            return False
-                    except Exception:
-                        pass
-                try:
-                    ch = self.device_item.parent()
-                    ch_params = ch.data(2, Qt.ItemDataRole.UserRole) if ch else None
-                except Exception:
-                    ch_params = None
-                if isinstance(ch_params, dict):
-                    ch_host = ch_params.get('host') or ch_params.get('ip') or ch_params.get('address')
-                    ch_port = ch_params.get('port')
-                    if ctx.get('host') is not None and ch_host is not None:
-                        if str(ctx.get('host')) != str(ch_host):
-                            return False
-                    if ctx.get('port') is not None and ch_port is not None:
-                        try:
-                            if int(ctx.get('port')) != int(ch_port):
-                                return False
-                        except Exception:
-                            pass
-                if ctx.get('device_path') and getattr(self, '_device_path_str', None) is not None:
-                    try:
-                        if str(ctx.get('device_path')) != str(self._device_path_str):
-                            return False
-                    except Exception:
-                        pass
-                if ctx.get('device_name'):
-                    try:
-                        name = self.device_item.text(0)
-                    except Exception:
-                        name = None
-                    if name and str(ctx.get('device_name')) != str(name):
-                        return False
-                fc = ctx.get('fc')
-                if fc is not None:
-                    try:
-                        if int(fc) not in (1, 2, 3, 4, 5, 6, 15, 16):
-                            return False
-                    except Exception:
-                        pass
-                return True
+            return self._match_device(txt, ctx)
         except Exception:
-            pass
-        m2 = re.search(r"DEV_ID=(\d+)", txt)
-        if m2:
-            try:
-                if self._device_item_id is not None and int(m2.group(1)) == int(self._device_item_id):
+            return False
+
+    def _match_device(self, txt, ctx):
+        """matches_message 的主體；例外由呼叫端統一處理"""
+        if isinstance(ctx, dict):
+            # For ADU messages, check config_id match (strict: reject on mismatch)
+            config_id = ctx.get("config_id")
+            if config_id is not None and "[ADU]" in txt:
+                return bool(self._expected_cfgid) and str(config_id) == self._expected_cfgid
+
+            # Legacy matching for non-ADU messages
+            # 無法轉為 int 的值視為未提供，不影響比對結果
+            dev_ctx = _to_int(ctx.get("dev_id") or ctx.get("device_id"))
+            if dev_ctx is not None and dev_ctx == self._device_item_id:
+                return True
+            unit = _to_int(ctx.get("unit"))
+            if unit is not None and self._device_unit is not None and unit != self._device_unit:
+                return False
+            host = ctx.get('host')
+            if host is not None and self._ch_host is not None and str(host) != self._ch_host:
+                return False
+            port = _to_int(ctx.get('port'))
+            if port is not None and self._ch_port is not None and port != self._ch_port:
+                return False
+            device_path = ctx.get('device_path')
+            if device_path and self._expected_path is not None and str(device_path) != self._expected_path:
+                return False
+            device_name = ctx.get('device_name')
+            if device_name and self._expected_name and str(device_name) != self._expected_name:
+                return False
+            fc = _to_int(ctx.get('fc'))
+            if fc is not None and fc not in (1, 2, 3, 4, 5, 6, 15, 16):
+                return False
+            return True
+
+        m2 = _DEVID_RE.search(txt)
+        if m2 and self._device_item_id is not None and int(m2.group(1)) == self._device_item_id:
+            return True
+        m = _HEXBLOCK_RE.search(txt)
+        if m and self._device_unit is not None:
+            # 只解析實際比對的那個 byte：MBAP 的 unit id（第 7 個 byte），
+            # 不足 7 個時取第一個；regex 已確保只含十六進位字元
+            byte_tokens = [p for p in m.group(1).split() if len(p) <= 2]
+            if byte_tokens:
+                unit_hex = byte_tokens[6] if len(byte_tokens) >= 7 else byte_tokens[0]
+                if int(unit_hex, 16) == self._device_unit:
                     return True
-            except Exception:
-                pass
-        m = re.search(r"\|\s*([0-9A-Fa-f\s]+)\s*\|", txt)
-        if m:
-            parts = [p for p in m.group(1).split() if p]
-            bytes_list = []
-            for p in parts:
-                try:
-                    if len(p) <= 2:
-                        bytes_list.append(int(p, 16))
-                except Exception:
-                    continue
-            candidate_unit = None
-            if len(bytes_list) >= 7:
-                candidate_unit = bytes_list[6]
-            if candidate_unit is None and bytes_list:
-                candidate_unit = bytes_list[0]
-            if candidate_unit is not None and self._device_unit is not None:
-                try:
-                    if int(candidate_unit) == int(self._device_unit):
-                        return True
-                except Exception:
-                    pass
-        for m in re.finditer(r"id=(\d+)", txt):
-            try:
+        if self._device_tag_ids:
+            for m in _IDKV_RE.finditer(txt):
                 if int(m.group(1)) in self._device_tag_ids:
                     return True
-            except Exception:
-                pass
-        if getattr(self, '_device_path_str', None) and self._device_path_str in txt:
+        if self._expected_path and self._expected_path in txt:
             return True
+        name = self._expected_name
+        return bool(name) and name in txt
+
+    def add_message(self, ts: str, text: str, ctx=None):
         try:
-            name = self.device_item.text(0)
+            self.diagnostics_model.append_row(_format_record(ts, text, ctx))
+            self.diagnostics_table.scrollTo(
+                self.diagnostics_model.index(len(self._rows) - 1, 0)
+            )
         except Exception:
-            name = None
-        if name and name in txt:
-            return True
-        return False
+            pass
 
-    def add_message(self, ts: str, text: str, ctx=None):
+    def _drain_pending(self):
+        """於 GUI 執行緒批次取出佇列中的紀錄（已由 matcher 過濾），以一次 insert 加入表格"""
+        self._drain_scheduled = False
+        pending = self._pending
+        new_rows = []
         try:
-            from datetime import datetime as _dt
-            try:
-                date_str = _dt.now().strftime("%Y/%m/%d")
-            except Exception:
-                date_str = ""
-            try:
-                last_row = self.diagnostics_table.rowCount() - 1
-                if last_row >= 0:
-                    last_time_item = self.diagnostics_table.item(last_row, 1)
-                    last_data_item = self.diagnostics_table.item(last_row, 4)
-                    last_time = last_time_item.text() if last_time_item is not None else None
-                    last_data = last_data_item.text() if last_data_item is not None else None
-                    if last_time == ts and last_data == str(text or ""):
-                        return
-            except Exception:
-                pass
-            row = self.diagnostics_table.rowCount()
-            self.diagnostics_table.insertRow(row)
-            event = ""
-            length = ""
-            data_text = str(text or "")
-            meta_bits = []
-            try:
-                if isinstance(ctx, dict):
-                    direction = str(ctx.get("direction") or "").upper()
-                    fc_val = ctx.get("fc")
-                    try:
-                        fc_val = int(fc_val)
-                    except Exception:
-                        fc_val = fc_val
-                    if direction:
-                        event = direction if fc_val is None else f"{direction} FC{fc_val}"
-                    if ctx.get("length") is not None:
-                        try:
-                            length = str(int(ctx.get("length")))
-                        except Exception:
-                            length = str(ctx.get("length"))
-                    hex_text = ctx.get("hex") or ctx.get("hex_str")
-                    if hex_text:
-                        data_text = str(hex_text)
-                    unit_val = ctx.get("unit")
-                    host_val = ctx.get("host")
-                    port_val = ctx.get("port")
-                    addr_val = ctx.get("address")
-                    count_val = ctx.get("count")
-                    if unit_val is not None:
-                        meta_bits.append(f"unit={unit_val}")
-                    if addr_val is not None:
-                        meta_bits.append(f"addr={addr_val}")
-                    if count_val is not None:
-                        meta_bits.append(f"count={count_val}")
-                    if host_val:
-                        meta_bits.append(f"host={host_val}")
-                    if port_val is not None:
-                        meta_bits.append(f"port={port_val}")
-                    if meta_bits and data_text:
-                        data_text = f"{data_text}   ({', '.join(meta_bits)})"
-            except Exception:
-                pass
-            if not event:
-                try:
-                    import re
-                    txt_str = str(text or "")
-                    m = re.search(r"TX:\s*\|\s*([0-9A-Fa-f\s]+)\s*\|", txt_str)
-                    if not m:
-                        m = re.search(r"RX:\s*\|\s*([0-9A-Fa-f\s]+)\s*\|", txt_str)
-                    if m:
-                        hex_s = m.group(1)
-                        parts = [p for p in hex_s.split() if p]
-                        data_text = " ".join(p.upper() for p in parts)
-                        try:
-                            length = length or str(len(parts))
-                        except Exception:
-                            length = length or ""
-                        if 'TX:' in txt_str:
-                            event = 'TX'
-                        elif 'RX:' in txt_str:
-                            event = 'RX'
-                    else:
-                        data_text = txt_str
-                except Exception:
-                    data_text = str(text or "")
-            date_item = QTableWidgetItem(date_str)
-            date_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            time_item = QTableWidgetItem(ts)
-            time_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            event_item = QTableWidgetItem(event)
-            event_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            length_item = QTableWidgetItem(length)
-            length_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            data_item = QTableWidgetItem(data_text)
-            self.diagnostics_table.setItem(row, 0, date_item)
-            self.diagnostics_table.setItem(row, 1, time_item)
-            self.diagnostics_table.setItem(row, 2, event_item)
-            self.diagnostics_table.setItem(row, 3, length_item)
-            self.diagnostics_table.setItem(row, 4, data_item)
-            self.diagnostics_table.scrollToBottom()
-            
-            # 自適應調整欄位寬度
-            self._adjust_column_widths()
+            for _ in range(min(len(pending), self.DRAIN_BATCH)):
+                ts, txt, ctx = pending.popleft()
+                new_rows.append(_format_record(ts, txt, ctx))
+            if new_rows:
+                self._append_rows(new_rows)
         except Exception:
             pass
+        # 單次最多處理 DRAIN_BATCH 筆，剩餘的留到下一輪，避免長時間佔住事件迴圈
+        if pending and not self._drain_scheduled:
+            self._drain_scheduled = True
+            self._drainRequested.emit()
+
+    def _poll_diagnostics(self, upto=None):
+        """載入序號大於 _last_diag_seq 的紀錄
 
-    def _poll_diagnostics(self):
+        upto 為序號上限，超過的紀錄視為已由 listener 送達而略過。
+        """
         try:
-            if not getattr(self, '_diag_manager', None):
+            manager = self._diag_manager
+            if not manager:
                 return
-            try:
-                snap = self._diag_manager.snapshot()
-            except Exception:
-                return
-            try:
-                last = getattr(self, '_last_diag_index', 0) or 0
-            except Exception:
-                last = 0
-            total = len(snap)
-            if total <= last:
+            # 序號未變表示沒有新紀錄，不必複製紀錄清單
+            if manager.sequence == self._last_diag_seq:
                 return
-            for rec in snap[last:]:
+            seq, records = manager.snapshot_since(self._last_diag_seq)
+            self._last_diag_seq = seq
+            if upto is not None and seq > upto:
+                # 紀錄依序號排列，最後 seq - upto 筆即序號超過上限者
+                records = records[:max(0, len(records) - (seq - upto))]
+            # 先收集本次輪詢的所有新列，再以一次 beginInsertRows/endInsertRows 加入
+            new_rows = []
+            for rec in records:
                 try:
                     ctx = getattr(rec, 'context', None)
                     if self.matches_message(rec.text, ctx):
-                        try:
-                            self.add_message(rec.timestamp, rec.text, ctx)
-                        except Exception:
-                            pass
+                        new_rows.append(_format_record(rec.timestamp, rec.text, ctx))
                 except Exception:
                     pass
-            try:
-                self._last_diag_index = total
-            except Exception:
-                self._last_diag_index = total
+            if new_rows:
+                self._append_rows(new_rows)
         except Exception:
             pass
 
+    def _append_rows(self, new_rows):
+        """批次加入多列並捲到底部
+
+        插入期間暫停 view 重繪，remove/insert 通知與捲動只觸發一次 repaint。
+        model 的訊號不能封鎖，否則 view 不會知道新增的列。
+        """
+        table = self.diagnostics_table
+        table.setUpdatesEnabled(False)
+        try:
+            self.diagnostics_model.append_rows(new_rows)
+            table.scrollToBottom()
+        finally:
+            table.setUpdatesEnabled(True)
+
     def _setup_menu(self):
         clear_action = QAction("🗑️ Clear", self)
         clear_action.triggered.connect(self._clear_diagnostics)
@@ -481,7 +617,7 @@ class TerminalWindow(QMainWindow):
             pass
 
     def _clear_diagnostics(self):
-        self.diagnostics_table.setRowCount(0)
+        self.diagnostics_model.clear()
         if self.parent_window:
             try:
                 self.parent_window.clear_diagnostics()
@@ -501,19 +637,12 @@ class TerminalWindow(QMainWindow):
             if not file_path.lower().endswith(".txt"):
                 file_path = file_path + ".txt"
             try:
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    headers = []
-                    for c in range(self.diagnostics_table.columnCount()):
-                        h = self.diagnostics_table.horizontalHeaderItem(c)
-                        headers.append(h.text() if h is not None else "")
-                    f.write("\t".join(headers) + "\n")
-                    f.write("-" * 100 + "\n")
-                    for row in range(self.diagnostics_table.rowCount()):
-                        cols = []
-                        for c in range(self.diagnostics_table.columnCount()):
-                            item = self.diagnostics_table.item(row, c)
-                            cols.append(item.text() if item is not None else "")
-                        f.write("\t".join(cols) + "\n")
+                # 直接從 model 的 deque 串流寫出，不逐格讀取 view
+                with open(file_path, 'w', encoding='utf-8', newline='') as f:
+                    writer = csv.writer(f, delimiter='\t', lineterminator='\n')
+                    writer.writerow(DiagModel.HEADERS)
+                    writer.writerow(["-" * 100])
+                    writer.writerows(self._rows)
                 QMessageBox.information(self, "Success", f"Exported to: {file_path}")
             except Exception as e:
                 QMessageBox.warning(self, "Error", f"Export failed: {str(e)}")
@@ -551,84 +680,3 @@ class TerminalWindow(QMainWindow):
                 pass
         except Exception:
             pass
-
-    def _adjust_column_widths(self):
-        """自適應調整欄位寬度"""
-        try:
-            header = self.diagnostics_table.horizontalHeader()
-            if not header:
-                return
-                
-            # 定義欄位的最小寬度和最大寬度
-            min_widths = [80, 100, 80, 60, 200]  # Date, Time, Event, Length, Data
-            max_widths = [120, 150, 120, 80, 800]  # Data 欄位最大寬度限制
-            
-            # 計算內容所需的寬度
-            for col in range(self.diagnostics_table.columnCount()):
-                try:
-                    # 獲取內容寬度
-                    content_width = self.diagnostics_table.sizeHintForColumn(col)
-                    
-                    # 應用最小和最大寬度限制
-                    if col < len(min_widths):
-                        content_width = max(content_width, min_widths[col])
-                    if col < len(max_widths):
-                        content_width = min(content_width, max_widths[col])
-                    
-                    # 設置欄位寬度
-                    self.diagnostics_table.setColumnWidth(col, content_width)
-                    
-                except Exception:
-                    # 如果計算失敗，使用預設寬度
-                    if col < len(min_widths):
-                        self.diagnostics_table.setColumnWidth(col, min_widths[col])
-                        
-            # 確保視窗寬度適應內容
-            self._adjust_window_size()
-            
-        except Exception:
-            pass
-
-    def _adjust_window_size(self):
-        """調整視窗大小以適應內容"""
-        try:
-            # 計算表格總寬度
-            total_width = 0
-            for col in range(self.diagnostics_table.columnCount()):
-                total_width += self.diagnostics_table.columnWidth(col)
-            
-            # 加上垂直滾動條寬度
-            scrollbar_width = self.diagnostics_table.verticalScrollBar().width() if self.diagnostics_table.verticalScrollBar().isVisible() else 0
-            total_width += scrollbar_width
-            
-            # 加上一些邊距
-            total_width += 20
-            
-            # 獲取當前視窗大小
-            current_size = self.size()
-            
-            # 設定新的寬度（不超過螢幕寬度的 90%）
-            screen = self.screen()
-            if screen:
-                max_width = int(screen.availableGeometry().width() * 0.9)
-                total_width = min(total_width, max_width)
-            
-            # 設定最小寬度
-            total_width = max(total_width, 600)
-            
-            # 調整視窗大小
-            new_size = current_size
-            new_size.setWidth(total_width)
-            self.resize(new_size)
-            
-        except Exception:
-            pass
-
-    def resizeEvent(self, event):
-        """視窗大小改變時的事件處理"""
-        super().resizeEvent(event)
-        # 當視窗大小改變時，重新調整欄位寬度
-        try:
-            self._adjust_column_widths()
-        except Exception:
-            pass